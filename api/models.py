@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-from pydantic import BaseModel
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+PositiveInt = Annotated[int, Field(gt=0)]
 
 
 class Metric(BaseModel):
@@ -21,3 +25,26 @@ class SummaryResponse(BaseModel):
     interval: str
     as_of: datetime
     data: list[Metric]
+
+
+class SweepRequest(BaseModel):
+    symbol: str
+    timeframe: str
+    days: PositiveInt = 30
+    ema_fast: list[PositiveInt] | None = None
+    ema_slow: list[PositiveInt] | None = None
+    rsi_len: list[PositiveInt] | None = None
+    rsi_overbought: list[PositiveInt] | None = None
+    rsi_oversold: list[PositiveInt] | None = None
+    atr_len: list[PositiveInt] | None = None
+    rank_by: str = "pnl"
+    top: PositiveInt = 20
+
+
+class BacktestJobRequest(BaseModel):
+    symbol: str
+    timeframe: str
+    days: int = 30
+    # Mirrors core.backtest.runner.EXPORT_FORMATS.
+    export: Literal["csv", "parquet", "arrow"] = "csv"
+    equity_points: int = 1000
@@ -2,21 +2,40 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from datetime import date, datetime
-from typing import Optional
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+import pandas as pd
 
 from fastapi import APIRouter, Depends, HTTPException
 
 from config import Settings, settings
-from core.backtest.runner import run_backtest, save_backtest
-from core.datasources import binance, coingecko, fng
-from services.metrics import fetch_ohlcv, get_metric
-from services.scheduler import update_once
+from core.backtest.cache import BacktestCache, backtest_key
+from core.backtest.portfolio import run_portfolio_backtest
+from core.backtest.runner import EXPORT_FORMATS, downsample_curve, epoch_ms, run_backtest, save_backtest
+from core.backtest import sweep
+from core.backtest.sweep import SWEEP_PARAMS
+from core.datasources import binance
+from services import market_stats
+from services.jobs import Job, JobManager
+from services.metrics import fetch_ohlcv, get_metric, indicator_registry
+from services.scheduler import candle_store, update_once
 from services.store import DataStore
-from api.models import Metric, SummaryResponse
+from api.models import BacktestJobRequest, Metric, SummaryResponse, SweepRequest
 
 router = APIRouter()
 
+_backtest_cache = BacktestCache(
+    maxsize=settings.backtest_cache_size,
+    persist_dir=Path(settings.data_dir) / "backtest_cache" if settings.backtest_cache_persist else None,
+)
+# Cache key of the result last written to each backtest CSV.
+_saved_backtests: dict[Path, str] = {}
+job_manager = JobManager(max_workers=settings.backtest_workers, max_jobs=settings.backtest_max_jobs)
+
 
 def get_store() -> DataStore:
     from main import store  # lazy import to avoid circular
@@ -51,11 +70,9 @@ async def update_config(new: dict, settings: Settings = Depends(get_settings)) -
     return settings.model_dump()
 
 
-@router.get("/ohlcv")
-async def get_ohlcv(symbol: str, interval: str, limit: int = 500):
-    """Return list of OHLCV candles for a symbol."""
-    df = await fetch_ohlcv(symbol, interval, limit)
-    candles = [
+def ohlcv_rows(df) -> list[list]:
+    """Serialize candles as ``[open_time_ms, open, high, low, close, volume]`` rows."""
+    return [
         [
             int(row.open_time.timestamp() * 1000),
             row.open,
@@ -66,20 +83,52 @@ async def get_ohlcv(symbol: str, interval: str, limit: int = 500):
         ]
         for row in df.itertuples()
     ]
-    return candles
+
+
+@router.get("/ratelimit")
+async def rate_limit() -> dict:
+    """Return the Binance request weight used in the current minute."""
+    return binance.rate_limit_usage()
+
+
+@router.get("/ohlcv")
+async def get_ohlcv(symbol: str, interval: str, limit: int = 500):
+    """Return list of OHLCV candles for a symbol."""
+    df = await fetch_ohlcv(symbol, interval, limit)
+    return ohlcv_rows(df)
+
+
+@router.get("/candles")
+async def get_candles(
+    symbol: str,
+    interval: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    settings: Settings = Depends(get_settings),
+):
+    """Return stored closed candles with open time in ``[start, end)`` (epoch ms)."""
+    df = candle_store(settings).read(
+        symbol,
+        interval,
+        pd.Timestamp(start, unit="ms") if start is not None else None,
+        pd.Timestamp(end, unit="ms") if end is not None else None,
+    )
+    return ohlcv_rows(df)
 
 
 @router.get("/metrics", response_model=Metric)
-async def metrics(symbol: str, interval: str) -> Metric:
+async def metrics(symbol: str, interval: str, store: DataStore = Depends(get_store)) -> Metric:
     """Return calculated metrics for a symbol."""
-    return await get_metric(symbol, interval)
+    return await get_metric(symbol, interval, store)
 
 
 @router.get("/summary", response_model=SummaryResponse)
-async def summary(interval: str, settings: Settings = Depends(get_settings)) -> SummaryResponse:
+async def summary(interval: str, store: DataStore = Depends(get_store), settings: Settings = Depends(get_settings)) -> SummaryResponse:
     """Return metrics for all symbols in the watchlist."""
     symbols = settings.watchlist
-    data = await asyncio.gather(*(get_metric(sym, interval) for sym in symbols))
+    # Warm the shared ticker snapshot with one bulk request for all symbols.
+    await binance.ticker_snapshot.get(symbols)
+    data = await asyncio.gather(*(get_metric(sym, interval, store) for sym in symbols))
     return SummaryResponse(interval=interval, as_of=datetime.utcnow(), data=list(data))
 
 
@@ -105,12 +154,12 @@ async def get_all_signals(store: DataStore = Depends(get_store), settings: Setti
 
 @router.get("/stats/daily")
 async def stats_daily(query_date: Optional[date] = None, store: DataStore = Depends(get_store), settings: Settings = Depends(get_settings)) -> dict:
-    tickers = {}
-    for sym in settings.watchlist:
-        tickers[sym] = await binance.get_24h_ticker(sym)
+    tickers = await binance.ticker_snapshot.get(settings.watchlist)
     ids = ["bitcoin", "ethereum", "binancecoin", "solana"]
-    prices = await coingecko.simple_price(ids, ["usd"])
-    index = await fng.get_index()
+    # Last good values are served right away and refreshed in the background.
+    prices, index = await asyncio.gather(
+        market_stats.simple_price(ids, ["usd"]), market_stats.fear_greed_index()
+    )
     signal_counts = len(store.all_signals())
     long_short = {
         "long": sum(1 for s in store.all_signals() if s["signal"] == "LONG"),
@@ -119,25 +168,205 @@ async def stats_daily(query_date: Optional[date] = None, store: DataStore = Depe
     return {
         "date": str(query_date or date.today()),
         "tickers": tickers,
-        "coingecko": prices,
-        "fear_greed": index,
+        "coingecko": prices.value,
+        "fear_greed": index.value,
+        "sources": {"coingecko": prices.info, "fear_greed": index.info},
         "signal_count": signal_counts,
         "long_short_ratio": long_short,
     }
 
 
+async def _backtest_klines(
+    symbol: str,
+    timeframe: str,
+    days: int,
+    store: DataStore,
+    settings: Settings,
+    progress: Callable[[float], None] | None = None,
+):
+    """Return ``days`` of candles with indicators, read from the candle store when possible.
+
+    Only the parts of the span the candle store doesn't cover yet are
+    fetched, and they are added to it.
+
+    Indicators are computed in a worker thread, reporting the fraction done
+    to ``progress`` after the fetch and after each indicator column.
+    """
+    end_ms = int(time.time() * 1000)
+    interval_ms = binance.INTERVAL_MS.get(timeframe)
+    if interval_ms:
+        # End at the last closed candle so repeated requests within one
+        # candle ask for the same span and are served from the caches.
+        end_ms -= end_ms % interval_ms
+    start_ms = end_ms - days * 86_400_000
+    try:
+        df = await binance.get_historical_klines(
+            symbol,
+            timeframe,
+            start_ms,
+            end_ms,
+            store=candle_store(settings),
+        )
+    except (httpx.HTTPError, ValueError):
+        # Unsupported interval or exchange unreachable: fall back to the
+        # candles kept by the scheduler, whatever the candle store holds of
+        # the span, or a single klines request.
+        df = store.get_klines(symbol, timeframe)
+        if df is not None:
+            if progress is not None:
+                progress(1.0)
+            return df
+        df = candle_store(settings).read(symbol, timeframe, pd.Timestamp(start_ms, unit="ms"))
+        if df.empty:
+            df = await binance.get_klines(symbol, timeframe)
+    df["symbol"] = symbol
+    df["interval"] = timeframe
+    fetched = 0.4
+    if progress is not None:
+        progress(fetched)
+    return await asyncio.to_thread(
+        indicator_registry.add_indicators,
+        symbol,
+        timeframe,
+        df,
+        settings,
+        None if progress is None else lambda done: progress(fetched + (1 - fetched) * done),
+    )
+
+
+def _curve_payload(curve: dict, max_points: int) -> dict:
+    curve = downsample_curve(curve, max_points)
+    return {"time": curve["time"].tolist(), "equity": curve["equity"].tolist()}
+
+
+def _trades_payload(trades: list[dict]) -> dict:
+    """Return trade rows as one list per field, with times in epoch milliseconds."""
+    payload = {}
+    for name in trades[0] if trades else ():
+        values = [t[name] for t in trades]
+        payload[name] = epoch_ms(values).tolist() if name.endswith("_time") else values
+    return payload
+
+
+async def _backtest_summary(
+    symbol: str,
+    timeframe: str,
+    days: int,
+    store: DataStore,
+    settings: Settings,
+    export: str = "csv",
+    equity_points: int = 1000,
+    job: Job | None = None,
+) -> dict:
+    if export not in EXPORT_FORMATS:
+        raise HTTPException(400, f"unsupported export format: {export}")
+    # Candles and indicators take the first half of a job's progress, the
+    # backtest itself most of the rest.
+    df = await _backtest_klines(
+        symbol, timeframe, days, store, settings, None if job is None else job.stage(0.0, 0.5)
+    )
+    key = backtest_key(df, settings)
+    result = _backtest_cache.get(key)
+    if result is None:
+        result = await job_manager.run(run_backtest, df, settings)
+        _backtest_cache.set(key, result)
+    if job is not None:
+        job.progress = 0.9
+    path = Path(settings.data_dir) / f"backtest_{symbol}_{timeframe}.{export}"
+    if _saved_backtests.get(path) != key or not path.exists():
+        path = save_backtest(
+            result["trades"], symbol, timeframe, settings.data_dir, export, result["equity_curve"]
+        )
+        _saved_backtests[path] = key
+    # The statistics are only sent once, under ``metrics``.
+    return {
+        "metrics": result["metrics"],
+        "trades": _trades_payload(result["trades"]),
+        "equity_curve": _curve_payload(result["equity_curve"], equity_points),
+        export: str(path),
+    }
+
+
 @router.get("/backtest")
-async def backtest(symbol: str, timeframe: str, days: int = 30, store: DataStore = Depends(get_store), settings: Settings = Depends(get_settings)) -> dict:
-    df = store.get_klines(symbol, timeframe)
-    if df is None:
-        df = await binance.get_klines(symbol, timeframe)
-        df["symbol"] = symbol
-        df["interval"] = timeframe
-        from core.indicators.ta import add_indicators
-
-        df = add_indicators(df, settings)
-    result = run_backtest(df, settings)
-    path = save_backtest(result["trades"], symbol, timeframe, settings.data_dir)
-    summary = result.copy()
-    summary["csv"] = str(path)
-    return summary
+async def backtest(
+    symbol: str,
+    timeframe: str,
+    days: int = 30,
+    export: str = "csv",
+    equity_points: int = 1000,
+    store: DataStore = Depends(get_store),
+    settings: Settings = Depends(get_settings),
+) -> dict:
+    """Run a backtest; ``equity_points`` caps the returned curve (0 keeps every bar).
+
+    The response holds the summary ``metrics``, the ``trades`` as one list
+    per field, the equity curve and the path of the exported trades.
+    """
+    return await _backtest_summary(symbol, timeframe, days, store, settings, export, equity_points)
+
+
+@router.post("/backtest/jobs")
+async def create_backtest_job(req: BacktestJobRequest, store: DataStore = Depends(get_store), settings: Settings = Depends(get_settings)) -> dict:
+    """Queue a backtest and return its job id immediately."""
+    try:
+        job = job_manager.submit(
+            lambda job: _backtest_summary(
+                req.symbol, req.timeframe, req.days, store, settings, req.export, req.equity_points, job
+            )
+        )
+    except RuntimeError as exc:
+        raise HTTPException(429, str(exc)) from exc
+    return job.to_dict()
+
+
+@router.get("/backtest/jobs/{job_id}")
+async def get_backtest_job(job_id: str) -> dict:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(404, "job not found")
+    return job.to_dict()
+
+
+@router.delete("/backtest/jobs/{job_id}")
+async def cancel_backtest_job(job_id: str) -> dict:
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(404, "job not found")
+    return job.to_dict()
+
+
+@router.post("/backtest/sweep")
+async def backtest_sweep(req: SweepRequest, store: DataStore = Depends(get_store), settings: Settings = Depends(get_settings)) -> list[dict]:
+    """Grid-search strategy parameters and return the best combinations."""
+    try:
+        sweep.check_rank_by(req.rank_by)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+    df = await _backtest_klines(req.symbol, req.timeframe, req.days, store, settings)
+    grid = {name: getattr(req, name) for name in SWEEP_PARAMS if getattr(req, name)}
+    try:
+        combos, columns = await asyncio.to_thread(sweep.prepare, df, settings, grid)
+        # One chunk per worker of the shared pool, so the columns are sent
+        # to each worker once and concurrent sweeps queue up in that pool.
+        size = max(1, -(-len(combos) // job_manager.max_workers))
+        chunks = [combos[i : i + size] for i in range(0, len(combos), size)]
+        results = await asyncio.gather(
+            *(job_manager.run(sweep.evaluate_many, columns, chunk) for chunk in chunks)
+        )
+        table = sweep.rank([row for rows in results for row in rows], req.rank_by)
+    except (KeyError, ValueError) as exc:
+        raise HTTPException(400, str(exc)) from exc
+    return table.head(req.top).to_dict(orient="records")
+
+
+@router.get("/backtest/portfolio")
+async def backtest_portfolio(timeframe: str, days: int = 30, equity_points: int = 1000, store: DataStore = Depends(get_store), settings: Settings = Depends(get_settings)) -> dict:
+    """Backtest the whole watchlist as a single book."""
+    candles = await asyncio.gather(
+        *(_backtest_klines(sym, timeframe, days, store, settings) for sym in settings.watchlist)
+    )
+    frames = dict(zip(settings.watchlist, candles))
+    result = await asyncio.to_thread(run_portfolio_backtest, frames, settings)
+    result["trades"] = _trades_payload(result["trades"])
+    result["equity_curve"] = _curve_payload(result["equity_curve"], equity_points)
+    return result
@@ -0,0 +1,184 @@
+"""Offline performance benchmarks for the hot paths of the bot.
+
+Every case runs on synthetic candles, so no network access is needed::
+
+    python -m benchmarks.run --output benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.25
+
+With ``--compare`` the run exits with status 1 when any case is slower than
+the baseline by more than ``threshold`` (a fraction, ``0.25`` = 25%).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+# Set up the path before importing anything that may live in the repo,
+# including the bundled ``pandas_ta``, so ``python benchmarks/run.py`` works.
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pandas_ta as ta  # noqa: E402
+
+from api.routes import ohlcv_rows  # noqa: E402
+from config import Settings  # noqa: E402
+from core.backtest.runner import run_backtest  # noqa: E402
+from core.datasources.binance import _klines_frame  # noqa: E402
+from core.indicators.ta import add_indicators  # noqa: E402
+from core.signals.engine import generate_signal, generate_signals  # noqa: E402
+from services.store import DataStore  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+def synthetic_klines(n: int, seed: int = 0) -> pd.DataFrame:
+    """Return ``n`` random-walk 1m candles in the schema of ``binance.get_klines``."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 0.5, n).cumsum()
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = rng.uniform(0, 0.5, n)
+    open_time = pd.date_range("2020-01-01", periods=n, freq="min")
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.uniform(1, 100, n),
+            "close_time": open_time + pd.Timedelta(minutes=1) - pd.Timedelta(milliseconds=1),
+        }
+    )
+
+
+def kline_payload(df: pd.DataFrame) -> bytes:
+    """Return ``df`` as the raw JSON body of a Binance klines response."""
+    open_ms = df["open_time"].to_numpy(dtype="datetime64[ms]").view("int64").tolist()
+    close_ms = df["close_time"].to_numpy(dtype="datetime64[ms]").view("int64").tolist()
+    prices = [df[c].map("{:.8f}".format).tolist() for c in ("open", "high", "low", "close", "volume")]
+    rows = [
+        [t, o, h, l, c, v, ct, "0", 0, "0", "0", "0"]
+        for t, o, h, l, c, v, ct in zip(open_ms, *prices, close_ms)
+    ]
+    return json.dumps(rows, separators=(",", ":")).encode()
+
+
+def _time(fn: Callable[[], object], min_time: float = 0.2, max_repeat: int = 50) -> float:
+    """Return the best wall time of ``fn`` over several repeats."""
+    best = float("inf")
+    spent = 0.0
+    repeats = 0
+    while repeats < 3 or (spent < min_time and repeats < max_repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        repeats += 1
+    return best
+
+
+def _store_access(store: DataStore, df: pd.DataFrame, symbols: list[str]) -> None:
+    for sym in symbols:
+        store.set_klines(sym, "1m", df)
+        store.set_signal(sym, "1m", {"symbol": sym, "signal": "NONE"})
+    for sym in symbols:
+        store.get_klines(sym, "1m")
+        store.get_signal(sym, "1m")
+    store.all_signals()
+
+
+def cases(n: int, settings: Settings) -> dict[str, Callable[[], object]]:
+    """Return the benchmark callables for data of ``n`` rows."""
+    raw = synthetic_klines(n)
+    df = add_indicators(raw, settings)
+    close, high, low = raw["close"], raw["high"], raw["low"]
+    symbols = [f"SYM{i}" for i in range(min(n, 1_000))]
+    store = DataStore()
+    payload = kline_payload(raw)
+    return {
+        "parse_klines": lambda: _klines_frame(payload),
+        "add_indicators": lambda: add_indicators(raw, settings),
+        "ta.ema": lambda: ta.ema(close, length=settings.ema_fast),
+        "ta.rsi": lambda: ta.rsi(close, length=settings.rsi_len),
+        "ta.atr": lambda: ta.atr(high, low, close, length=settings.atr_len),
+        "ta.ema[numpy]": lambda: ta.ema(close, length=settings.ema_fast, backend="numpy"),
+        "ta.rsi[numpy]": lambda: ta.rsi(close, length=settings.rsi_len, backend="numpy"),
+        "ta.atr[numpy]": lambda: ta.atr(high, low, close, length=settings.atr_len, backend="numpy"),
+        "ta.sma[numpy]": lambda: ta.sma(close, length=200, backend="numpy"),
+        "generate_signal": lambda: generate_signal(df, settings),
+        "generate_signals": lambda: generate_signals(df, settings),
+        "run_backtest": lambda: run_backtest(df, settings),
+        "ohlcv_serialization": lambda: json.dumps(ohlcv_rows(raw)),
+        "datastore_access": lambda: _store_access(store, df, symbols),
+    }
+
+
+def run_benchmarks(sizes: Iterable[int] = DEFAULT_SIZES, only: str | None = None) -> dict:
+    """Run every case at every size and return the results document."""
+    settings = Settings()
+    results: dict[str, float] = {}
+    for n in sizes:
+        for name, fn in cases(n, settings).items():
+            if only and only not in name:
+                continue
+            key = f"{name}[{n}]"
+            results[key] = _time(fn)
+            print(f"{key:<34} {results[key] * 1000:12.3f} ms", flush=True)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return the cases in ``current`` slower than ``baseline`` beyond ``threshold``."""
+    regressions = []
+    for key, seconds in current["results"].items():
+        base = baseline["results"].get(key)
+        if not base:
+            continue
+        ratio = seconds / base
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = "  SLOWER"
+        print(f"{key:<34} {base * 1000:12.3f} -> {seconds * 1000:12.3f} ms  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--output", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown fraction")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.sizes, args.only)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2, sort_keys=True))
+    if args.compare:
+        regressions = compare(current, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than baseline: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,21 @@ class Settings(BaseSettings):
     port: int = 8000
     watchlist: list[str] = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT"]
     timeframes: list[str] = ["1m", "15m"]
+    # Build 3m..4h candles from the 1m stream instead of fetching each one.
+    derive_timeframes: bool = True
+    # Fetch only candles newer than the stored ones and keep at most this many.
+    kline_delta_fetch: bool = True
+    kline_max_len: int = 1000
+    # "rest" polls klines every sched_interval_sec; "stream" uses WebSockets.
+    kline_source: str = "rest"
+    binance_ws_url: str = "wss://stream.binance.com:9443/stream"
+    # Record outgoing HTTP responses to this JSON-lines file, or replay them
+    # from one instead of using the network (see services/http_replay.py).
+    http_record_path: str | None = None
+    http_replay_path: str | None = None
+    http_replay_latency: float = 0.0
+    # Recording timeline speed-up; 0 serves one response per request.
+    http_replay_speed: float = 1.0
     allowed_origins: list[str] = ["*"]
     sched_interval_sec: int = 60
     ema_fast: int = 9
@@ -21,8 +36,23 @@ class Settings(BaseSettings):
     atr_min: float = 5
     atr_max: float = 10000
     data_dir: str = "./data"
+    # Part files a day of stored candles collects before they are merged.
+    candle_compact_parts: int = 32
     log_level: str = "INFO"
     cache_ttl_seconds: int = 30
+    # Age after which CoinGecko / Fear & Greed values are refreshed in the
+    # background; failures in a row before a source is left alone for a while.
+    coingecko_ttl_seconds: int = 60
+    fng_ttl_seconds: int = 3600
+    datasource_failure_threshold: int = 3
+    datasource_cooldown_seconds: int = 300
+    backtest_cache_size: int = 64
+    backtest_cache_persist: bool = False
+    backtest_workers: int = 2
+    backtest_max_jobs: int = 100
+    metrics_ta_backend: str = "numpy"
+    metrics_ta_float32: bool = False
+    indicator_cache_size: int = 512
 
     @field_validator("watchlist")
     @classmethod
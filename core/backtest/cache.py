@@ -0,0 +1,90 @@
+"""Content-addressed cache for backtest results."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import pickle
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+
+from config import Settings
+from core.backtest.sweep import SWEEP_PARAMS
+
+logger = logging.getLogger(__name__)
+
+# Settings that influence indicators, signals or exits.
+BACKTEST_SETTINGS = SWEEP_PARAMS
+
+_KEY_COLUMNS = ("open_time", "open", "high", "low", "close")
+
+
+def backtest_key(df: pd.DataFrame, settings: Settings) -> str:
+    """Return a key identifying a backtest of ``df`` under ``settings``.
+
+    The key combines the row count, the last candle time, a hash of the
+    price columns and the backtest-relevant settings, so identical inputs
+    map to the same key regardless of where the candles came from.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    last = df["close_time"].iloc[-1] if "close_time" in df and len(df) else None
+    digest.update(f"{len(df)}|{last}".encode())
+    for col in _KEY_COLUMNS:
+        if col not in df:
+            continue
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series.to_numpy(dtype="datetime64[ms]").view("int64")
+        else:
+            values = series.to_numpy(dtype=float)
+        digest.update(np.ascontiguousarray(values).tobytes())
+    params = "|".join(f"{name}={getattr(settings, name)}" for name in BACKTEST_SETTINGS)
+    digest.update(params.encode())
+    return digest.hexdigest()
+
+
+class BacktestCache:
+    """Bounded LRU cache of backtest results, optionally persisted to disk.
+
+    With ``persist_dir`` set, every stored result is also pickled to
+    ``<persist_dir>/<key>.pkl`` so it survives restarts.  The directory is
+    kept to ``maxsize`` files by removing the least recently written ones.
+    """
+
+    def __init__(self, maxsize: int = 64, persist_dir: str | Path | None = None) -> None:
+        self.maxsize = maxsize
+        self._memory: LRUCache = LRUCache(maxsize=maxsize)
+        self.persist_dir = Path(persist_dir) if persist_dir is not None else None
+
+    def get(self, key: str) -> Any | None:
+        result = self._memory.get(key)
+        if result is None and self.persist_dir is not None:
+            path = self.persist_dir / f"{key}.pkl"
+            if path.exists():
+                try:
+                    result = pickle.loads(path.read_bytes())
+                except Exception:  # corrupt or incompatible entry
+                    logger.warning("discarding unreadable backtest cache entry %s", path)
+                    path.unlink(missing_ok=True)
+                    return None
+                self._memory[key] = result
+        return result
+
+    def set(self, key: str, result: Any) -> None:
+        self._memory[key] = result
+        if self.persist_dir is None:
+            return
+        self.persist_dir.mkdir(parents=True, exist_ok=True)
+        (self.persist_dir / f"{key}.pkl").write_bytes(pickle.dumps(result))
+        files = sorted(self.persist_dir.glob("*.pkl"), key=lambda p: p.stat().st_mtime)
+        for stale in files[: max(0, len(files) - self.maxsize)]:
+            stale.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.persist_dir is not None:
+            for path in self.persist_dir.glob("*.pkl"):
+                path.unlink(missing_ok=True)
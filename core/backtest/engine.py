@@ -0,0 +1,140 @@
+"""Array-based position state machine for backtests.
+
+The functions here operate on plain NumPy arrays so the backtester never
+builds per-bar Python objects.  Only one position is held at a time: a
+position is opened on the close of a bar with a non-zero side and closed on
+the first later bar whose range touches the stop-loss or take-profit level.
+The stop-loss wins when both levels are touched by the same bar.
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+# Initial number of bars scanned when looking for an exit; doubled until an
+# exit is found so long-lived positions don't cost one NumPy call per bar.
+_SCAN_WINDOW = 64
+
+
+class Trades(NamedTuple):
+    """Closed trades as parallel arrays."""
+
+    entry_idx: np.ndarray
+    exit_idx: np.ndarray
+    side: np.ndarray
+    entry: np.ndarray
+    exit: np.ndarray
+    pnl: np.ndarray
+
+
+def _find_exit(
+    start: int,
+    direction: int,
+    sl: float,
+    tp: float,
+    high: np.ndarray,
+    low: np.ndarray,
+) -> tuple[int, float] | None:
+    """Return ``(index, price)`` of the first bar from ``start`` hitting SL/TP."""
+    n = len(high)
+    window = _SCAN_WINDOW
+    while start < n:
+        stop = min(start + window, n)
+        hi = high[start:stop]
+        lo = low[start:stop]
+        if direction > 0:
+            hit_sl = lo <= sl
+            hit_tp = hi >= tp
+        else:
+            hit_sl = hi >= sl
+            hit_tp = lo <= tp
+        hits = np.flatnonzero(hit_sl | hit_tp)
+        if hits.size:
+            offset = hits[0]
+            return start + offset, sl if hit_sl[offset] else tp
+        start = stop
+        window *= 2
+    return None
+
+
+def simulate_trades(
+    side: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    atr: np.ndarray,
+    sl_mult: float = 1.5,
+    tp_mult: float = 1.0,
+) -> Trades:
+    """Simulate entries and SL/TP exits over arrays of bar data.
+
+    ``side`` holds ``1`` for long, ``-1`` for short and ``0`` for no signal on
+    each bar.  Levels are ``close -/+ sl_mult * atr`` and ``close +/- tp_mult
+    * atr`` at the entry bar.  The Python loop runs once per trade, not once
+    per bar; a position still open on the last bar is discarded.
+    """
+    side = np.asarray(side)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    atr = np.asarray(atr, dtype=float)
+
+    candidates = np.flatnonzero(side)
+    entries: list[int] = []
+    exits: list[int] = []
+    exit_prices: list[float] = []
+    pos = 0
+    while pos < len(candidates):
+        i = candidates[pos]
+        direction = int(np.sign(side[i]))
+        sl = close[i] - direction * sl_mult * atr[i]
+        tp = close[i] + direction * tp_mult * atr[i]
+        found = _find_exit(i + 1, direction, sl, tp, high, low)
+        if found is None:
+            break
+        j, price = found
+        entries.append(i)
+        exits.append(j)
+        exit_prices.append(price)
+        # The exit bar itself can't open a new position.
+        pos = np.searchsorted(candidates, j + 1)
+
+    entry_idx = np.asarray(entries, dtype=np.int64)
+    exit_idx = np.asarray(exits, dtype=np.int64)
+    trade_side = np.sign(side[entry_idx]).astype(np.int8)
+    entry = close[entry_idx]
+    exit_ = np.asarray(exit_prices, dtype=float)
+    pnl = np.where(trade_side > 0, exit_ - entry, entry - exit_)
+    return Trades(entry_idx, exit_idx, trade_side, entry, exit_, pnl)
+
+
+def realized_equity(n: int, exit_idx: np.ndarray, pnl: np.ndarray) -> np.ndarray:
+    """Return cumulative realized PnL at each of ``n`` bars."""
+    return np.cumsum(np.bincount(exit_idx, weights=pnl, minlength=n))
+
+
+def summarize(pnl: np.ndarray) -> dict:
+    """Return win rate, expectancy and drawdown statistics for ``pnl``."""
+    pnl = np.asarray(pnl, dtype=float)
+    total_trades = len(pnl)
+    win_mask = pnl > 0
+    wins = int(win_mask.sum())
+    losses = total_trades - wins
+    win_rate = wins / total_trades * 100 if total_trades else 0
+    avg_win = float(pnl[win_mask].sum() / wins) if wins else 0
+    avg_loss = float(pnl[~win_mask].sum() / losses) if losses else 0
+    expectancy = win_rate / 100 * avg_win + (1 - win_rate / 100) * avg_loss
+
+    equity = np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    max_drawdown = float((peak - equity).max()) if total_trades else 0.0
+    return {
+        "total_trades": total_trades,
+        "win_rate": win_rate,
+        "avg_win": avg_win,
+        "avg_loss": avg_loss,
+        "expectancy": expectancy,
+        "max_drawdown": max_drawdown,
+        "pnl": float(equity[-1]) if total_trades else 0.0,
+    }
@@ -0,0 +1,105 @@
+"""Multi-symbol portfolio backtest on a shared timestamp index."""
+from __future__ import annotations
+
+from typing import Dict, List, Mapping
+
+import numpy as np
+import pandas as pd
+
+from config import Settings
+from core.backtest.engine import realized_equity, simulate_trades, summarize
+from core.backtest.runner import epoch_ms
+from core.signals.engine import signal_masks
+
+PORTFOLIO_COLUMNS = ("high", "low", "close", "ema_fast", "ema_slow", "rsi", "atr")
+
+
+def align_frames(
+    frames: Mapping[str, pd.DataFrame], columns: tuple[str, ...] = PORTFOLIO_COLUMNS
+) -> tuple[pd.Index, Dict[str, np.ndarray]]:
+    """Align per-symbol frames on the union of their ``open_time`` values.
+
+    Returns the shared index and, for every column, a ``(time, symbol)``
+    matrix with symbols in the order of ``frames``.  Bars missing for a
+    symbol are NaN, which never opens or closes a position.
+    """
+    symbols = list(frames)
+    wide = pd.concat(
+        {sym: df.set_index("open_time")[list(columns)] for sym, df in frames.items()},
+        axis=1,
+    ).sort_index()
+    matrices = {
+        col: wide.xs(col, axis=1, level=1)[symbols].to_numpy(dtype=float) for col in columns
+    }
+    return wide.index, matrices
+
+
+def run_portfolio_backtest(frames: Mapping[str, pd.DataFrame], settings: Settings) -> Dict:
+    """Backtest several symbols as one book.
+
+    ``frames`` maps symbols to DataFrames with indicators already added.
+    Signals for all symbols are computed in one pass over the aligned
+    matrices; exits use the array engine column by column, so the Python
+    overhead grows with the number of trades rather than symbols times bars.
+    The result holds portfolio statistics, a shared ``equity_curve`` of
+    realized PnL (see :func:`run_backtest`), a ``symbols`` breakdown and the
+    ``trades``.
+    """
+    if not frames:
+        raise ValueError("no symbols to backtest")
+    symbols = list(frames)
+    index, m = align_frames(frames)
+    long_mask, short_mask = signal_masks(m["close"], m["ema_fast"], m["ema_slow"], m["rsi"], m["atr"], settings)
+    side = long_mask.astype(np.int8) - short_mask.astype(np.int8)
+
+    n = len(index)
+    equity = np.zeros(n)
+    breakdown: Dict[str, Dict] = {}
+    parts = []
+    for j, sym in enumerate(symbols):
+        result = simulate_trades(side[:, j], m["high"][:, j], m["low"][:, j], m["close"][:, j], m["atr"][:, j])
+        equity += realized_equity(n, result.exit_idx, result.pnl)
+        breakdown[sym] = summarize(result.pnl)
+        parts.append((j, result))
+
+    symbol_idx = np.concatenate([np.full(len(r.pnl), j) for j, r in parts])
+    entry_idx = np.concatenate([r.entry_idx for _, r in parts])
+    exit_idx = np.concatenate([r.exit_idx for _, r in parts])
+    trade_side = np.concatenate([r.side for _, r in parts])
+    entry = np.concatenate([r.entry for _, r in parts])
+    exit_ = np.concatenate([r.exit for _, r in parts])
+    pnl = np.concatenate([r.pnl for _, r in parts])
+    order = np.argsort(exit_idx, kind="stable")
+
+    stats = summarize(pnl[order])
+    if n:
+        peak = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+        stats["max_drawdown"] = float((peak - equity).max())
+
+    times = index.to_numpy()
+    trades: List[Dict] = [
+        {
+            "symbol": symbols[j],
+            "entry_time": pd.Timestamp(times[i]),
+            "exit_time": pd.Timestamp(times[k]),
+            "side": "LONG" if d > 0 else "SHORT",
+            "entry": e,
+            "exit": x,
+            "pnl": p,
+        }
+        for j, i, k, d, e, x, p in zip(
+            symbol_idx[order].tolist(),
+            entry_idx[order].tolist(),
+            exit_idx[order].tolist(),
+            trade_side[order].tolist(),
+            entry[order].tolist(),
+            exit_[order].tolist(),
+            pnl[order].tolist(),
+        )
+    ]
+    return {
+        "trades": trades,
+        **stats,
+        "equity_curve": {"time": epoch_ms(index), "equity": equity},
+        "symbols": breakdown,
+    }
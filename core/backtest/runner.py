@@ -4,90 +4,121 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List, Dict
 
+import numpy as np
 import pandas as pd
 
 from config import Settings
-from core.signals.engine import generate_signal
+from core.backtest.engine import realized_equity, simulate_trades, summarize
+from core.signals.engine import generate_signals
 
 
 class BacktestResult(pd.DataFrame):
     pass
 
 
+EXPORT_FORMATS = ("csv", "parquet", "arrow")
+
+
+def epoch_ms(times) -> np.ndarray:
+    """Return datetimes as int64 epoch milliseconds."""
+    return np.asarray(pd.DatetimeIndex(times).as_unit("ms").asi8, dtype=np.int64)
+
+
 def run_backtest(df: pd.DataFrame, settings: Settings) -> Dict:
-    """Run simple backtest on DataFrame."""
-    trades: List[Dict] = []
-    position = None
-    entry_price = sl = tp = 0.0
-    equity = 0.0
-    max_equity = 0.0
-    max_drawdown = 0.0
-
-    for i in range(len(df)):
-        sub_df = df.iloc[: i + 1]
-        signal = generate_signal(sub_df, settings)["signal"]
-        row = df.iloc[i]
-        if position is None and signal in {"LONG", "SHORT"}:
-            position = signal
-            entry_price = row["close"]
-            atr = row["atr"]
-            if position == "LONG":
-                sl = entry_price - 1.5 * atr
-                tp = entry_price + atr
-            else:
-                sl = entry_price + 1.5 * atr
-                tp = entry_price - atr
-            entry_time = row["open_time"]
-        elif position:
-            exit_price = None
-            exit_time = row["open_time"]
-            if position == "LONG":
-                if row["low"] <= sl:
-                    exit_price = sl
-                elif row["high"] >= tp:
-                    exit_price = tp
-            else:
-                if row["high"] >= sl:
-                    exit_price = sl
-                elif row["low"] <= tp:
-                    exit_price = tp
-            if exit_price is not None:
-                pnl = exit_price - entry_price if position == "LONG" else entry_price - exit_price
-                equity += pnl
-                max_equity = max(max_equity, equity)
-                drawdown = max_equity - equity
-                max_drawdown = max(max_drawdown, drawdown)
-                trades.append({
-                    "entry_time": entry_time,
-                    "exit_time": exit_time,
-                    "side": position,
-                    "entry": entry_price,
-                    "exit": exit_price,
-                    "pnl": pnl,
-                })
-                position = None
-    wins = sum(1 for t in trades if t["pnl"] > 0)
-    losses = sum(1 for t in trades if t["pnl"] <= 0)
-    total_trades = len(trades)
-    win_rate = wins / total_trades * 100 if total_trades else 0
-    avg_win = sum(t["pnl"] for t in trades if t["pnl"] > 0) / wins if wins else 0
-    avg_loss = sum(t["pnl"] for t in trades if t["pnl"] <= 0) / losses if losses else 0
-    expectancy = win_rate / 100 * avg_win + (1 - win_rate / 100) * avg_loss
+    """Run simple backtest on DataFrame.
 
+    Besides the trade list and summary statistics (also grouped under
+    ``metrics``), the result holds ``equity_curve``: a dict of two NumPy
+    arrays, ``time`` in epoch milliseconds and cumulative realized ``equity``
+    for every bar.
+    """
+    signals = generate_signals(df, settings)
+    side = np.select([signals["signal"] == "LONG", signals["signal"] == "SHORT"], [1, -1], 0)
+    result = simulate_trades(
+        side,
+        df["high"].to_numpy(dtype=float),
+        df["low"].to_numpy(dtype=float),
+        df["close"].to_numpy(dtype=float),
+        df["atr"].to_numpy(dtype=float),
+    )
+    open_times = df["open_time"].to_numpy()
+    trades: List[Dict] = [
+        {
+            "entry_time": pd.Timestamp(entry_time),
+            "exit_time": pd.Timestamp(exit_time),
+            "side": "LONG" if direction > 0 else "SHORT",
+            "entry": entry,
+            "exit": exit_,
+            "pnl": pnl,
+        }
+        for entry_time, exit_time, direction, entry, exit_, pnl in zip(
+            open_times[result.entry_idx],
+            open_times[result.exit_idx],
+            result.side.tolist(),
+            result.entry.tolist(),
+            result.exit.tolist(),
+            result.pnl.tolist(),
+        )
+    ]
+    stats = summarize(result.pnl)
+    equity = realized_equity(len(df), result.exit_idx, result.pnl)
     return {
         "trades": trades,
-        "total_trades": total_trades,
-        "win_rate": win_rate,
-        "avg_win": avg_win,
-        "avg_loss": avg_loss,
-        "expectancy": expectancy,
-        "max_drawdown": max_drawdown,
-        "pnl": equity,
+        **stats,
+        "metrics": stats,
+        "equity_curve": {"time": epoch_ms(df["open_time"]), "equity": equity},
     }
 
 
-def save_backtest(trades: List[Dict], symbol: str, timeframe: str, data_dir: str) -> Path:
+def downsample_curve(curve: Dict[str, np.ndarray], max_points: int) -> Dict[str, np.ndarray]:
+    """Reduce ``curve`` to at most ``max_points`` points for display.
+
+    The curve is cut into buckets and the minimum and maximum of each bucket
+    are kept, so peaks and drawdowns survive.  The last point is always kept.
+    """
+    time, equity = curve["time"], curve["equity"]
+    n = len(equity)
+    if max_points <= 0 or n <= max_points:
+        return curve
+    buckets = max(1, (max_points - 1) // 2)
+    edges = np.linspace(0, n - 1, buckets + 1).astype(np.int64)
+    keep = [n - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        segment = equity[start:stop]
+        if segment.size:
+            keep.extend((start + segment.argmin(), start + segment.argmax()))
+    idx = np.unique(keep)
+    return {"time": time[idx], "equity": equity[idx]}
+
+
+def save_backtest(
+    trades: List[Dict],
+    symbol: str,
+    timeframe: str,
+    data_dir: str,
+    fmt: str = "csv",
+    equity_curve: Dict[str, np.ndarray] | None = None,
+) -> Path:
+    """Write trades to ``data_dir`` and return the file path.
+
+    ``fmt`` is ``csv``, ``parquet`` or ``arrow`` (Feather v2).  For the
+    columnar formats ``equity_curve``, when given, is written next to the
+    trades as ``backtest_<symbol>_<timeframe>_equity.<ext>``.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unsupported export format: {fmt}")
     df = pd.DataFrame(trades)
-    path = Path(data_dir) / f"backtest_{symbol}_{timeframe}.csv"
-    df.to_csv(path, index=False)
-    return path
+    stem = Path(data_dir) / f"backtest_{symbol}_{timeframe}"
+    if fmt == "csv":
+        path = stem.with_suffix(".csv")
+        df.to_csv(path, index=False)
+        return path
+    frames = {stem: df}
+    if equity_curve is not None:
+        frames[stem.with_name(f"{stem.name}_equity")] = pd.DataFrame(equity_curve)
+    for base, frame in frames.items():
+        if fmt == "parquet":
+            frame.to_parquet(base.with_suffix(".parquet"), index=False)
+        else:
+            frame.to_feather(base.with_suffix(".arrow"))
+    return stem.with_suffix(f".{fmt}")
@@ -0,0 +1,183 @@
+"""Parameter sweep (grid search) over the backtester.
+
+:func:`precompute`, :func:`slice_columns`, :func:`evaluate` and
+:func:`simulate` work on explicit indicator columns and are shared with
+:mod:`core.backtest.walkforward`.  Worker processes receive their columns
+once through :func:`init_worker` and read them with :func:`worker_columns`.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+from config import Settings
+from core.backtest.engine import Trades, simulate_trades, summarize
+from core.signals.engine import signal_masks
+
+SWEEP_PARAMS = ("ema_fast", "ema_slow", "rsi_len", "rsi_overbought", "rsi_oversold", "atr_len")
+# Summary statistics results can be ranked by, and whether higher is better.
+# ``avg_loss`` is zero or negative, so higher means smaller losses.
+RANK_METRICS = {
+    "pnl": True,
+    "expectancy": True,
+    "win_rate": True,
+    "avg_win": True,
+    "avg_loss": True,
+    "max_drawdown": False,
+    "total_trades": True,
+}
+
+# Indicator columns of a worker process, set by ``init_worker``.  Only
+# worker processes use it: inline runs pass their columns explicitly, so
+# concurrent sweeps in threads of one process don't share it.
+_columns: dict = {}
+
+
+def init_worker(columns: dict) -> None:
+    """Process pool initializer storing the columns of a worker process."""
+    global _columns
+    _columns = columns
+
+
+def worker_columns() -> dict:
+    """Return the columns stored by :func:`init_worker` in this process."""
+    return _columns
+
+
+def precompute(df: pd.DataFrame, grid: Mapping[str, list]) -> dict:
+    """Compute every distinct indicator column of the grid exactly once."""
+    close = df["close"]
+    ema = {
+        length: ta.ema(close, length=length).to_numpy(dtype=float)
+        for length in set(grid["ema_fast"]) | set(grid["ema_slow"])
+    }
+    return {
+        "close": close.to_numpy(dtype=float),
+        "high": df["high"].to_numpy(dtype=float),
+        "low": df["low"].to_numpy(dtype=float),
+        "ema": ema,
+        "rsi": {
+            length: ta.rsi(close, length=length).to_numpy(dtype=float) for length in grid["rsi_len"]
+        },
+        "atr": {
+            length: ta.atr(df["high"], df["low"], close, length=length).to_numpy(dtype=float)
+            for length in grid["atr_len"]
+        },
+    }
+
+
+def slice_columns(columns: dict, start: int, stop: int) -> dict:
+    """Return views of ``columns`` restricted to bars ``start:stop``."""
+    return {
+        key: {k: v[start:stop] for k, v in value.items()} if isinstance(value, dict) else value[start:stop]
+        for key, value in columns.items()
+    }
+
+
+def _evaluate(params: dict) -> dict:
+    """Backtest one parameter combination against the worker's columns."""
+    return evaluate(_columns, params)
+
+
+def evaluate(cols: dict, params: dict) -> dict:
+    """Return ``params`` with the summary statistics of their backtest on ``cols``."""
+    return {**params, **summarize(simulate(cols, params).pnl)}
+
+
+def evaluate_many(cols: dict, combos: list[dict]) -> list[dict]:
+    """:func:`evaluate` every combination of ``combos``, e.g. in a shared pool."""
+    return [evaluate(cols, params) for params in combos]
+
+
+def simulate(cols: dict, params: dict) -> Trades:
+    """Backtest one parameter combination on the indicator columns ``cols``."""
+    atr = cols["atr"][params["atr_len"]]
+    thresholds = Settings.model_construct(
+        rsi_overbought=params["rsi_overbought"], rsi_oversold=params["rsi_oversold"]
+    )
+    long_mask, short_mask = signal_masks(
+        cols["close"],
+        cols["ema"][params["ema_fast"]],
+        cols["ema"][params["ema_slow"]],
+        cols["rsi"][params["rsi_len"]],
+        atr,
+        thresholds,
+    )
+    side = long_mask.astype(np.int8) - short_mask.astype(np.int8)
+    return simulate_trades(side, cols["high"], cols["low"], cols["close"], atr)
+
+
+def expand_grid(settings: Settings, grid: Mapping[str, Iterable[int]]) -> list[dict]:
+    """Return the parameter combinations described by ``grid``.
+
+    Parameters missing from ``grid`` keep their value from ``settings``.
+    Combinations where ``ema_fast`` is not shorter than ``ema_slow`` are
+    dropped.
+    """
+    unknown = set(grid) - set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"unsupported sweep parameters: {sorted(unknown)}")
+    values = [list(grid.get(name) or [getattr(settings, name)]) for name in SWEEP_PARAMS]
+    combos = [dict(zip(SWEEP_PARAMS, combo)) for combo in itertools.product(*values)]
+    return [c for c in combos if c["ema_fast"] < c["ema_slow"]]
+
+
+def prepare(df: pd.DataFrame, settings: Settings, grid: Mapping[str, Iterable[int]]) -> tuple[list[dict], dict]:
+    """Return the combinations of ``grid`` and the indicator columns they need."""
+    combos = expand_grid(settings, grid)
+    columns = precompute(df, {name: sorted({c[name] for c in combos}) for name in SWEEP_PARAMS}) if combos else {}
+    return combos, columns
+
+
+def check_rank_by(rank_by: str) -> None:
+    """Raise ``ValueError`` unless ``rank_by`` is one of :data:`RANK_METRICS`."""
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"can't rank by {rank_by!r}; use one of {sorted(RANK_METRICS)}")
+
+
+def rank(rows: list[dict], rank_by: str = "pnl") -> pd.DataFrame:
+    """Return sweep result ``rows`` as a table sorted by ``rank_by``, best first."""
+    check_rank_by(rank_by)
+    if not rows:
+        return pd.DataFrame(columns=list(SWEEP_PARAMS))
+    table = pd.DataFrame(rows)
+    return table.sort_values(rank_by, ascending=not RANK_METRICS[rank_by], kind="stable").reset_index(drop=True)
+
+
+def run_sweep(
+    df: pd.DataFrame,
+    settings: Settings,
+    grid: Mapping[str, Iterable[int]],
+    processes: int | None = None,
+    rank_by: str = "pnl",
+) -> pd.DataFrame:
+    """Backtest every combination of ``grid`` and return a ranked table.
+
+    ``df`` only needs OHLC columns; indicators are computed here once per
+    distinct length.  Combinations are spread over ``processes`` worker
+    processes (all cores by default, ``1`` runs inline).  The returned
+    DataFrame has one row per combination with its parameters and summary
+    statistics, best ``rank_by`` first (see :data:`RANK_METRICS`).
+
+    The server doesn't call this: it runs :func:`evaluate_many` in the
+    bounded pool of its job manager instead of starting a pool per request.
+    """
+    check_rank_by(rank_by)
+    combos, columns = prepare(df, settings, grid)
+    if not combos:
+        return rank([], rank_by)
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(combos) == 1:
+        rows = [evaluate(columns, c) for c in combos]
+    else:
+        chunksize = max(1, len(combos) // (processes * 4))
+        with ProcessPoolExecutor(processes, initializer=init_worker, initargs=(columns,)) as pool:
+            rows = list(pool.map(_evaluate, combos, chunksize=chunksize))
+    return rank(rows, rank_by)
@@ -0,0 +1,100 @@
+"""Walk-forward optimization on top of the parameter sweep.
+
+History is split into rolling windows of ``train_bars`` in-sample bars
+followed by ``test_bars`` out-of-sample bars.  Parameters are optimized on
+each in-sample window and the winner is evaluated on the window that
+follows it.  Indicator columns are computed once over the full history and
+every window works on views of them, so the cost grows linearly with the
+length of the history rather than with ``windows * window size``.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from config import Settings
+from core.backtest import sweep
+from core.backtest.engine import summarize
+
+
+def window_bounds(n: int, train_bars: int, test_bars: int, step: int | None = None) -> list[tuple[int, int, int]]:
+    """Return ``(start, split, stop)`` bar indices of each walk-forward window."""
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive")
+    step = step or test_bars
+    bounds = []
+    start = 0
+    while start + train_bars + test_bars <= n:
+        bounds.append((start, start + train_bars, start + train_bars + test_bars))
+        start += step
+    return bounds
+
+
+def _run_window(task: tuple[tuple[int, int, int], list[dict], str]) -> dict:
+    """Worker process entry point: run one window on the worker's columns."""
+    return _run_window_on(sweep.worker_columns(), task)
+
+
+def _run_window_on(columns: dict, task: tuple[tuple[int, int, int], list[dict], str]) -> dict:
+    (start, split, stop), combos, rank_by = task
+    in_sample = sweep.slice_columns(columns, start, split)
+    results = [sweep.evaluate(in_sample, params) for params in combos]
+    best = (max if sweep.RANK_METRICS[rank_by] else min)(results, key=lambda r: r[rank_by])
+    params = {name: best[name] for name in sweep.SWEEP_PARAMS}
+    out_sample = sweep.slice_columns(columns, split, stop)
+    pnl = sweep.simulate(out_sample, params).pnl
+    return {
+        "start": start,
+        "split": split,
+        "stop": stop,
+        **params,
+        f"in_sample_{rank_by}": best[rank_by],
+        **summarize(pnl),
+        "_pnl": pnl,
+    }
+
+
+def run_walk_forward(
+    df: pd.DataFrame,
+    settings: Settings,
+    grid: Mapping[str, Iterable[int]],
+    train_bars: int,
+    test_bars: int,
+    step: int | None = None,
+    processes: int | None = None,
+    rank_by: str = "pnl",
+) -> dict:
+    """Run a walk-forward optimization of ``grid`` over ``df``.
+
+    Returns the combined out-of-sample summary statistics plus a ``windows``
+    list describing each window: its bar range, the parameters chosen
+    in-sample and their out-of-sample statistics.  Windows are evaluated in
+    parallel across ``processes`` worker processes (``1`` runs inline).
+    """
+    sweep.check_rank_by(rank_by)
+    combos = sweep.expand_grid(settings, grid)
+    if not combos:
+        raise ValueError("parameter grid is empty")
+    bounds = window_bounds(len(df), train_bars, test_bars, step)
+    columns = sweep.precompute(df, {name: sorted({c[name] for c in combos}) for name in sweep.SWEEP_PARAMS})
+    tasks = [(b, combos, rank_by) for b in bounds]
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(tasks) <= 1:
+        windows = [_run_window_on(columns, t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(processes, initializer=sweep.init_worker, initargs=(columns,)) as pool:
+            windows = list(pool.map(_run_window, tasks))
+
+    pnl = np.concatenate([w.pop("_pnl") for w in windows]) if windows else np.empty(0)
+    if "open_time" in df:
+        open_times = df["open_time"]
+        for w in windows:
+            w["start_time"] = open_times.iloc[w["start"]]
+            w["split_time"] = open_times.iloc[w["split"]]
+            w["stop_time"] = open_times.iloc[w["stop"] - 1]
+    return {"windows": windows, **summarize(pnl)}
@@ -2,25 +2,90 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+import json
+import time
+from typing import TYPE_CHECKING, Any, Iterable
 
 import httpx
+import numpy as np
 import pandas as pd
+from cachetools import TTLCache
 
+try:
+    import orjson
+except ImportError:  # optional; the stdlib decoder is just slower
+    orjson = None
+
+from core.datasources.ranges import missing_ranges
+from core.datasources.ratelimit import BACKFILL, LIVE, WeightLimiter, request_weight
+from core.datasources.singleflight import SingleFlight, request_key
 from services.http_client import get_client
 
+if TYPE_CHECKING:  # the candle store imports this module
+    from core.datasources.candle_store import CandleStore
+
 BASE_URL = "https://api.binance.com/api/v3"
 
+_inflight = SingleFlight()
+# Request weight budget shared by every Binance call of this process.
+limiter = WeightLimiter()
+
+
+async def _request(
+    url: str,
+    params: dict[str, Any] | None = None,
+    retries: int = 3,
+    priority: int = LIVE,
+    raw: bool = False,
+) -> Any:
+    """Perform HTTP GET, sharing one request between concurrent identical calls.
+
+    With ``raw`` the undecoded response body is returned.
+    """
+    key = request_key(url, params) + (raw,)
+    return await _inflight.do(key, lambda: _get(url, params, retries, priority, raw))
+
+
+def _retry_after(resp: httpx.Response, default: float) -> float:
+    try:
+        return float(resp.headers.get("retry-after", default))
+    except ValueError:
+        return default
+
+
+async def _get(
+    url: str,
+    params: dict[str, Any] | None = None,
+    retries: int = 3,
+    priority: int = LIVE,
+    raw: bool = False,
+) -> Any:
+    """Perform HTTP GET within the weight budget, with basic retry/backoff.
 
-async def _request(url: str, params: dict[str, Any] | None = None, retries: int = 3) -> Any:
-    """Perform HTTP GET with basic retry/backoff."""
+    A 429 pauses every request for ``Retry-After`` seconds before retrying;
+    a 418 (IP ban) pauses them and raises without retrying, as do other
+    4xx responses.
+    """
     backoff = 1
     client = get_client()
+    weight = request_weight(url, params)
     for attempt in range(retries):
+        await limiter.acquire(weight, priority)
         try:
             resp = await client.get(url, params=params)
+            limiter.update(resp.headers)
+            if resp.status_code in (418, 429):
+                limiter.pause(_retry_after(resp, backoff))
             resp.raise_for_status()
-            return resp.json()
+            return resp.content if raw else resp.json()
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code
+            # Other client errors won't succeed on retry and still cost weight.
+            if (400 <= status < 500 and status != 429) or attempt == retries - 1:
+                raise
+            if status != 429:
+                await asyncio.sleep(backoff)
+            backoff *= 2
         except httpx.HTTPError:
             if attempt == retries - 1:
                 raise
@@ -28,35 +93,84 @@ async def _request(url: str, params: dict[str, Any] | None = None, retries: int
             backoff *= 2
 
 
-async def get_klines(symbol: str, interval: str, limit: int = 1000) -> pd.DataFrame:
-    """Fetch kline data and return as DataFrame."""
+def rate_limit_usage() -> dict:
+    """Return the current request weight budget usage."""
+    return limiter.usage()
+
+
+# Columns kept in kline frames; the other raw fields are never used.
+KLINE_COLUMNS = ["open_time", "open", "high", "low", "close", "volume", "close_time"]
+_PRICE_FIELDS = (1, 2, 3, 4, 5)
+_TIME_FIELDS = (0, 6)
+
+# Maximum number of candles Binance returns per klines request.
+MAX_KLINES = 1000
+
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 3_600_000,
+    "2h": 2 * 3_600_000,
+    "4h": 4 * 3_600_000,
+    "6h": 6 * 3_600_000,
+    "8h": 8 * 3_600_000,
+    "12h": 12 * 3_600_000,
+    "1d": 86_400_000,
+    "3d": 3 * 86_400_000,
+    "1w": 7 * 86_400_000,
+}
+
+
+def _loads(payload: bytes | str) -> Any:
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+
+def _klines_frame(data: bytes | str | list) -> pd.DataFrame:
+    """Convert a klines payload (raw JSON or decoded rows) into a typed DataFrame.
+
+    Prices and volume go straight into one float64 block and the open/close
+    times into one int64 block, one column at a time, so no object columns
+    or dtype conversion passes over the frame are needed.
+    """
+    rows = _loads(data) if isinstance(data, (bytes, str)) else data
+    n = len(rows)
+    prices = np.empty((len(_PRICE_FIELDS), n), dtype=np.float64)
+    times = np.empty((len(_TIME_FIELDS), n), dtype=np.int64)
+    for out, field in enumerate(_PRICE_FIELDS):
+        prices[out] = [row[field] for row in rows]
+    for out, field in enumerate(_TIME_FIELDS):
+        times[out] = [row[field] for row in rows]
+    times_ns = times.astype("datetime64[ms]").astype("datetime64[ns]")
+    return pd.DataFrame(
+        {
+            "open_time": times_ns[0],
+            "open": prices[0],
+            "high": prices[1],
+            "low": prices[2],
+            "close": prices[3],
+            "volume": prices[4],
+            "close_time": times_ns[1],
+        },
+        copy=False,
+    )
+
+
+async def get_klines(symbol: str, interval: str, limit: int = 1000, fallback: bool = True) -> pd.DataFrame:
+    """Fetch kline data and return as DataFrame.
+
+    Without ``fallback`` network errors are raised instead of returning
+    the zero-filled placeholder frame.
+    """
     url = f"{BASE_URL}/klines"
     params = {"symbol": symbol, "interval": interval, "limit": limit}
     try:
-        data = await _request(url, params)
-        df = pd.DataFrame(
-            data,
-            columns=[
-                "open_time",
-                "open",
-                "high",
-                "low",
-                "close",
-                "volume",
-                "close_time",
-                "quote_asset_volume",
-                "trades",
-                "taker_base_volume",
-                "taker_quote_volume",
-                "ignore",
-            ],
-        )
-        numeric_cols = ["open", "high", "low", "close", "volume"]
-        df[numeric_cols] = df[numeric_cols].astype(float)
-        df["open_time"] = pd.to_datetime(df["open_time"], unit="ms")
-        df["close_time"] = pd.to_datetime(df["close_time"], unit="ms")
-        return df
+        return _klines_frame(await _request(url, params, raw=True))
     except httpx.HTTPError:
+        if not fallback:
+            raise
         # Fall back to empty data when the API cannot be reached (e.g. offline
         # or blocked by a proxy).  This mirrors the expected schema so callers
         # can continue to operate without crashing during application startup
@@ -71,26 +185,229 @@ async def get_klines(symbol: str, interval: str, limit: int = 1000) -> pd.DataFr
                 "close": 0.0,
                 "volume": 0.0,
                 "close_time": ts,
-                "quote_asset_volume": 0.0,
-                "trades": 0,
-                "taker_base_volume": 0.0,
-                "taker_quote_volume": 0.0,
-                "ignore": 0,
             }
         )
 
 
+def merge_klines(stored: pd.DataFrame | None, fresh: pd.DataFrame, max_len: int = MAX_KLINES) -> pd.DataFrame:
+    """Replace candles of ``stored`` from the first open time in ``fresh`` on.
+
+    The still-open last candle of ``stored`` is overwritten by its newer
+    version in ``fresh``; only the last ``max_len`` candles are kept.
+    """
+    if stored is not None and len(fresh):
+        stored = stored[stored["open_time"] < fresh["open_time"].iloc[0]]
+        fresh = pd.concat([stored, fresh], ignore_index=True)
+    elif stored is not None:
+        fresh = stored
+    return fresh.iloc[-max_len:].reset_index(drop=True)
+
+
+async def get_klines_delta(
+    symbol: str, interval: str, stored: pd.DataFrame | None = None, max_len: int = MAX_KLINES
+) -> pd.DataFrame:
+    """Return ``stored`` updated with the candles opened since its last one.
+
+    Only candles from the last stored ``open_time`` on are requested (via
+    ``startTime``), usually one or two per call.  Without ``stored``, or
+    when it is too far behind to catch up in one request, the latest
+    ``max_len`` candles are fetched instead.  On network errors ``stored``
+    is returned unchanged.
+    """
+    if stored is None or stored.empty:
+        return await get_klines(symbol, interval, limit=min(max_len, MAX_KLINES))
+    start_ms = int(stored["open_time"].iloc[-1].value // 1_000_000)
+    params = {"symbol": symbol, "interval": interval, "startTime": start_ms, "limit": MAX_KLINES}
+    try:
+        fresh = _klines_frame(await _request(f"{BASE_URL}/klines", params, raw=True))
+    except httpx.HTTPError:
+        return stored
+    if len(fresh) >= MAX_KLINES:
+        return await get_klines(symbol, interval, limit=min(max_len, MAX_KLINES))
+    return merge_klines(stored, fresh, max_len)
+
+
+async def get_klines_page(
+    symbol: str, interval: str, start_ms: int, end_ms: int, priority: int = BACKFILL
+) -> pd.DataFrame:
+    """Fetch the klines with open time in ``[start_ms, end_ms)`` in one request.
+
+    The span must hold at most ``MAX_KLINES`` candles.
+    """
+    params = {
+        "symbol": symbol,
+        "interval": interval,
+        "startTime": start_ms,
+        "endTime": end_ms - 1,
+        "limit": MAX_KLINES,
+    }
+    return _klines_frame(await _request(f"{BASE_URL}/klines", params, priority=priority, raw=True))
+
+
+async def _fetch_range(
+    symbol: str, interval: str, start_ms: int, end_ms: int, concurrency: int
+) -> pd.DataFrame:
+    """Fetch all klines with open time in ``[start_ms, end_ms)``, page by page."""
+    page_ms = INTERVAL_MS[interval] * MAX_KLINES
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_page(page_start: int) -> pd.DataFrame:
+        async with semaphore:
+            return await get_klines_page(symbol, interval, page_start, min(page_start + page_ms, end_ms))
+
+    tasks = [asyncio.ensure_future(fetch_page(p)) for p in range(start_ms, end_ms, page_ms)]
+    try:
+        pages = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return pd.concat(pages, ignore_index=True) if pages else _klines_frame([])
+
+
+async def get_historical_klines(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int | None = None,
+    store: CandleStore | None = None,
+    concurrency: int = 4,
+) -> pd.DataFrame:
+    """Return closed klines with open time in ``[start_ms, end_ms)``.
+
+    Spans longer than one request are fetched as concurrent pages of
+    ``MAX_KLINES`` candles, at most ``concurrency`` at a time.  With a
+    candle ``store`` only the parts of the span it doesn't cover yet are
+    requested; they are added to it and the span is read back from it.  The
+    still-forming candle is never returned or stored.
+    """
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"unsupported interval for historical fetch: {interval}")
+    interval_ms = INTERVAL_MS[interval]
+    now_ms = int(time.time() * 1000)
+    closed_ms = now_ms - now_ms % interval_ms
+    end_ms = min(end_ms or closed_ms, closed_ms)
+    start_ms -= start_ms % interval_ms
+
+    start = pd.Timestamp(start_ms, unit="ms")
+    end = pd.Timestamp(end_ms, unit="ms")
+    if store is None:
+        df = await _fetch_range(symbol, interval, start_ms, end_ms, concurrency)
+        df = df.drop_duplicates("open_time", keep="last").sort_values("open_time", ignore_index=True)
+        return df.loc[(df["open_time"] >= start) & (df["open_time"] < end)].reset_index(drop=True)
+
+    for m_start, m_end in missing_ranges(store.covered(symbol, interval), start_ms, end_ms):
+        fetched = await _fetch_range(symbol, interval, m_start, m_end, concurrency)
+        store.insert(symbol, interval, fetched)
+        store.add_covered(symbol, interval, [(m_start, m_end)])
+    df = store.read(symbol, interval, start, end)
+    return df if len(df) else _klines_frame([])
+
+
 async def get_24h_ticker(symbol: str) -> dict[str, Any]:
     url = f"{BASE_URL}/ticker/24hr"
     params = {"symbol": symbol}
     try:
-        return await _request(url, params)
+        # Concurrent callers share the decoded payload; each gets its own copy.
+        return dict(await _request(url, params))
     except httpx.HTTPError:
         # Return zeros when the API cannot be reached so callers can
         # gracefully fall back to empty data during offline tests.
         return {"priceChangePercent": 0, "volume": 0}
 
 
+# Above this many symbols the full ticker list costs the same weight.
+MAX_TICKER_SYMBOLS = 100
+
+
+async def get_24h_tickers(symbols: Iterable[str] | None = None) -> dict[str, dict[str, Any]]:
+    """Return 24h tickers keyed by symbol from a single request.
+
+    Without ``symbols`` (or with more than ``MAX_TICKER_SYMBOLS``) the
+    tickers of every symbol on the exchange are returned.
+    """
+    url = f"{BASE_URL}/ticker/24hr"
+    symbols = sorted(set(symbols or ()))
+    params = None
+    if 0 < len(symbols) <= MAX_TICKER_SYMBOLS:
+        params = {"symbols": json.dumps(symbols, separators=(",", ":"))}
+    data = await _request(url, params)
+    return {ticker["symbol"]: dict(ticker) for ticker in data}
+
+
+class TickerSnapshot:
+    """Short-lived snapshot of 24h tickers shared by all callers.
+
+    Every symbol asked for is remembered, and one bulk request refreshes
+    all of them once the snapshot is older than ``ttl`` seconds or lacks a
+    requested symbol.  Concurrent refreshes share one request.  If the bulk
+    request is rejected (one unknown symbol fails it), tickers are fetched
+    one by one; symbols the exchange rejects are then left out of later bulk
+    requests for ``reject_ttl`` seconds and get the zero fallback.  When the
+    exchange can't be reached the last tickers are kept until the next
+    refresh.
+    """
+
+    def __init__(self, ttl: float = 5.0, reject_ttl: float = 3600.0) -> None:
+        self.ttl = ttl
+        self._symbols: set[str] = set()
+        self._rejected: TTLCache = TTLCache(maxsize=1024, ttl=reject_ttl)
+        self._tickers: dict[str, dict[str, Any]] = {}
+        self._fetched_at = float("-inf")
+        self._flight = SingleFlight()
+
+    async def _single(self, symbol: str) -> dict[str, Any] | None:
+        try:
+            return await _request(f"{BASE_URL}/ticker/24hr", {"symbol": symbol})
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 400:
+                self._rejected[symbol] = True
+                self._symbols.discard(symbol)
+            return None
+        except httpx.HTTPError:
+            return None
+
+    async def _refresh(self) -> bool:
+        """Refresh the snapshot; return whether the exchange answered."""
+        symbols = sorted(self._symbols)
+        ok = True
+        if not symbols:
+            # Without symbols the bulk request would return every ticker.
+            tickers = {}
+        else:
+            try:
+                tickers = await get_24h_tickers(symbols)
+            except httpx.HTTPError as exc:
+                rejected = isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 400
+                if rejected:
+                    # Some symbol is unknown; find it with one request each.
+                    results = await asyncio.gather(*(self._single(sym) for sym in symbols))
+                    tickers = {sym: ticker for sym, ticker in zip(symbols, results) if ticker is not None}
+                else:
+                    # Unreachable or failing: keep the last tickers until the
+                    # next refresh rather than sending one request per symbol.
+                    tickers, ok = self._tickers, False
+        self._tickers = tickers
+        self._fetched_at = time.monotonic()
+        return ok
+
+    async def get(self, symbols: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return the tickers of ``symbols``, refreshing the snapshot if needed."""
+        symbols = list(symbols)
+        wanted = [sym for sym in symbols if sym not in self._rejected]
+        self._symbols.update(wanted)
+        stale = time.monotonic() - self._fetched_at >= self.ttl
+        if stale or any(sym not in self._tickers for sym in wanted):
+            ok = await self._flight.do("refresh", self._refresh)
+            if ok and any(sym not in self._tickers and sym in self._symbols for sym in wanted):
+                # Asked for while a refresh without them was in flight.
+                await self._flight.do("refresh", self._refresh)
+        return {sym: dict(self._tickers.get(sym, {"priceChangePercent": 0, "volume": 0})) for sym in symbols}
+
+
+ticker_snapshot = TickerSnapshot()
+
+
 async def get_price(symbol: str) -> float:
     url = f"{BASE_URL}/ticker/price"
     params = {"symbol": symbol}
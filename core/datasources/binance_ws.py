@@ -0,0 +1,91 @@
+"""Binance WebSocket kline streams.
+
+Subscribes to the combined ``<symbol>@kline_<interval>`` streams and yields
+one parsed candle per message.  The connection is re-established with
+exponential backoff whenever it drops; ``on_connect`` runs after every
+(re)connect so the caller can backfill candles missed in between over REST.
+
+Requires the optional ``websockets`` package.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+
+import pandas as pd
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def stream_names(symbols: Iterable[str], intervals: Iterable[str]) -> list[str]:
+    """Return the combined stream names for every symbol and interval."""
+    intervals = list(intervals)
+    return [f"{sym.lower()}@kline_{tf}" for sym in symbols for tf in intervals]
+
+
+def parse_kline(message: str | bytes) -> tuple[str, str, dict, bool] | None:
+    """Parse a combined-stream kline message into ``(symbol, interval, row, closed)``.
+
+    ``row`` has the columns of :func:`core.datasources.binance.get_klines`;
+    messages that aren't klines return ``None``.
+    """
+    payload = json.loads(message)
+    data = payload.get("data", payload)
+    if data.get("e") != "kline":
+        return None
+    k = data["k"]
+    row = {
+        "open_time": pd.Timestamp(k["t"], unit="ms"),
+        "open": float(k["o"]),
+        "high": float(k["h"]),
+        "low": float(k["l"]),
+        "close": float(k["c"]),
+        "volume": float(k["v"]),
+        "close_time": pd.Timestamp(k["T"], unit="ms"),
+    }
+    return data["s"], k["i"], row, bool(k["x"])
+
+
+async def stream_klines(
+    symbols: Iterable[str],
+    intervals: Iterable[str],
+    url: str | None = None,
+    on_connect: Callable[[], Awaitable[None]] | None = None,
+    reconnect_delay: float = 1.0,
+    max_delay: float = 60.0,
+) -> AsyncIterator[tuple[str, str, dict, bool]]:
+    """Yield parsed klines forever, reconnecting when the connection drops.
+
+    ``url`` defaults to ``settings.binance_ws_url``.
+    """
+    import websockets
+
+    url = url or settings.binance_ws_url
+    names = stream_names(symbols, intervals)
+    if not names:
+        return
+    target = f"{url}?streams={'/'.join(names)}"
+    delay = reconnect_delay
+    while True:
+        try:
+            async with websockets.connect(target) as ws:
+                logger.info("connected to %d kline streams", len(names))
+                if on_connect is not None:
+                    await on_connect()
+                delay = reconnect_delay
+                async for message in ws:
+                    try:
+                        kline = parse_kline(message)
+                    except (ValueError, KeyError, TypeError):
+                        logger.exception("skipping malformed kline message")
+                        continue
+                    if kline is not None:
+                        yield kline
+        except (OSError, websockets.WebSocketException) as exc:
+            logger.warning("kline stream disconnected (%s); retrying in %.1fs", exc, delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
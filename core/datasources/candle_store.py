@@ -0,0 +1,237 @@
+"""Append-only, date-partitioned store of closed candles.
+
+Candles of each symbol/interval live under ``<root>/<symbol>/<interval>/``
+in one directory per UTC day of their open time, as Arrow IPC files::
+
+    BTCUSDT/1m/2024-01-31/part-1706659200000.arrow
+
+Appending writes a new small part file with only the closed candles newer
+than the last stored one, so the I/O per update scales with the new candles
+rather than the length of the history.  Once a day has collected
+``max_parts`` part files they are compacted into one.  Range reads only open
+the days that overlap the range and memory-map their files.
+
+A ``covered.json`` file next to the day directories lists the open-time
+ranges (epoch milliseconds) whose candles have all been stored, including
+ranges where the exchange had none, so only the rest of a span needs to be
+fetched.  Appends cover the span of the frame they come from; historical
+fetches and backfills record their pages.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from core.datasources.binance import INTERVAL_MS, KLINE_COLUMNS
+from core.datasources.ranges import Range, merge_ranges
+
+_PART_PREFIX = "part-"
+_SUFFIX = ".arrow"
+_COVERED = "covered.json"
+
+
+def _day(ts: pd.Timestamp) -> str:
+    return ts.strftime("%Y-%m-%d")
+
+
+def _scalar(ts: pd.Timestamp, type_):
+    """Return ``ts`` as an Arrow scalar of timestamp type ``type_``, whatever its unit."""
+    import pyarrow as pa
+
+    return pa.scalar(ts.value, pa.timestamp("ns")).cast(type_)
+
+
+def _first_ms(path: Path) -> int:
+    return int(path.name[len(_PART_PREFIX):-len(_SUFFIX)])
+
+
+class CandleStore:
+    """Closed candles on disk under ``root``."""
+
+    def __init__(self, root: str | Path, max_parts: int = 32) -> None:
+        self.root = Path(root)
+        self.max_parts = max_parts
+        # Open time of the newest stored candle per (symbol, interval).
+        self._last: Dict[Tuple[str, str], pd.Timestamp | None] = {}
+
+    def _dir(self, symbol: str, interval: str) -> Path:
+        return self.root / symbol / interval
+
+    def _days(self, symbol: str, interval: str) -> list[Path]:
+        base = self._dir(symbol, interval)
+        if not base.is_dir():
+            return []
+        return sorted(p for p in base.iterdir() if p.is_dir())
+
+    @staticmethod
+    def _parts(day: Path) -> list[Path]:
+        return sorted(day.glob(f"{_PART_PREFIX}*{_SUFFIX}"), key=_first_ms)
+
+    @staticmethod
+    def _read_parts(parts: list[Path]):
+        import pyarrow as pa
+
+        tables = []
+        for path in parts:
+            with pa.memory_map(str(path)) as source:
+                tables.append(pa.ipc.open_file(source).read_all())
+        return tables
+
+    @staticmethod
+    def _write(path: Path, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp = path.with_suffix(".tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+
+    def covered(self, symbol: str, interval: str) -> list[Range]:
+        """Return the open-time ranges whose candles are all stored."""
+        path = self._dir(symbol, interval) / _COVERED
+        if not path.exists():
+            return []
+        return [tuple(r) for r in json.loads(path.read_text())["ranges"]]
+
+    def add_covered(self, symbol: str, interval: str, ranges: list[Range]) -> None:
+        """Record ``ranges`` as stored."""
+        path = self._dir(symbol, interval) / _COVERED
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"ranges": merge_ranges(self.covered(symbol, interval) + ranges)}))
+        os.replace(tmp, path)
+
+    def last_open_time(self, symbol: str, interval: str) -> pd.Timestamp | None:
+        """Return the open time of the newest stored candle."""
+        key = (symbol, interval)
+        if key not in self._last:
+            days = self._days(symbol, interval)
+            last = None
+            if days:
+                df = self._frame(self._read_parts(self._parts(days[-1])))
+                if len(df):
+                    last = df["open_time"].iloc[-1]
+            self._last[key] = last
+        return self._last[key]
+
+    def append(self, symbol: str, interval: str, df: pd.DataFrame, now: pd.Timestamp | None = None) -> int:
+        """Write the closed candles of ``df`` newer than the stored ones.
+
+        ``df`` is taken to hold every candle of its span, as a klines
+        response does, so that span is recorded as covered.  Returns the
+        number of candles written.
+        """
+        now = now if now is not None else pd.Timestamp.now(tz="UTC").tz_localize(None)
+        last = self.last_open_time(symbol, interval)
+        closed = df[df["close_time"] < now]
+        new = closed if last is None else closed[closed["open_time"] > last]
+        if new.empty:
+            return 0
+        self._write_days(symbol, interval, new[KLINE_COLUMNS].reset_index(drop=True))
+        self._last[(symbol, interval)] = new["open_time"].iloc[-1]
+        if interval in INTERVAL_MS:
+            # Candles of the span up to the last stored one may not all be
+            # on disk, so coverage starts no earlier than that one.
+            first = closed["open_time"].iloc[0] if last is None else max(closed["open_time"].iloc[0], last)
+            first_ms = first.value // 1_000_000
+            last_ms = new["open_time"].iloc[-1].value // 1_000_000
+            self.add_covered(symbol, interval, [(first_ms, last_ms + INTERVAL_MS[interval])])
+        return len(new)
+
+    def insert(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """Write candles of any age, skipping those already stored.
+
+        Meant for backfilling history older than what was appended; only
+        the days the candles fall into are read to find duplicates.
+        Returns the number of candles written.
+        """
+        new = df[KLINE_COLUMNS].drop_duplicates("open_time", keep="last")
+        new = new.sort_values("open_time", ignore_index=True)
+        if new.empty:
+            return 0
+        days = new["open_time"].dt.strftime("%Y-%m-%d")
+        base = self._dir(symbol, interval)
+        stored = self._read_parts([p for day in days.unique() for p in self._parts(base / day)])
+        if stored:
+            existing = self._frame(stored)["open_time"]
+            new = new[~new["open_time"].isin(existing)].reset_index(drop=True)
+        if new.empty:
+            return 0
+        self._write_days(symbol, interval, new)
+        last = self._last.get((symbol, interval))
+        if last is not None and new["open_time"].iloc[-1] > last:
+            self._last[(symbol, interval)] = new["open_time"].iloc[-1]
+        return len(new)
+
+    def _write_days(self, symbol: str, interval: str, new: pd.DataFrame) -> None:
+        """Write ``new`` as one part file per day, compacting full days."""
+        base = self._dir(symbol, interval)
+        days = new["open_time"].dt.strftime("%Y-%m-%d")
+        for day, rows in new.groupby(days, sort=True):
+            folder = base / day
+            folder.mkdir(parents=True, exist_ok=True)
+            first_ms = rows["open_time"].iloc[0].value // 1_000_000
+            self._write(folder / f"{_PART_PREFIX}{first_ms}{_SUFFIX}", rows)
+            if len(self._parts(folder)) >= self.max_parts:
+                self._compact_day(folder)
+
+    def _compact_day(self, folder: Path) -> None:
+        parts = self._parts(folder)
+        if len(parts) < 2:
+            return
+        df = self._frame(self._read_parts(parts))
+        # Written under the name of the first part, then the rest is removed;
+        # a crash in between only leaves duplicates that reads drop.
+        self._write(parts[0], df)
+        for path in parts[1:]:
+            path.unlink()
+
+    def compact(self, symbol: str, interval: str) -> None:
+        """Merge the part files of every day into one file per day."""
+        for folder in self._days(symbol, interval):
+            self._compact_day(folder)
+
+    @staticmethod
+    def _frame(tables: list) -> pd.DataFrame:
+        if not tables:
+            return pd.DataFrame(columns=KLINE_COLUMNS)
+        import pyarrow as pa
+
+        df = pa.concat_tables(tables).to_pandas()
+        return df.drop_duplicates("open_time", keep="last").sort_values("open_time", ignore_index=True)
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """Return the stored candles with open time in ``[start, end)``."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        days = self._days(symbol, interval)
+        if start is not None:
+            # Day directories are named after the open time of their candles.
+            days = [d for d in days if d.name >= _day(start)]
+        if end is not None:
+            days = [d for d in days if d.name <= _day(end)]
+        tables = self._read_parts([p for d in days for p in self._parts(d)])
+        if tables and (start is not None or end is not None):
+            table = pa.concat_tables(tables)
+            open_time = table["open_time"]
+            mask = None
+            if start is not None:
+                mask = pc.greater_equal(open_time, _scalar(start, open_time.type))
+            if end is not None:
+                before = pc.less(open_time, _scalar(end, open_time.type))
+                mask = before if mask is None else pc.and_(mask, before)
+            tables = [table.filter(mask)]
+        return self._frame(tables)
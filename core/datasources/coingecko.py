@@ -6,13 +6,20 @@ from typing import Any
 
 import httpx
 
+from core.datasources.singleflight import SingleFlight, request_key
 from services.http_client import get_client
 
 BASE_URL = "https://api.coingecko.com/api/v3"
 
+_inflight = SingleFlight()
+
 
 async def _request(path: str, params: dict[str, Any] | None = None, retries: int = 3) -> Any:
     url = f"{BASE_URL}{path}"
+    return await _inflight.do(request_key(url, params), lambda: _get(url, params, retries))
+
+
+async def _get(url: str, params: dict[str, Any] | None = None, retries: int = 3) -> Any:
     backoff = 1
     client = get_client()
     for attempt in range(retries):
@@ -27,6 +34,6 @@ async def _request(path: str, params: dict[str, Any] | None = None, retries: int
             backoff *= 2
 
 
-async def simple_price(ids: list[str], vs_currencies: list[str]) -> dict[str, Any]:
+async def simple_price(ids: list[str], vs_currencies: list[str], retries: int = 3) -> dict[str, Any]:
     params = {"ids": ",".join(ids), "vs_currencies": ",".join(vs_currencies)}
-    return await _request("/simple/price", params)
+    return await _request("/simple/price", params, retries)
@@ -6,12 +6,19 @@ from typing import Any
 
 import httpx
 
+from core.datasources.singleflight import SingleFlight, request_key
 from services.http_client import get_client
 
 BASE_URL = "https://api.alternative.me/fng/"
 
+_inflight = SingleFlight()
+
 
 async def get_index(retries: int = 3) -> dict[str, Any]:
+    return await _inflight.do(request_key(BASE_URL), lambda: _get_index(retries))
+
+
+async def _get_index(retries: int = 3) -> dict[str, Any]:
     backoff = 1
     client = get_client()
     for attempt in range(retries):
@@ -0,0 +1,32 @@
+"""Half-open ``[start, end)`` open-time ranges in epoch milliseconds."""
+from __future__ import annotations
+
+Range = tuple[int, int]
+
+
+def merge_ranges(ranges: list[Range]) -> list[Range]:
+    """Return ``ranges`` sorted with overlapping/adjacent ranges merged."""
+    merged: list[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(covered: list[Range], start: int, end: int) -> list[Range]:
+    """Return the parts of ``[start, end)`` not included in ``covered``."""
+    missing: list[Range] = []
+    cursor = start
+    for c_start, c_end in merge_ranges(covered):
+        if c_end <= cursor:
+            continue
+        if c_start >= end:
+            break
+        if c_start > cursor:
+            missing.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
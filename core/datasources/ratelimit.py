@@ -0,0 +1,137 @@
+"""Request-weight budget for the Binance REST API.
+
+Binance charges every request a weight and bans IPs that exceed the limit
+per minute (HTTP 429, then 418).  :class:`WeightLimiter` keeps the weight
+used in the current minute, synchronised with the ``X-MBX-USED-WEIGHT-1M``
+response header, and makes callers wait before a request would go over
+budget.  Waiting requests are served in priority order, so live signal
+updates go before backfill, and backfill may only use part of the budget so
+live requests always find room.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Mapping
+from urllib.parse import urlparse
+
+LIVE = 0
+BACKFILL = 1
+
+WINDOW_SECONDS = 60
+# Binance's default REQUEST_WEIGHT limit per minute.
+WEIGHT_LIMIT = 6000
+
+
+def request_weight(url: str, params: Mapping[str, Any] | None = None) -> int:
+    """Return the weight Binance charges for a GET on ``url``."""
+    params = params or {}
+    path = urlparse(url).path.rstrip("/")
+    if path.endswith("/ticker/24hr"):
+        if "symbol" in params:
+            return 2
+        if "symbols" in params:
+            count = len(str(params["symbols"]).split(","))
+            return 2 if count <= 20 else 40 if count <= 100 else 80
+        return 80
+    if path.endswith("/ticker/price"):
+        return 2 if "symbol" in params else 4
+    if path.endswith("/exchangeInfo"):
+        return 20
+    # klines, uiKlines and everything else we use.
+    return 2
+
+
+class WeightLimiter:
+    """Per-minute weight budget shared by all Binance requests."""
+
+    def __init__(
+        self,
+        limit: int = WEIGHT_LIMIT,
+        backfill_share: float = 0.8,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.limit = limit
+        self.backfill_share = backfill_share
+        self.clock = clock
+        self.used = 0
+        self.requests = 0
+        self.throttled = 0
+        self._window = self._current_window()
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    def _current_window(self) -> int:
+        return int(self.clock() // WINDOW_SECONDS)
+
+    def _roll(self) -> None:
+        window = self._current_window()
+        if window != self._window:
+            self._window = window
+            self.used = 0
+
+    def _cap(self, priority: int) -> int:
+        return self.limit if priority <= LIVE else int(self.limit * self.backfill_share)
+
+    def _delay(self) -> float:
+        now = self.clock()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        return (self._window + 1) * WINDOW_SECONDS - now
+
+    async def acquire(self, weight: int, priority: int = LIVE) -> None:
+        """Wait until ``weight`` fits into the budget, then reserve it."""
+        entry = (priority, next(self._seq))
+        heapq.heappush(self._waiters, entry)
+        throttled = False
+        try:
+            while True:
+                self._roll()
+                if self._waiters[0] == entry:
+                    blocked = self.clock() < self._blocked_until
+                    # A single request larger than the cap still runs in an empty window.
+                    fits = self.used + weight <= self._cap(priority) or self.used == 0
+                    if not blocked and fits:
+                        self.used += weight
+                        self.requests += 1
+                        return
+                    if not throttled:
+                        throttled = True
+                        self.throttled += 1
+                    await asyncio.sleep(min(max(self._delay(), 0.01), 1.0))
+                else:
+                    await asyncio.sleep(0.01)
+        finally:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Adopt the server's count of used weight from response headers."""
+        value = headers.get("x-mbx-used-weight-1m")
+        if value is None:
+            return
+        self._roll()
+        self.used = max(self.used, int(value))
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for ``seconds`` (after a 429 or 418)."""
+        self._blocked_until = max(self._blocked_until, self.clock() + seconds)
+
+    def usage(self) -> dict:
+        """Return the current budget usage."""
+        self._roll()
+        now = self.clock()
+        return {
+            "used_weight": self.used,
+            "limit": self.limit,
+            "remaining": max(self.limit - self.used, 0),
+            "backfill_limit": self._cap(BACKFILL),
+            "window_resets_in": round((self._window + 1) * WINDOW_SECONDS - now, 3),
+            "blocked_for": round(max(self._blocked_until - now, 0.0), 3),
+            "waiting": len(self._waiters),
+            "requests": self.requests,
+            "throttled": self.throttled,
+        }
@@ -0,0 +1,102 @@
+"""Derive higher-timeframe candles from 1m klines.
+
+Binance buckets intraday intervals on UTC epoch boundaries, so a 5m, 15m,
+1h or 4h candle is fully determined by the 1m candles inside it: first open,
+max high, min low, last close and summed volumes.  :class:`KlineResampler`
+keeps one frame per (symbol, interval), seeded once from the exchange, and
+extends it from each new 1m window, rebuilding only the buckets from the
+last stored candle on.
+"""
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.datasources.binance import INTERVAL_MS, KLINE_COLUMNS
+
+# Intervals that are whole multiples of 1m aligned on the UTC epoch.
+DERIVED_INTERVALS = ("3m", "5m", "15m", "30m", "1h", "2h", "4h")
+
+_SUM_COLUMNS = ("volume",)
+
+
+def resample_klines(minutes: pd.DataFrame, interval: str, drop_partial: bool = True) -> pd.DataFrame:
+    """Aggregate 1m candles into ``interval`` candles.
+
+    The last bucket may still be forming, like the last candle the exchange
+    returns.  With ``drop_partial`` a first bucket that starts before
+    ``minutes`` does is dropped because its open, high and low are unknown.
+    """
+    if interval not in DERIVED_INTERVALS:
+        raise ValueError(f"can't derive {interval} candles from 1m klines")
+    step = INTERVAL_MS[interval]
+    open_ms = minutes["open_time"].to_numpy(dtype="datetime64[ms]").view("int64")
+    if not len(open_ms):
+        return pd.DataFrame(columns=KLINE_COLUMNS)
+    bucket = open_ms - open_ms % step
+    starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+    ends = np.concatenate((starts[1:], [len(bucket)])) - 1
+
+    out = {"open_time": pd.to_datetime(bucket[starts], unit="ms")}
+    out["open"] = minutes["open"].to_numpy(dtype=float)[starts]
+    out["high"] = np.maximum.reduceat(minutes["high"].to_numpy(dtype=float), starts)
+    out["low"] = np.minimum.reduceat(minutes["low"].to_numpy(dtype=float), starts)
+    out["close"] = minutes["close"].to_numpy(dtype=float)[ends]
+    for col in _SUM_COLUMNS:
+        if col in minutes:
+            out[col] = np.add.reduceat(minutes[col].to_numpy(), starts)
+    out["close_time"] = pd.to_datetime(bucket[starts] + step - 1, unit="ms")
+    df = pd.DataFrame(out)
+    df = df[[c for c in KLINE_COLUMNS if c in df]]
+    if drop_partial and open_ms[0] != bucket[0]:
+        df = df.iloc[1:].reset_index(drop=True)
+    return df
+
+
+class KlineResampler:
+    """Higher-timeframe frames per symbol, extended from successive 1m windows."""
+
+    def __init__(self, max_len: int = 1000) -> None:
+        self.max_len = max_len
+        self._frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+
+    def seed(self, symbol: str, interval: str, df: pd.DataFrame) -> None:
+        """Store candles fetched from the exchange as the start of the series."""
+        if interval in DERIVED_INTERVALS and len(df):
+            self._frames[(symbol, interval)] = df[[c for c in KLINE_COLUMNS if c in df]].copy()
+
+    def get(self, symbol: str, interval: str) -> pd.DataFrame | None:
+        return self._frames.get((symbol, interval))
+
+    def update(self, symbol: str, minutes: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Fold a window of 1m candles into every seeded interval of ``symbol``.
+
+        Returns the updated frames.  An interval is left out (and dropped)
+        when ``minutes`` starts after its last stored candle opened, since
+        that candle can't be rebuilt; the caller should fetch and seed it.
+        """
+        out: Dict[str, pd.DataFrame] = {}
+        if minutes.empty:
+            return out
+        first = minutes["open_time"].iloc[0]
+        for (sym, interval), frame in list(self._frames.items()):
+            if sym != symbol:
+                continue
+            last_open = frame["open_time"].iloc[-1]
+            if first > last_open:
+                del self._frames[(sym, interval)]
+                continue
+            if minutes["open_time"].iloc[-1] < last_open:
+                out[interval] = frame
+                continue
+            fresh = resample_klines(minutes[minutes["open_time"] >= last_open], interval)
+            frame = pd.concat([frame[frame["open_time"] < last_open], fresh], ignore_index=True)
+            frame = frame.iloc[-self.max_len:].reset_index(drop=True)
+            self._frames[(sym, interval)] = frame
+            out[interval] = frame
+        return out
+
+    def reset(self) -> None:
+        self._frames.clear()
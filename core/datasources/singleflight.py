@@ -0,0 +1,44 @@
+"""Single-flight coalescing of concurrent identical requests.
+
+Callers asking for the same key while a request for it is in flight await
+that request instead of starting their own, and all of them receive its
+result or exception.  The request runs in its own task, so a cancelled
+caller doesn't cancel it for the others.  Nothing is cached: once the
+request finishes the next call for the key starts a new one.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, TypeVar
+
+T = TypeVar("T")
+
+
+def request_key(url: str, params: Mapping[str, Any] | None = None) -> tuple:
+    """Return a hashable key for a GET request."""
+    return (url, tuple(sorted((params or {}).items())))
+
+
+class SingleFlight:
+    """In-flight requests by key."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of ``fn()``, shared with concurrent calls for ``key``."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
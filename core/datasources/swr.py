@@ -0,0 +1,130 @@
+"""Stale-while-revalidate cache with a circuit breaker.
+
+:class:`SWRCache` keeps the last good value per key.  A fresh value is
+served as is; a value older than ``ttl`` is served immediately while one
+refresh runs in the background.  Only a key with no value yet waits for the
+source.  After ``failure_threshold`` consecutive failures the circuit opens
+and the source is left alone for ``cooldown`` seconds, during which the last
+good values keep being served; then a single attempt decides whether it
+closes again.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple
+
+from cachetools import LRUCache
+
+from core.datasources.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a value is needed while its source is cut off."""
+
+
+class Cached(NamedTuple):
+    value: Any
+    info: dict
+
+
+class _Entry(NamedTuple):
+    value: Any
+    fetched_at: float
+    fetched_wall: float
+
+
+class SWRCache:
+    """Last good values of one data source, refreshed in the background."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        failure_threshold: int = 3,
+        cooldown: float = 300.0,
+        maxsize: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.last_error: str | None = None
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self._opened_at: float | None = None
+        self._flight = SingleFlight()
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+
+    def state(self) -> str:
+        """Return ``"closed"``, ``"open"`` or ``"half_open"`` (cooldown over)."""
+        if self._opened_at is None:
+            return "closed"
+        return "open" if self.clock() - self._opened_at < self.cooldown else "half_open"
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+        except Exception as exc:
+            self.failures += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            if self.failures >= self.failure_threshold or self._opened_at is not None:
+                # A failed attempt after the cooldown starts a new one.
+                self._opened_at = self.clock()
+            raise
+        self.failures = 0
+        self.last_error = None
+        self._opened_at = None
+        self._entries[key] = _Entry(value, self.clock(), time.time())
+        return value
+
+    async def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await self._flight.do(key, lambda: self._fetch(key, fetch))
+        except Exception:
+            logger.warning("refreshing %s failed: %s", self.name, self.last_error)
+
+    def info(self, key: Hashable) -> dict:
+        """Return the age and source state of the value cached for ``key``."""
+        entry = self._entries.get(key)
+        age = None if entry is None else self.clock() - entry.fetched_at
+        return {
+            "source": self.name,
+            "fetched_at": (
+                None if entry is None else datetime.fromtimestamp(entry.fetched_wall, timezone.utc).isoformat()
+            ),
+            "age_seconds": None if age is None else round(age, 3),
+            "stale": age is None or age >= self.ttl,
+            "circuit": self.state(),
+            "last_error": self.last_error,
+        }
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Cached:
+        """Return the value for ``key``, fetching it with ``fetch`` if needed.
+
+        Raises :class:`CircuitOpenError` when there is no value yet and the
+        circuit is open, or the error of ``fetch`` when the first fetch fails.
+        """
+        entry = self._entries.get(key)
+        state = self.state()
+        if entry is None:
+            if state == "open":
+                raise CircuitOpenError(f"{self.name} is unavailable: {self.last_error}")
+            await self._flight.do(key, lambda: self._fetch(key, fetch))
+        elif self.clock() - entry.fetched_at >= self.ttl and state != "open" and key not in self._refreshing:
+            task = asyncio.ensure_future(self._refresh(key, fetch))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        return Cached(self._entries[key].value, self.info(key))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.failures = 0
+        self.last_error = None
+        self._opened_at = None
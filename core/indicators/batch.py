@@ -0,0 +1,131 @@
+"""Batched indicator computation across many symbols.
+
+Close/high/low series of many symbols are stacked into one ``(symbols,
+time)`` matrix and EMA, RSI and ATR are evaluated for all rows at once: the
+recursion runs once per time step over a vector of symbols instead of once
+per symbol through pandas.  Shorter series are left-padded with NaN, which
+the filters skip exactly like pandas skips leading NaN, so every row matches
+:func:`core.indicators.ta.add_indicators` on that symbol alone.
+"""
+from __future__ import annotations
+
+from typing import Dict, Hashable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import Settings
+
+INDICATOR_COLUMNS = ("ema_fast", "ema_slow", "rsi", "atr", "ema_fast_slope")
+
+
+def stack(series: Sequence[np.ndarray]) -> np.ndarray:
+    """Stack 1-D arrays into a ``(len(series), max_len)`` matrix, left-padded with NaN."""
+    width = max((len(s) for s in series), default=0)
+    out = np.full((len(series), width), np.nan)
+    for row, values in enumerate(series):
+        if len(values):
+            out[row, width - len(values):] = values
+    return out
+
+
+def ewm_matrix(values: np.ndarray, com) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row-wise ``ewm(com=com, adjust=False).mean()`` of a ``(rows, time)`` matrix.
+
+    ``com`` is a scalar or one value per row, so filters with different
+    lengths share a single pass over time.  Returns the smoothed matrix and
+    the final ``(weighted, old_wt)`` filter state of every row, which
+    :class:`core.indicators.incremental.EWMFilter` can resume from.
+    """
+    values = np.asarray(values, dtype=float)
+    rows = values.shape[0]
+    alpha = 1.0 / (1.0 + np.broadcast_to(np.asarray(com, dtype=float), (rows,)))
+    factor = 1.0 - alpha
+    # Time-major copy so every step reads one contiguous row.
+    cols = np.ascontiguousarray(values.T)
+    out = np.empty_like(cols)
+    if not len(cols):
+        return out.T, np.full(rows, np.nan), np.ones(rows)
+    weighted = cols[0].copy()
+    old_wt = np.ones(rows)
+    out[0] = weighted
+    with np.errstate(invalid="ignore"):
+        for t in range(1, len(cols)):
+            cur = cols[t]
+            started = weighted == weighted
+            observed = cur == cur
+            old_wt = np.where(started, old_wt * factor, old_wt)
+            blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            # Same guard as pandas to avoid rounding on constant series.
+            weighted = np.where(started & observed & (weighted != cur), blended, weighted)
+            old_wt = np.where(started & observed, 1.0, old_wt)
+            weighted = np.where(~started & observed, cur, weighted)
+            out[t] = weighted
+    return out.T, weighted, old_wt
+
+
+def _length(value: int, default: int) -> int:
+    return int(value) if value and value > 0 else default
+
+
+def indicator_matrices(high: np.ndarray, low: np.ndarray, close: np.ndarray, settings: Settings) -> Dict[str, tuple]:
+    """Compute every indicator of ``add_indicators`` on ``(symbols, time)`` matrices.
+
+    Maps each indicator column to its matrix; EWM-based entries also carry
+    the final filter state as ``(matrix, weighted, old_wt)``.
+    """
+    prev_close = np.full_like(close, np.nan)
+    prev_close[:, 1:] = close[:, :-1]
+    with np.errstate(invalid="ignore"):
+        delta = close - prev_close
+        missing = np.isnan(delta)
+        gain = np.where(missing, np.nan, np.where(delta > 0, delta, 0.0))
+        loss = np.where(missing, np.nan, -np.where(delta < 0, delta, 0.0))
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+    rsi_len = _length(settings.rsi_len, 14)
+    atr_len = _length(settings.atr_len, 14)
+    coms = {
+        "ema_fast": (_length(settings.ema_fast, 10) - 1) / 2.0,
+        "ema_slow": (_length(settings.ema_slow, 10) - 1) / 2.0,
+        "avg_gain": (1.0 - 1 / rsi_len) / (1 / rsi_len),
+        "avg_loss": (1.0 - 1 / rsi_len) / (1 / rsi_len),
+        "atr": (1.0 - 1 / atr_len) / (1 / atr_len),
+    }
+    inputs = {"ema_fast": close, "ema_slow": close, "avg_gain": gain, "avg_loss": loss, "atr": true_range}
+    # Every filter of every symbol advances in the same pass over time.
+    symbols = close.shape[0]
+    smoothed, weighted, old_wt = ewm_matrix(
+        np.concatenate([inputs[name] for name in coms]),
+        np.repeat(list(coms.values()), symbols),
+    )
+    filters = {}
+    for i, name in enumerate(coms):
+        rows = slice(i * symbols, (i + 1) * symbols)
+        filters[name] = (smoothed[rows], weighted[rows], old_wt[rows])
+    ema_fast, avg_gain, avg_loss = filters["ema_fast"], filters["avg_gain"], filters["avg_loss"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain[0] / avg_loss[0]
+        rsi = 100 - (100 / (1 + rs))
+    slope = np.full_like(close, np.nan)
+    slope[:, 1:] = np.diff(ema_fast[0], axis=1)
+    return {
+        **filters,
+        "rsi": (rsi,),
+        "ema_fast_slope": (slope,),
+    }
+
+
+def add_indicators_batch(frames: Mapping[Hashable, pd.DataFrame], settings: Settings) -> Dict[Hashable, pd.DataFrame]:
+    """Batched equivalent of calling ``add_indicators`` on every frame."""
+    keys = list(frames)
+    series = {c: [frames[k][c].to_numpy(dtype=float) for k in keys] for c in ("high", "low", "close")}
+    mats = indicator_matrices(stack(series["high"]), stack(series["low"]), stack(series["close"]), settings)
+    out: Dict[Hashable, pd.DataFrame] = {}
+    for row, key in enumerate(keys):
+        df = frames[key]
+        n = len(df)
+        columns = {col: mats[col][0][row, mats[col][0].shape[1] - n:] for col in INDICATOR_COLUMNS}
+        out[key] = df.assign(**columns)
+    return out
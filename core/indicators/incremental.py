@@ -0,0 +1,262 @@
+"""Incremental EMA/RSI/ATR state updated one candle at a time.
+
+EMA, Wilder RSI and ATR are recursive filters, so after the first frame each
+closed candle only needs an O(1) update of the previous filter state.  The
+filters replicate the arithmetic of pandas' ``ewm(adjust=False).mean()``
+step by step, so streamed values are identical to the batch functions in
+:mod:`pandas_ta` run over the same candles.
+
+The still-forming candle is evaluated with :meth:`IndicatorState.peek`,
+which computes its values without committing them to the state.  States
+that have to be built from a full frame are bootstrapped for all symbols at
+once with the batched kernels of :mod:`core.indicators.batch`.
+"""
+from __future__ import annotations
+
+import math
+from typing import Dict, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import Settings
+from core.indicators.batch import INDICATOR_COLUMNS, _length, indicator_matrices, stack
+
+
+class EWMFilter:
+    """Exponentially weighted mean equivalent to ``ewm(adjust=False).mean()``."""
+
+    __slots__ = ("old_wt_factor", "new_wt", "weighted", "old_wt")
+
+    def __init__(self, com: float) -> None:
+        alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = alpha
+        self.weighted = math.nan
+        self.old_wt = 1.0
+
+    @classmethod
+    def from_span(cls, span: int) -> "EWMFilter":
+        return cls((span - 1) / 2.0)
+
+    @classmethod
+    def from_alpha(cls, alpha: float) -> "EWMFilter":
+        return cls((1.0 - alpha) / alpha)
+
+    def _step(self, value: float) -> tuple[float, float]:
+        weighted, old_wt = self.weighted, self.old_wt
+        if weighted == weighted:
+            old_wt *= self.old_wt_factor
+            if value == value:
+                # Same guard as pandas to avoid rounding on constant series.
+                if weighted != value:
+                    weighted = (old_wt * weighted + self.new_wt * value) / (old_wt + self.new_wt)
+                old_wt = 1.0
+        elif value == value:
+            weighted = value
+        return weighted, old_wt
+
+    def update(self, value: float) -> float:
+        self.weighted, self.old_wt = self._step(value)
+        return self.weighted
+
+    def peek(self, value: float) -> float:
+        return self._step(value)[0]
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = np.float64(avg_gain) / np.float64(avg_loss)
+        return float(100 - (100 / (1 + rs)))
+
+
+class IndicatorState:
+    """Filter state of the indicators in :func:`core.indicators.ta.add_indicators`."""
+
+    def __init__(self, settings: Settings) -> None:
+        self.params = indicator_params(settings)
+        self.ema_fast = EWMFilter.from_span(_length(settings.ema_fast, 10))
+        self.ema_slow = EWMFilter.from_span(_length(settings.ema_slow, 10))
+        rsi_len = _length(settings.rsi_len, 14)
+        self.gain = EWMFilter.from_alpha(1 / rsi_len)
+        self.loss = EWMFilter.from_alpha(1 / rsi_len)
+        self.atr = EWMFilter.from_alpha(1 / _length(settings.atr_len, 14))
+        self.prev_close = math.nan
+        self.prev_ema_fast = math.nan
+        self.last_open_time: pd.Timestamp | None = None
+
+    def _values(self, high: float, low: float, close: float, commit: bool) -> dict:
+        step = (lambda f, v: f.update(v)) if commit else (lambda f, v: f.peek(v))
+        prev_close = self.prev_close
+        delta = close - prev_close
+        if delta == delta:
+            gain = delta if delta > 0 else 0.0
+            loss = -(delta if delta < 0 else 0.0)
+        else:
+            gain = loss = math.nan
+        true_range = high - low
+        if prev_close == prev_close:
+            true_range = max(true_range, abs(high - prev_close), abs(low - prev_close))
+        ema_fast = step(self.ema_fast, close)
+        values = {
+            "ema_fast": ema_fast,
+            "ema_slow": step(self.ema_slow, close),
+            "rsi": _rsi(step(self.gain, gain), step(self.loss, loss)),
+            "atr": step(self.atr, true_range),
+            "ema_fast_slope": ema_fast - self.prev_ema_fast,
+        }
+        if commit:
+            self.prev_close = close
+            self.prev_ema_fast = ema_fast
+        return values
+
+    def update(self, high: float, low: float, close: float) -> dict:
+        """Advance the state with a closed candle and return its values."""
+        return self._values(high, low, close, commit=True)
+
+    def peek(self, high: float, low: float, close: float) -> dict:
+        """Return values for a still-forming candle without changing state."""
+        return self._values(high, low, close, commit=False)
+
+
+def indicator_params(settings: Settings) -> tuple:
+    return (settings.ema_fast, settings.ema_slow, settings.rsi_len, settings.atr_len)
+
+
+class IncrementalIndicators:
+    """Per-(symbol, timeframe) indicator states fed by successive kline frames.
+
+    Besides the filter state, the values of recent closed candles are kept as
+    NumPy arrays so each frame can be annotated without recomputing them.
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._times: Dict[Tuple[str, str], np.ndarray] = {}
+        self._values: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def _needs_rebuild(self, key: Tuple[str, str], df: pd.DataFrame, closed: np.ndarray, settings: Settings) -> bool:
+        """Whether the state of ``key`` can't be continued with ``df``."""
+        state = self._states.get(key)
+        if state is None or state.params != indicator_params(settings):
+            return True
+        if state.last_open_time is None or not closed.any():
+            return False
+        open_times = df["open_time"].to_numpy()
+        close_times = df["close_time"].to_numpy()
+        first = np.flatnonzero(closed)[0]
+        interval = close_times[first] - open_times[first] + np.timedelta64(1, "ms")
+        return not open_times[first] <= state.last_open_time + interval
+
+    @staticmethod
+    def _closed(df: pd.DataFrame, now: pd.Timestamp) -> np.ndarray:
+        return df["close_time"].to_numpy() < np.datetime64(now)
+
+    def apply(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        settings: Settings,
+        now: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """Return a copy of ``df`` with indicator columns, updating the state.
+
+        Candles whose ``close_time`` is before ``now`` are closed and advance
+        the state once each; later candles are only peeked.  The state is
+        rebuilt from ``df`` the first time, after indicator settings change
+        or when ``df`` does not connect to the candles seen before.
+        """
+        key = (symbol, timeframe)
+        now = now if now is not None else pd.Timestamp.now(tz="UTC").tz_localize(None)
+        open_times = df["open_time"].to_numpy()
+        closed = self._closed(df, now)
+        high = df["high"].to_numpy(dtype=float)
+        low = df["low"].to_numpy(dtype=float)
+        close = df["close"].to_numpy(dtype=float)
+
+        if self._needs_rebuild(key, df, closed, settings):
+            state = IndicatorState(settings)
+            times = open_times[:0]
+            values = np.empty((0, len(INDICATOR_COLUMNS)))
+        else:
+            state = self._states[key]
+            times = self._times[key]
+            values = self._values[key]
+
+        fresh = closed if state.last_open_time is None else closed & (open_times > state.last_open_time)
+        idx = np.flatnonzero(fresh)
+        rows = [list(state.update(high[i], low[i], close[i]).values()) for i in idx]
+        if len(idx):
+            state.last_open_time = open_times[idx[-1]]
+            # Keep only the history still covered by the incoming window.
+            keep = times >= open_times[0] if len(open_times) else slice(None)
+            times = np.concatenate([times[keep], open_times[idx]])
+            values = np.concatenate([values[keep], np.asarray(rows, dtype=float)])
+        self._states[key] = state
+        self._times[key] = times
+        self._values[key] = values
+
+        out_values = np.full((len(df), len(INDICATOR_COLUMNS)), np.nan)
+        pos = np.searchsorted(times, open_times)
+        found = closed & (pos < len(times))
+        found[found] = times[pos[found]] == open_times[found]
+        out_values[found] = values[pos[found]]
+        for i in np.flatnonzero(~closed):
+            out_values[i] = list(state.peek(high[i], low[i], close[i]).values())
+
+        indicators = pd.DataFrame(out_values, columns=list(INDICATOR_COLUMNS), index=df.index)
+        base = df.drop(columns=[c for c in INDICATOR_COLUMNS if c in df])
+        return pd.concat([base, indicators], axis=1)
+
+    def apply_many(
+        self,
+        frames: Mapping[Tuple[str, str], pd.DataFrame],
+        settings: Settings,
+        now: pd.Timestamp | None = None,
+    ) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """:meth:`apply` every ``(symbol, timeframe) -> frame`` of one tick.
+
+        All states that need a rebuild are bootstrapped together from one
+        stacked ``(symbols, time)`` matrix; the rest advance incrementally.
+        """
+        now = now if now is not None else pd.Timestamp.now(tz="UTC").tz_localize(None)
+        closed = {key: self._closed(df, now) for key, df in frames.items()}
+        stale = [key for key, df in frames.items() if self._needs_rebuild(key, df, closed[key], settings)]
+        if stale:
+            self._bootstrap({key: frames[key][closed[key]] for key in stale}, settings)
+        return {key: self.apply(key[0], key[1], df, settings, now) for key, df in frames.items()}
+
+    def _bootstrap(self, frames: Mapping[Tuple[str, str], pd.DataFrame], settings: Settings) -> None:
+        """Build states from frames of closed candles with the batched kernels."""
+        keys = list(frames)
+        series = {c: [frames[k][c].to_numpy(dtype=float) for k in keys] for c in ("high", "low", "close")}
+        close = stack(series["close"])
+        mats = indicator_matrices(stack(series["high"]), stack(series["low"]), close, settings)
+        width = close.shape[1]
+        for row, key in enumerate(keys):
+            df = frames[key]
+            state = IndicatorState(settings)
+            if len(df):
+                for name, filt in (
+                    ("ema_fast", state.ema_fast),
+                    ("ema_slow", state.ema_slow),
+                    ("avg_gain", state.gain),
+                    ("avg_loss", state.loss),
+                    ("atr", state.atr),
+                ):
+                    filt.weighted = float(mats[name][1][row])
+                    filt.old_wt = float(mats[name][2][row])
+                state.prev_close = float(close[row, -1])
+                state.prev_ema_fast = float(mats["ema_fast"][0][row, -1])
+                state.last_open_time = df["open_time"].to_numpy()[-1]
+            self._states[key] = state
+            self._times[key] = df["open_time"].to_numpy()
+            self._values[key] = np.column_stack(
+                [mats[col][0][row, width - len(df):] for col in INDICATOR_COLUMNS]
+            ).reshape(len(df), len(INDICATOR_COLUMNS))
+
+    def reset(self) -> None:
+        self._states.clear()
+        self._times.clear()
+        self._values.clear()
@@ -0,0 +1,151 @@
+"""Memoized indicator columns shared by every consumer of a kline frame.
+
+Columns are cached under ``(symbol, timeframe, data version, indicator,
+params)``.  The data version is a digest of the candle times and prices, so
+any frame holding the same candles, however it was fetched, reuses columns
+computed by another consumer, and a new or updated candle yields a new
+version.  Entries are evicted least recently used first.  The registry may
+be used from worker threads; columns are computed outside its lock.
+
+Columns registered with :meth:`IndicatorRegistry.seed` were computed
+elsewhere (e.g. incrementally, from state older than the frame) and may
+differ from a fresh computation, so they are kept under keys of their own
+and only returned to callers that ask for them with ``prefer_seeded``.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Callable, Dict, Mapping
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+from cachetools import LRUCache
+
+from config import Settings
+
+_VERSION_COLUMNS = ("open_time", "high", "low", "close")
+# Key suffix of seeded columns.
+_SEEDED = "seeded"
+
+INDICATORS: Dict[str, Callable[..., pd.Series]] = {
+    "ema": lambda df, length, **kw: ta.ema(df["close"], length=length, **kw),
+    "rsi": lambda df, length, **kw: ta.rsi(df["close"], length=length, **kw),
+    "atr": lambda df, length, **kw: ta.atr(df["high"], df["low"], df["close"], length=length, **kw),
+    "sma": lambda df, length, **kw: ta.sma(df["close"], length=length, **kw),
+}
+
+
+def data_version(df: pd.DataFrame) -> str:
+    """Return a digest identifying the candles in ``df``."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(df)).encode())
+    for col in _VERSION_COLUMNS:
+        if col not in df:
+            continue
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series.to_numpy(dtype="datetime64[ms]").view("int64")
+        else:
+            values = series.to_numpy(dtype=float)
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def _params(params: Mapping) -> tuple:
+    return tuple(sorted(params.items()))
+
+
+class IndicatorRegistry:
+    """Bounded LRU of indicator columns; see the module docstring for keys."""
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self._columns: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def column(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        name: str,
+        version: str | None = None,
+        prefer_seeded: bool = False,
+        **params,
+    ) -> pd.Series:
+        """Return indicator ``name`` of ``df``, computing it at most once per version.
+
+        With ``prefer_seeded`` a column seeded for these candles is returned
+        instead when there is one.
+        """
+        if name not in INDICATORS:
+            raise KeyError(f"unknown indicator: {name}")
+        version = version or data_version(df)
+        key = (symbol, timeframe, version, name, _params(params))
+        with self._lock:
+            values = self._columns.get(key + (_SEEDED,)) if prefer_seeded else None
+            if values is None:
+                values = self._columns.get(key)
+            if values is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if values is None:
+            values = np.array(INDICATORS[name](df, **params))
+            values.setflags(write=False)
+            with self._lock:
+                self._columns[key] = values
+        return pd.Series(values, index=df.index)
+
+    def seed(self, symbol: str, timeframe: str, df: pd.DataFrame, columns: Mapping[str, tuple]) -> None:
+        """Register columns of ``df`` computed elsewhere.
+
+        ``columns`` maps column names of ``df`` to ``(indicator, params)``,
+        as returned by :func:`indicator_columns`.
+        """
+        version = data_version(df)
+        for col, (name, params) in columns.items():
+            values = df[col].to_numpy(copy=True)
+            values.setflags(write=False)
+            with self._lock:
+                self._columns[(symbol, timeframe, version, name, _params(params), _SEEDED)] = values
+
+    def add_indicators(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        settings: Settings,
+        progress: Callable[[float], None] | None = None,
+    ) -> pd.DataFrame:
+        """Memoized :func:`core.indicators.ta.add_indicators`.
+
+        ``progress`` is called with the fraction of columns done after each one.
+        """
+        version = data_version(df)
+        df = df.copy()
+        columns = indicator_columns(settings)
+        for done, (col, (name, params)) in enumerate(columns.items(), 1):
+            df[col] = self.column(symbol, timeframe, df, name, version, **params)
+            if progress is not None:
+                progress(done / len(columns))
+        df["ema_fast_slope"] = df["ema_fast"].diff()
+        return df
+
+    def clear(self) -> None:
+        with self._lock:
+            self._columns.clear()
+            self.hits = self.misses = 0
+
+
+def indicator_columns(settings: Settings) -> Dict[str, tuple]:
+    """Map the columns of ``add_indicators`` to their ``(indicator, params)``."""
+    return {
+        "ema_fast": ("ema", {"length": settings.ema_fast}),
+        "ema_slow": ("ema", {"length": settings.ema_slow}),
+        "rsi": ("rsi", {"length": settings.rsi_len}),
+        "atr": ("atr", {"length": settings.atr_len}),
+    }
@@ -4,6 +4,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 
 from config import Settings
@@ -98,3 +99,76 @@ def generate_signal(df: pd.DataFrame, settings: Settings) -> dict:
         "risk": risk,
         "generated_at": datetime.now(timezone.utc).isoformat(),
     }
+
+
+def signal_masks(
+    close: np.ndarray,
+    ema_fast: np.ndarray,
+    ema_slow: np.ndarray,
+    rsi: np.ndarray,
+    atr: np.ndarray,
+    settings: Settings,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return boolean ``(long, short)`` masks for arrays of indicator values."""
+    with np.errstate(invalid="ignore"):
+        # Mirror ``generate_signal``: only non-positive ATR disables the
+        # signal, NaN values simply fail the comparisons below.
+        valid = ~(atr <= 0)
+        long_mask = valid & (ema_fast > ema_slow) & (rsi < settings.rsi_oversold) & (close > ema_fast)
+        short_mask = (
+            valid
+            & ~long_mask
+            & (ema_fast < ema_slow)
+            & (rsi > settings.rsi_overbought)
+            & (close < ema_fast)
+        )
+    return long_mask, short_mask
+
+
+def generate_signals(df: pd.DataFrame, settings: Settings) -> pd.DataFrame:
+    """Generate signals for every row of ``df`` at once.
+
+    Row ``i`` of the result matches ``generate_signal(df.iloc[: i + 1],
+    settings)`` but is computed with column-wise masks instead of a Python
+    loop.  The returned DataFrame shares ``df``'s index and holds the
+    ``signal``, ``confidence``, ``sl``, ``tp1`` and ``tp2`` columns.
+    """
+    close = df["close"].to_numpy(dtype=float)
+    ema_fast = df["ema_fast"].to_numpy(dtype=float)
+    ema_slow = df["ema_slow"].to_numpy(dtype=float)
+    rsi = df["rsi"].to_numpy(dtype=float)
+    atr = df["atr"].to_numpy(dtype=float)
+    if "ema_fast_slope" in df:
+        slope = df["ema_fast_slope"].to_numpy(dtype=float)
+    else:
+        slope = np.zeros(len(df))
+
+    long_mask, short_mask = signal_masks(close, ema_fast, ema_slow, rsi, atr, settings)
+    with np.errstate(invalid="ignore"):
+        confidence = np.where(long_mask | short_mask, 70, 0)
+        trending = (long_mask & (slope > 0)) | (short_mask & (slope < 0))
+        confidence += np.where(trending, 15, 0)
+        rsi_distance = np.where(
+            long_mask,
+            settings.rsi_oversold - rsi,
+            np.where(short_mask, rsi - settings.rsi_overbought, 0.0),
+        )
+        confidence += np.floor(np.clip(rsi_distance, 0, 10)).astype(int)
+        confidence = np.minimum(confidence, 100)
+
+        direction = np.where(long_mask, 1.0, np.where(short_mask, -1.0, np.nan))
+        sl = close - direction * 1.5 * atr
+        tp1 = close + direction * 1 * atr
+        tp2 = close + direction * 2 * atr
+
+    signal = np.where(long_mask, "LONG", np.where(short_mask, "SHORT", "NONE"))
+    return pd.DataFrame(
+        {
+            "signal": signal,
+            "confidence": confidence,
+            "sl": sl,
+            "tp1": tp1,
+            "tp2": tp2,
+        },
+        index=df.index,
+    )
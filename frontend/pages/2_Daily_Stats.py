@@ -43,7 +43,7 @@ st.subheader("Long / Short Ratio")
 donut_chart({"Long": stats.get("long_signals", 0), "Short": stats.get("short_signals", 0)})
 
 st.subheader("Fear & Greed Index")
-fg = stats.get("fear_greed", {}).get("value")
+fg = (stats.get("fear_greed") or {}).get("value")
 if fg is not None:
     fig = go.Figure(go.Indicator(mode="gauge+number", value=float(fg), title={"text": "FGI"}, gauge={"axis": {"range": [0, 100]}}))
     st.plotly_chart(fig, use_container_width=True)
@@ -38,6 +38,8 @@ if run:
     equity = result.get("equity_curve", [])
     if equity:
         df = pd.DataFrame(equity)
+        if "time" in df:
+            df["time"] = pd.to_datetime(df["time"], unit="ms")
         fig = px.line(df, x=df.columns[0], y=df.columns[1], labels={df.columns[0]:"Time", df.columns[1]:"PnL"})
         st.plotly_chart(fig, use_container_width=True)
     metrics = result.get("metrics", {})
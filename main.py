@@ -10,31 +10,57 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 
-from api.routes import router
-from config import settings
+from api.routes import job_manager, router
+from config import Settings, settings
 from services.http_client import close_client, get_client
 from services.scheduler import create_scheduler, update_once
 from services.store import DataStore
+from services.stream import KlineStreamer
 
 logging.basicConfig(level=getattr(logging, settings.log_level))
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("apscheduler").setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 store = DataStore()
 scheduler = None
+streamer = None
+
+
+def use_stream(settings: Settings) -> bool:
+    """Return whether klines come from the WebSocket stream.
+
+    Replay only covers HTTP, so with ``http_replay_path`` set the REST
+    poller is used instead of opening a live WebSocket.
+    """
+    if settings.kline_source != "stream":
+        return False
+    if settings.http_replay_path:
+        logger.warning("HTTP replay does not cover WebSocket streams; polling klines over REST instead")
+        return False
+    return True
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global scheduler
+    global scheduler, streamer
     get_client()  # ensure client is created
-    await update_once(settings, store)
-    scheduler = create_scheduler(settings, store)
-    scheduler.start()
+    if use_stream(settings):
+        # The stream backfills over REST on connect, so no initial poll.
+        streamer = KlineStreamer(settings, store)
+        streamer.start()
+    else:
+        await update_once(settings, store)
+        scheduler = create_scheduler(settings, store)
+        scheduler.start()
     try:
         yield
     finally:
-        scheduler.shutdown(wait=False)
+        if scheduler is not None:
+            scheduler.shutdown(wait=False)
+        if streamer is not None:
+            await streamer.stop()
+        job_manager.shutdown()
         await close_client()
 
 
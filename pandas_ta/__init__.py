@@ -8,11 +8,43 @@ our purposes and problematic in restricted environments.
 
 The implementations below rely solely on ``pandas`` so they work with
 small DataFrames and do not require any optional native extensions.
+
+Every indicator also has a ``numpy`` backend (see :mod:`pandas_ta.kernels`)
+that skips the intermediate pandas objects.  Pass ``backend="numpy"`` per
+call or switch the default with :func:`set_backend`; ``float32=True``
+computes and returns ``float32`` values with the ``numpy`` backend.  The
+``pandas`` backend stays the default because its results are the reference
+the incremental indicator engine reproduces bit for bit.
 """
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from pandas_ta import kernels
+
+BACKENDS = ("pandas", "numpy")
+_backend = "pandas"
+
+
+def set_backend(name: str) -> None:
+    """Select the default backend, ``"pandas"`` or ``"numpy"``."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}; expected one of {BACKENDS}")
+    _backend = name
+
+
+def _use_numpy(kwargs: dict) -> bool:
+    backend = kwargs.get("backend") or _backend
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}; expected one of {BACKENDS}")
+    return backend == "numpy"
+
+
+def _dtype(kwargs: dict):
+    return np.float32 if kwargs.get("float32") else np.float64
+
 
 def ema(close: pd.Series, length: int | None = None, **kwargs) -> pd.Series:
     """Exponential moving average using pandas ``ewm``.
@@ -23,12 +55,18 @@ def ema(close: pd.Series, length: int | None = None, **kwargs) -> pd.Series:
     """
     length = int(length) if length and length > 0 else 10
     adjust = kwargs.get("adjust", False)
+    if _use_numpy(kwargs) and not adjust:
+        values = kernels.ewm_mean(close.to_numpy(), 2 / (length + 1), _dtype(kwargs))
+        return pd.Series(values, index=close.index, name=close.name)
     return close.ewm(span=length, adjust=adjust).mean()
 
 
 def rsi(close: pd.Series, length: int = 14, **kwargs) -> pd.Series:
     """Relative Strength Index implementation."""
     length = int(length) if length and length > 0 else 14
+    if _use_numpy(kwargs):
+        values = kernels.rsi(close.to_numpy(), length, _dtype(kwargs))
+        return pd.Series(values, index=close.index, name=close.name)
     delta = close.diff()
     gain = delta.clip(lower=0)
     loss = -delta.clip(upper=0)
@@ -42,6 +80,9 @@ def rsi(close: pd.Series, length: int = 14, **kwargs) -> pd.Series:
 def atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14, **kwargs) -> pd.Series:
     """Average True Range implementation."""
     length = int(length) if length and length > 0 else 14
+    if _use_numpy(kwargs):
+        values = kernels.atr(high.to_numpy(), low.to_numpy(), close.to_numpy(), length, _dtype(kwargs))
+        return pd.Series(values, index=close.index)
     prev_close = close.shift(1)
     tr = pd.concat(
         [
@@ -54,4 +95,13 @@ def atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14, **k
     atr = tr.ewm(alpha=1 / length, min_periods=1, adjust=False).mean()
     return atr
 
-__all__ = ["ema", "rsi", "atr"]
+
+def sma(close: pd.Series, length: int | None = None, **kwargs) -> pd.Series:
+    """Simple moving average, ``NaN`` until ``length`` values are available."""
+    length = int(length) if length and length > 0 else 10
+    if _use_numpy(kwargs):
+        values = kernels.rolling_mean(close.to_numpy(), length, _dtype(kwargs))
+        return pd.Series(values, index=close.index, name=close.name)
+    return close.rolling(length).mean()
+
+__all__ = ["ema", "rsi", "atr", "sma", "set_backend"]
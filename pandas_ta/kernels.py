@@ -0,0 +1,142 @@
+"""NumPy kernels behind the ``numpy`` backend of this ``pandas_ta`` subset.
+
+The kernels take and return plain arrays, so no intermediate ``Series`` or
+``DataFrame`` is built.  Exponentially weighted means are linear recurrences
+``y[t] = w * y[t-1] + u[t]``; they are evaluated in blocks whose length is
+chosen so that ``w ** block`` is below the precision of the dtype.  Inside a
+block the recurrence is a scaled cumulative sum, and the carry from the
+previous block only needs its last value, so the whole series is computed
+with a handful of vectorized operations instead of a per-element loop.
+
+Results agree with the pandas implementations to within floating point
+rounding (not bit for bit).
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+def _recurrence(u: np.ndarray, w: float, out: np.ndarray) -> None:
+    """Write ``y[t] = w * y[t-1] + u[t]`` (with ``y[-1] = 0``) into ``out``."""
+    n = len(u)
+    if n == 0 or w <= 0.0:
+        out[:] = u
+        return
+    # w ** block is negligible next to the dtype's epsilon.
+    horizon = 1.1 * -math.log(np.finfo(u.dtype).eps)
+    block = max(1, min(n, math.ceil(horizon / -math.log(w))))
+    blocks = -(-n // block)
+    buf = np.zeros(blocks * block, dtype=u.dtype)
+    buf[:n] = u
+    rows = buf.reshape(blocks, block)
+
+    powers = w ** np.arange(1, block + 1, dtype=u.dtype)
+    # Within a block: y[j] = w**j * sum_{i<=j} u[i] / w**i (zero carry in).
+    rows *= w / powers
+    np.cumsum(rows, axis=1, out=rows)
+    rows *= powers / w
+    carry = np.zeros(blocks, dtype=u.dtype)
+    carry[1:] = rows[:-1, -1]
+    rows += carry[:, None] * powers
+    out[:] = buf[:n]
+
+
+def _ewm_loop(x: np.ndarray, alpha: float) -> np.ndarray:
+    """Scalar ``ewm(alpha=alpha, adjust=False)`` used for interior NaN."""
+    out = np.empty_like(x)
+    weighted = math.nan
+    old_wt = 1.0
+    for i, value in enumerate(x.tolist()):
+        if weighted == weighted:
+            old_wt *= 1.0 - alpha
+            if value == value:
+                weighted = (old_wt * weighted + alpha * value) / (old_wt + alpha)
+                old_wt = 1.0
+        elif value == value:
+            weighted = value
+        out[i] = weighted
+    return out
+
+
+def ewm_mean(values: np.ndarray, alpha: float, dtype=np.float64) -> np.ndarray:
+    """``ewm(alpha=alpha, adjust=False).mean()`` of a 1-D array.
+
+    Leading NaN stay NaN until the first observation, as in pandas.
+    """
+    x = np.asarray(values, dtype=dtype)
+    out = np.full(x.shape, np.nan, dtype=x.dtype)
+    valid = ~np.isnan(x)
+    if not valid.any():
+        return out
+    start = int(valid.argmax())
+    tail = x[start:]
+    if not valid[start:].all():
+        out[start:] = _ewm_loop(tail, alpha)
+        return out
+    u = tail * x.dtype.type(alpha)
+    u[0] = tail[0]
+    _recurrence(u, 1.0 - alpha, out[start:])
+    return out
+
+
+def rsi(close: np.ndarray, length: int, dtype=np.float64) -> np.ndarray:
+    """Wilder RSI with the arithmetic of :func:`pandas_ta.rsi`."""
+    close = np.asarray(close, dtype=dtype)
+    delta = np.empty_like(close)
+    delta[:1] = np.nan
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+    with np.errstate(invalid="ignore"):
+        gain = np.where(delta > 0, delta, 0)
+        loss = np.where(delta < 0, -delta, 0)
+    gain[:1] = loss[:1] = np.nan
+    avg_gain = ewm_mean(gain, 1 / length, dtype)
+    avg_loss = ewm_mean(loss, 1 / length, dtype)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, dtype=np.float64) -> np.ndarray:
+    """Row-wise max of ``high - low`` and the gaps to the previous close."""
+    high = np.asarray(high, dtype=dtype)
+    low = np.asarray(low, dtype=dtype)
+    close = np.asarray(close, dtype=dtype)
+    prev_close = np.empty_like(close)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int, dtype=np.float64) -> np.ndarray:
+    """Average True Range with the arithmetic of :func:`pandas_ta.atr`."""
+    return ewm_mean(true_range(high, low, close, dtype), 1 / length, dtype)
+
+
+def rolling_mean(values: np.ndarray, length: int, dtype=np.float64) -> np.ndarray:
+    """``rolling(length).mean()``: NaN until ``length`` values and around NaN.
+
+    Window sums combine a suffix sum and a prefix sum of fixed blocks of
+    ``length`` values, so rounding doesn't accumulate along the series.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    out = np.full(x.shape, np.nan, dtype=dtype)
+    if length > n:
+        return out
+    missing = np.isnan(x)
+    blocks = -(-n // length)
+    buf = np.zeros(blocks * length)
+    buf[:n] = np.where(missing, 0.0, x)
+    rows = buf.reshape(blocks, length)
+    prefix = np.cumsum(rows, axis=1).reshape(-1)
+    suffix = np.cumsum(rows[:, ::-1], axis=1)[:, ::-1].reshape(-1)
+
+    # Window [s, s + length) = suffix of the block holding s + prefix of
+    # the next one, or a single whole block when s starts a block.
+    sums = suffix[: n - length + 1] + prefix[length - 1 : n]
+    sums[::length] = prefix[length - 1 : n : length]
+    gaps = np.concatenate(([0], np.cumsum(missing)))
+    sums[(gaps[length:] - gaps[:-length]) > 0] = np.nan
+    out[length - 1:] = sums / length
+    return out
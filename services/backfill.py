@@ -0,0 +1,162 @@
+"""Backfill the candle store with historical klines.
+
+Seeds :class:`core.datasources.candle_store.CandleStore`, which backtests
+read their candles from, with months or years of closed candles, e.g.::
+
+    python -m services.backfill --start 2023-01-01 --symbols BTCUSDT ETHUSDT --timeframes 1m 1h
+
+Every span is split into pages of ``MAX_KLINES`` candles that are fetched
+concurrently at backfill priority, so the requests stay within the Binance
+weight budget and leave room for live updates.  Each page is written as soon
+as it arrives, skipping candles already stored, and recorded in the store's
+covered ranges; an interrupted run resumes with the pages that weren't
+recorded, and ranges the store already covers are never fetched.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from typing import Callable, Dict, Iterable, NamedTuple, Tuple
+
+import httpx
+import pandas as pd
+
+from config import settings as default_settings
+from core.datasources import binance
+from core.datasources.binance import INTERVAL_MS, MAX_KLINES
+from core.datasources.candle_store import CandleStore
+from core.datasources.ranges import Range, missing_ranges
+from services.http_client import close_client
+from services.scheduler import candle_store
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[str, str]
+
+
+class BackfillResult(NamedTuple):
+    """Candles written and pages that failed per (symbol, interval)."""
+
+    written: Dict[Job, int]
+    failed: Dict[Job, int]
+
+
+def plan_pages(covered: list[Range], interval: str, start_ms: int, end_ms: int) -> list[Range]:
+    """Split the parts of ``[start_ms, end_ms)`` not covered yet into request pages."""
+    page_ms = INTERVAL_MS[interval] * MAX_KLINES
+    return [
+        (page, min(page + page_ms, m_end))
+        for m_start, m_end in missing_ranges(covered, start_ms, end_ms)
+        for page in range(m_start, m_end, page_ms)
+    ]
+
+
+def print_progress(done: int, total: int, candles: int) -> None:
+    print(f"\r{done}/{total} pages ({done / total:.0%}), {candles} candles", end="", file=sys.stderr, flush=True)
+    if done == total:
+        print(file=sys.stderr)
+
+
+async def backfill(
+    store: CandleStore,
+    symbols: Iterable[str],
+    intervals: Iterable[str],
+    start_ms: int,
+    end_ms: int | None = None,
+    concurrency: int = 4,
+    on_progress: Callable[[int, int, int], None] | None = None,
+) -> BackfillResult:
+    """Fetch and store the closed candles with open time in ``[start_ms, end_ms)``.
+
+    Pages that fail are logged and left out of the covered ranges, so
+    running the backfill again retries them.
+    """
+    intervals = list(intervals)
+    for interval in intervals:
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"unsupported interval for backfill: {interval}")
+    now_ms = int(pd.Timestamp.now(tz="UTC").value // 1_000_000)
+
+    covered: Dict[Job, list[Range]] = {}
+    pages: list[tuple[Job, Range]] = []
+    for symbol in symbols:
+        for interval in intervals:
+            step = INTERVAL_MS[interval]
+            job = (symbol, interval)
+            covered[job] = store.covered(symbol, interval)
+            end = min(end_ms or now_ms, now_ms - now_ms % step)
+            start = start_ms - start_ms % step
+            pages.extend((job, page) for page in plan_pages(covered[job], interval, start, end))
+
+    written = {job: 0 for job in covered}
+    failed = {job: 0 for job in covered}
+    total = len(pages)
+    done = 0
+    queue = iter(pages)
+
+    async def worker() -> None:
+        nonlocal done
+        for (symbol, interval), (page_start, page_end) in queue:
+            try:
+                df = await binance.get_klines_page(symbol, interval, page_start, page_end)
+            except httpx.HTTPError as exc:
+                logger.warning("failed to fetch %s %s from %d: %s", symbol, interval, page_start, exc)
+                failed[(symbol, interval)] += 1
+            else:
+                written[(symbol, interval)] += store.insert(symbol, interval, df)
+                store.add_covered(symbol, interval, [(page_start, page_end)])
+            done += 1
+            if on_progress is not None:
+                on_progress(done, total, sum(written.values()))
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, total)))))
+    return BackfillResult(written, failed)
+
+
+def _to_ms(value: str) -> int:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return int(ts.value // 1_000_000)
+
+
+async def _run(store: CandleStore, args: argparse.Namespace) -> BackfillResult:
+    try:
+        return await backfill(
+            store,
+            args.symbols,
+            args.timeframes,
+            _to_ms(args.start),
+            _to_ms(args.end) if args.end else None,
+            args.concurrency,
+            on_progress=None if args.quiet else print_progress,
+        )
+    finally:
+        await close_client()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", required=True, help="first open time, e.g. 2023-01-01 (UTC)")
+    parser.add_argument("--end", help="end of the span (exclusive); defaults to now")
+    parser.add_argument("--symbols", nargs="+", default=default_settings.watchlist)
+    parser.add_argument("--timeframes", nargs="+", default=default_settings.timeframes)
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight at once")
+    parser.add_argument("--data-dir", default=default_settings.data_dir)
+    parser.add_argument("--quiet", action="store_true", help="don't report progress")
+    args = parser.parse_args(argv)
+
+    store = candle_store(default_settings.model_copy(update={"data_dir": args.data_dir}))
+    result = asyncio.run(_run(store, args))
+    for (symbol, interval), count in result.written.items():
+        failed = result.failed[(symbol, interval)]
+        note = f", {failed} pages failed (run again to retry)" if failed else ""
+        print(f"{symbol} {interval}: {count} candles written{note}")
+    return 1 if any(result.failed.values()) else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -3,16 +3,32 @@ from __future__ import annotations
 
 import httpx
 
+from config import settings
+from services.http_replay import RecordingTransport, ReplayTransport
+
 _client: httpx.AsyncClient | None = None
 
 
+def _transport(limits: httpx.Limits) -> httpx.AsyncBaseTransport | None:
+    """Return the record/replay transport configured in settings, if any."""
+    if settings.http_replay_path:
+        return ReplayTransport(
+            settings.http_replay_path,
+            latency=settings.http_replay_latency,
+            speed=settings.http_replay_speed or None,
+        )
+    if settings.http_record_path:
+        return RecordingTransport(settings.http_record_path, httpx.AsyncHTTPTransport(limits=limits))
+    return None
+
+
 def get_client() -> httpx.AsyncClient:
     """Return a singleton AsyncClient with sensible defaults."""
     global _client
     if _client is None:
         timeout = httpx.Timeout(10.0, connect=5.0)
         limits = httpx.Limits(max_connections=20, max_keepalive_connections=5)
-        _client = httpx.AsyncClient(timeout=timeout, limits=limits)
+        _client = httpx.AsyncClient(timeout=timeout, limits=limits, transport=_transport(limits))
     return _client
 
 
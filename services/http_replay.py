@@ -0,0 +1,158 @@
+"""Record HTTP responses to disk and replay them offline.
+
+:class:`RecordingTransport` passes requests through to the network and
+appends every exchange to a JSON-lines cassette.  :class:`ReplayTransport`
+serves a cassette back without any network access, after an optional
+``latency``, so the scheduler, store and API can be load tested and
+benchmarked deterministically offline.
+
+Requests are matched on method, URL and query parameters; when nothing
+matches exactly, the time window parameters (``startTime``, ``endTime``,
+``limit``) are ignored.  Responses recorded more than once for a request
+are replayed in order: by default following the recording timeline, scaled
+by ``speed``, or one per request when ``speed`` is ``None``.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import httpx
+
+# Parameters that move with the clock rather than select the resource.
+TIME_PARAMS = ("startTime", "endTime", "limit")
+# The recorded body is stored decoded.
+_SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def _key(method: str, url: httpx.URL, ignore: tuple = ()) -> tuple:
+    params = tuple(sorted((k, v) for k, v in url.params.multi_items() if k not in ignore))
+    return (method, f"{url.scheme}://{url.host}{url.path}", params)
+
+
+def _body(content: bytes) -> dict:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def _content(entry: dict) -> bytes:
+    if "base64" in entry:
+        return base64.b64decode(entry["base64"])
+    return entry.get("text", "").encode("utf-8")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forward requests to ``transport`` and append the exchanges to ``path``."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        transport: httpx.AsyncBaseTransport | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path)
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.clock = clock
+        self._start: float | None = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        # Read through a Response bound to the request so the body is decoded.
+        response = httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=response.stream,
+            extensions=response.extensions,
+            request=request,
+        )
+        content = await response.aread()
+        if self._start is None:
+            self._start = self.clock()
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS}
+        entry = {
+            "method": request.method,
+            "url": str(request.url),
+            "elapsed": round(self.clock() - self._start, 6),
+            "status": response.status_code,
+            "headers": headers,
+            **_body(content),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry) + "\n")
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serve the responses recorded in ``path``.
+
+    ``speed`` scales the recording timeline: at ``speed=2`` the responses
+    recorded a minute apart are served 30 seconds apart.  With ``speed=None``
+    every repeated request gets the next recorded response, and the last one
+    once they run out.  Requests that were never recorded get a 404.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        latency: float = 0.0,
+        speed: float | None = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.latency = latency
+        self.speed = speed
+        self.clock = clock
+        self.requests = 0
+        self._exact: Dict[tuple, List[dict]] = defaultdict(list)
+        self._loose: Dict[tuple, List[dict]] = defaultdict(list)
+        self._served: Dict[tuple, int] = defaultdict(int)
+        self._start: float | None = None
+        with Path(path).open(encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                url = httpx.URL(entry["url"])
+                self._exact[_key(entry["method"], url)].append(entry)
+                self._loose[_key(entry["method"], url, TIME_PARAMS)].append(entry)
+
+    def _pick(self, key: tuple, entries: List[dict]) -> dict:
+        if self.speed is None:
+            index = min(self._served[key], len(entries) - 1)
+            self._served[key] += 1
+            return entries[index]
+        elapsed = (self.clock() - self._start) * self.speed
+        chosen = entries[0]
+        for entry in entries:
+            if entry["elapsed"] > elapsed:
+                break
+            chosen = entry
+        return chosen
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._start is None:
+            self._start = self.clock()
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        for key, table in (
+            (_key(request.method, request.url), self._exact),
+            (_key(request.method, request.url, TIME_PARAMS), self._loose),
+        ):
+            entries = table.get(key)
+            if entries:
+                entry = self._pick(key, entries)
+                return httpx.Response(
+                    entry["status"], headers=entry["headers"], content=_content(entry), request=request
+                )
+        return httpx.Response(404, json={"error": f"not recorded: {request.url}"}, request=request)
@@ -0,0 +1,156 @@
+"""Background job queue for CPU-heavy work such as backtests."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Job:
+    """State of a single submitted job."""
+
+    def __init__(self) -> None:
+        self.id = uuid.uuid4().hex
+        self.status = QUEUED
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: str | None = None
+        self.created_at = _now()
+        self.finished_at: str | None = None
+        self.task: asyncio.Task | None = None
+
+    def stage(self, start: float, stop: float) -> Callable[[float], None]:
+        """Return a callback reporting the fraction done of a step.
+
+        The step spans ``start`` to ``stop`` of the job's progress.  The
+        callback may be called from worker threads.
+        """
+
+        def report(fraction: float) -> None:
+            self.progress = start + (stop - start) * fraction
+
+        return report
+
+    @property
+    def finished(self) -> bool:
+        return self.status in {DONE, FAILED, CANCELLED}
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class JobManager:
+    """Run jobs on the event loop and their CPU-bound steps in a process pool.
+
+    At most ``max_workers`` jobs run at the same time; further jobs wait in
+    ``queued`` state.  ``max_jobs`` bounds how many jobs are tracked: new
+    submissions are refused while that many are unfinished, and the oldest
+    finished jobs are forgotten first.
+    """
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 100) -> None:
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self._pool: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.max_workers)
+        return self._pool
+
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """Run ``fn(*args)`` in the worker pool without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), fn, *args)
+
+    def _prune(self) -> None:
+        for job_id in [j.id for j in self.jobs.values() if j.finished]:
+            if len(self.jobs) < self.max_jobs:
+                break
+            del self.jobs[job_id]
+
+    def submit(self, fn: Callable[[Job], Awaitable[Any]]) -> Job:
+        """Schedule ``fn(job)`` and return the new job.
+
+        ``fn`` may update ``job.progress`` (see :meth:`Job.stage`) and should
+        offload heavy work via :meth:`run` or a worker thread.  Raises
+        ``RuntimeError`` when too many jobs are pending.
+        """
+        self._prune()
+        if len(self.jobs) >= self.max_jobs:
+            raise RuntimeError("too many pending jobs")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        job = Job()
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._execute(job, fn))
+        return job
+
+    async def _execute(self, job: Job, fn: Callable[[Job], Awaitable[Any]]) -> None:
+        try:
+            async with self._slots:
+                job.status = RUNNING
+                job.result = await fn(job)
+            job.status = DONE
+            job.progress = 1.0
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+        except Exception as exc:
+            logger.exception("job %s failed", job.id)
+            job.status = FAILED
+            job.error = str(exc)
+        finally:
+            job.finished_at = _now()
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Cancel a queued or running job.
+
+        Work already executing inside a worker process runs to completion,
+        but its result is discarded.
+        """
+        job = self.jobs.get(job_id)
+        if job is not None and not job.finished and job.task is not None:
+            job.task.cancel()
+            if job.status == QUEUED:
+                # The task may not have started yet, in which case
+                # ``_execute`` never sees the cancellation.
+                job.status = CANCELLED
+                job.finished_at = _now()
+        return job
+
+    def shutdown(self) -> None:
+        for job in self.jobs.values():
+            if job.task is not None and not job.finished:
+                job.task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
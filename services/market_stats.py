@@ -0,0 +1,46 @@
+"""Cached CoinGecko and Fear & Greed lookups for the daily stats.
+
+Both sources have strict rate limits and change slowly, so their last good
+values are served from :class:`SWRCache` and refreshed in the background.
+Each fetch makes a single attempt; repeated failures are handled by the
+cache's circuit breaker rather than by retrying inline.
+"""
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Hashable
+
+from config import settings
+from core.datasources import coingecko, fng
+from core.datasources.swr import Cached, SWRCache
+
+price_cache = SWRCache(
+    "coingecko",
+    ttl=settings.coingecko_ttl_seconds,
+    failure_threshold=settings.datasource_failure_threshold,
+    cooldown=settings.datasource_cooldown_seconds,
+)
+index_cache = SWRCache(
+    "fear_greed",
+    ttl=settings.fng_ttl_seconds,
+    failure_threshold=settings.datasource_failure_threshold,
+    cooldown=settings.datasource_cooldown_seconds,
+)
+
+
+async def _lookup(cache: SWRCache, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Cached:
+    """Return the cached value, or ``None`` when the source has never answered."""
+    try:
+        return await cache.get(key, fetch)
+    except Exception:
+        # Any failure of the source (HTTP errors, malformed JSON, an open
+        # circuit) leaves the value unavailable rather than failing the caller.
+        return Cached(None, cache.info(key))
+
+
+async def simple_price(ids: list[str], vs_currencies: list[str]) -> Cached:
+    key = (tuple(ids), tuple(vs_currencies))
+    return await _lookup(price_cache, key, lambda: coingecko.simple_price(ids, vs_currencies, retries=1))
+
+
+async def fear_greed_index() -> Cached:
+    return await _lookup(index_cache, "latest", lambda: fng.get_index(retries=1))
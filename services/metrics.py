@@ -1,16 +1,19 @@
 """Utility functions for computing and caching market metrics."""
 from __future__ import annotations
 
-import pandas_ta as ta
 from cachetools import TTLCache
 
 from config import settings
 from core.datasources import binance
+from core.indicators.registry import IndicatorRegistry, data_version
+from services.store import DataStore
 from api.models import Metric
 
 # Caches for OHLCV data and computed metrics
 _ohlcv_cache: TTLCache = TTLCache(maxsize=100, ttl=settings.cache_ttl_seconds)
 _metric_cache: TTLCache = TTLCache(maxsize=100, ttl=settings.cache_ttl_seconds)
+# Indicator columns shared with the scheduler, signals and backtests.
+indicator_registry = IndicatorRegistry(maxsize=settings.indicator_cache_size)
 
 
 async def fetch_ohlcv(symbol: str, interval: str, limit: int = 500):
@@ -23,11 +26,17 @@ async def fetch_ohlcv(symbol: str, interval: str, limit: int = 500):
     return df
 
 
-async def _compute_metric(symbol: str, interval: str) -> Metric:
-    df = await fetch_ohlcv(symbol, interval, limit=500)
-    df["rsi"] = ta.rsi(df["close"], length=14)
-    df["ma50"] = df["close"].rolling(50).mean()
-    df["ma200"] = df["close"].rolling(200).mean()
+async def _compute_metric(symbol: str, interval: str, store: DataStore | None = None) -> Metric:
+    # The scheduler's candles come with indicator columns already registered.
+    df = store.get_klines(symbol, interval) if store is not None else None
+    if df is None:
+        df = await fetch_ohlcv(symbol, interval, limit=500)
+    df = df.copy()
+    opts = {"backend": settings.metrics_ta_backend, "float32": settings.metrics_ta_float32}
+    version = data_version(df)
+    df["rsi"] = indicator_registry.column(symbol, interval, df, "rsi", version, prefer_seeded=True, length=14)
+    df["ma50"] = indicator_registry.column(symbol, interval, df, "sma", version, length=50, **opts)
+    df["ma200"] = indicator_registry.column(symbol, interval, df, "sma", version, length=200, **opts)
     df.fillna(0, inplace=True)
 
     price = float(df["close"].iloc[-1])
@@ -37,7 +46,7 @@ async def _compute_metric(symbol: str, interval: str) -> Metric:
     recent_high = float(df["high"].tail(60).max())
     recent_low = float(df["low"].tail(60).min())
 
-    ticker = await binance.get_24h_ticker(symbol)
+    ticker = (await binance.ticker_snapshot.get([symbol]))[symbol]
     change_24h = float(ticker.get("priceChangePercent", 0))
     volume_24h = float(ticker.get("volume", 0))
 
@@ -60,11 +69,14 @@ async def _compute_metric(symbol: str, interval: str) -> Metric:
     )
 
 
-async def get_metric(symbol: str, interval: str) -> Metric:
-    """Retrieve metric for a symbol/interval with caching."""
+async def get_metric(symbol: str, interval: str, store: DataStore | None = None) -> Metric:
+    """Retrieve metric for a symbol/interval with caching.
+
+    Candles kept in ``store`` by the scheduler are used when there are any.
+    """
     key = (symbol, interval)
     metric = _metric_cache.get(key)
     if metric is None:
-        metric = await _compute_metric(symbol, interval)
+        metric = await _compute_metric(symbol, interval, store)
         _metric_cache[key] = metric
     return metric
@@ -2,40 +2,113 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Dict, Tuple
 import logging
 
+import pandas as pd
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from config import Settings
 from core.datasources import binance
-from core.indicators.ta import add_indicators
+from core.datasources.candle_store import CandleStore
+from core.datasources.resample import DERIVED_INTERVALS, KlineResampler
+from core.indicators.incremental import IncrementalIndicators
+from core.indicators.registry import indicator_columns
 from core.signals.engine import generate_signal
+from services.metrics import indicator_registry
 from services.store import DataStore
 
 
 logger = logging.getLogger(__name__)
 
+# Indicator filter state carried between scheduler ticks.
+indicators = IncrementalIndicators()
+# Higher timeframes extended from the 1m klines between ticks.
+resampler = KlineResampler()
+# Raw klines kept between ticks for delta fetches.
+raw_klines: Dict[Tuple[str, str], pd.DataFrame] = {}
+# On-disk candle stores by directory.
+_candle_stores: Dict[Path, CandleStore] = {}
+
+
+def candle_store(settings: Settings) -> CandleStore:
+    """Return the candle store under ``settings.data_dir``."""
+    root = Path(settings.data_dir) / "candles"
+    if root not in _candle_stores:
+        _candle_stores[root] = CandleStore(root, max_parts=settings.candle_compact_parts)
+    return _candle_stores[root]
+
+
+async def _get_klines(symbol: str, tf: str, settings: Settings) -> pd.DataFrame:
+    if not settings.kline_delta_fetch:
+        return await binance.get_klines(symbol, tf)
+    df = await binance.get_klines_delta(symbol, tf, raw_klines.get((symbol, tf)), settings.kline_max_len)
+    raw_klines[(symbol, tf)] = df
+    return df.copy()
+
+
+async def _fetch_symbol(symbol: str, settings: Settings) -> dict:
+    """Return the klines of every configured timeframe for ``symbol``.
+
+    With ``derive_timeframes`` only the 1m klines are fetched once each
+    derivable timeframe has been seeded from the exchange.
+    """
+    derive = settings.derive_timeframes and any(tf in DERIVED_INTERVALS for tf in settings.timeframes)
+    frames = {}
+    derived = {}
+    if derive:
+        frames["1m"] = await _get_klines(symbol, "1m", settings)
+        derived = resampler.update(symbol, frames["1m"])
+    for tf in settings.timeframes:
+        if tf in frames:
+            continue
+        if tf in derived:
+            frames[tf] = derived[tf].copy()
+            continue
+        frames[tf] = await _get_klines(symbol, tf, settings)
+        if derive:
+            resampler.seed(symbol, tf, frames[tf])
+    return {tf: frames[tf] for tf in settings.timeframes}
+
+
+def publish(symbol: str, tf: str, df, settings: Settings, store: DataStore, seed: bool = True) -> None:
+    """Store klines that already carry indicators and their signal.
+
+    With ``seed`` the indicator columns are also registered for reuse by
+    later consumers of these candles.
+    """
+    if seed:
+        indicator_registry.seed(symbol, tf, df, indicator_columns(settings))
+    store.set_klines(symbol, tf, df)
+    store.set_signal(symbol, tf, generate_signal(df, settings))
+
 
 async def update_once(settings: Settings, store: DataStore) -> None:
+    frames = {}
     for symbol in settings.watchlist:
-        for tf in settings.timeframes:
-            df = await binance.get_klines(symbol, tf)
+        for tf, df in (await _fetch_symbol(symbol, settings)).items():
             df["symbol"] = symbol
             df["interval"] = tf
-            df = add_indicators(df, settings)
-            store.set_klines(symbol, tf, df)
-            sig = generate_signal(df, settings)
-            store.set_signal(symbol, tf, sig)
-            Path(settings.data_dir).mkdir(parents=True, exist_ok=True)
-            try:
-                df.to_parquet(Path(settings.data_dir) / f"{symbol}_{tf}.parquet", index=False)
-            except ImportError:
-                logger.warning(
-                    "pyarrow or fastparquet is not installed; saving %s %s data as CSV",
-                    symbol,
-                    tf,
-                )
-                df.to_csv(Path(settings.data_dir) / f"{symbol}_{tf}.csv", index=False)
+            frames[(symbol, tf)] = df
+    # Indicators for the whole watchlist are computed in one batch.
+    for (symbol, tf), df in indicators.apply_many(frames, settings).items():
+        publish(symbol, tf, df, settings, store)
+        persist(symbol, tf, df, settings)
+
+
+def persist(symbol: str, tf: str, df, settings: Settings, now: pd.Timestamp | None = None) -> None:
+    """Write the candles of ``df`` closed by ``now`` and not stored yet to the candle store."""
+    try:
+        candle_store(settings).append(symbol, tf, df, now=now)
+    except ImportError:
+        logger.warning(
+            "pyarrow is not installed; saving %s %s data as CSV",
+            symbol,
+            tf,
+        )
+        Path(settings.data_dir).mkdir(parents=True, exist_ok=True)
+        df.to_csv(Path(settings.data_dir) / f"{symbol}_{tf}.csv", index=False)
 
 
 def create_scheduler(settings: Settings, store: DataStore) -> AsyncIOScheduler:
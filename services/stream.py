@@ -0,0 +1,141 @@
+"""Streaming ingestion of klines from the Binance WebSocket API.
+
+An alternative to polling in :mod:`services.scheduler`: every kline message
+updates the candle frame of its (symbol, timeframe), the incremental
+indicators and the signal in the :class:`DataStore` as it arrives.  Closed
+candles are written to the candle store.  After every (re)connect the
+candles missed while disconnected are backfilled with a single REST request
+per stream.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, Tuple
+
+import httpx
+import pandas as pd
+
+from config import Settings
+from core.datasources import binance
+from core.datasources.binance import INTERVAL_MS, MAX_KLINES
+from core.datasources.binance_ws import stream_klines
+from services import scheduler
+from services.store import DataStore
+
+logger = logging.getLogger(__name__)
+
+
+class KlineStreamer:
+    """Keep the store up to date from the combined kline streams."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        store: DataStore,
+        url: str | None = None,
+        max_len: int = MAX_KLINES,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.settings = settings
+        self.store = store
+        self.url = url or settings.binance_ws_url
+        self.max_len = max_len
+        self.reconnect_delay = reconnect_delay
+        self.frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self.messages = 0
+        # Times the streams failed and were restarted.
+        self.failures = 0
+        self._task: asyncio.Task | None = None
+
+    def _merge(self, key: Tuple[str, str], new: pd.DataFrame) -> pd.DataFrame:
+        frame = binance.merge_klines(self.frames.get(key), new, self.max_len)
+        self.frames[key] = frame
+        return frame
+
+    def _publish(self, key: Tuple[str, str], seed: bool, now: pd.Timestamp | None = None) -> None:
+        symbol, tf = key
+        df = self.frames[key].copy()
+        df["symbol"] = symbol
+        df["interval"] = tf
+        df = scheduler.indicators.apply(symbol, tf, df, self.settings)
+        scheduler.publish(symbol, tf, df, self.settings, self.store, seed=seed)
+        if seed:
+            # Only closed candles are stored, so updates of the forming
+            # candle have nothing to write.
+            scheduler.persist(symbol, tf, df, self.settings, now)
+
+    async def backfill(self) -> None:
+        """Fetch the candles every stream missed since its last stored one.
+
+        When backfilling a stream fails its stored candles are kept as they
+        are and the other streams are still backfilled.
+        """
+        now_ms = pd.Timestamp.now(tz="UTC").tz_localize(None).value // 1_000_000
+        for symbol in self.settings.watchlist:
+            for tf in self.settings.timeframes:
+                key = (symbol, tf)
+                frame = self.frames.get(key)
+                limit = self.max_len
+                if frame is not None and len(frame) and tf in INTERVAL_MS:
+                    last_ms = frame["open_time"].iloc[-1].value // 1_000_000
+                    # The last stored candle plus every candle opened since.
+                    limit = min(self.max_len, (now_ms - last_ms) // INTERVAL_MS[tf] + 1)
+                try:
+                    fresh = await binance.get_klines(symbol, tf, limit=max(int(limit), 1), fallback=False)
+                    self._merge(key, fresh)
+                    self._publish(key, seed=True)
+                except httpx.HTTPError as exc:
+                    logger.warning("backfilling %s %s failed: %s", symbol, tf, exc)
+                except Exception:  # keep the other streams going
+                    logger.exception("failed to backfill %s %s", symbol, tf)
+
+    def handle(self, symbol: str, tf: str, row: dict, closed: bool = False) -> None:
+        """Apply one streamed candle (forming or closed).
+
+        Indicator columns are shared with other consumers only when a candle
+        closes; updates of the forming candle would just churn that cache.
+        """
+        key = (symbol, tf)
+        self._merge(key, pd.DataFrame([row]))
+        # The exchange says when a candle is closed; don't wait for the clock.
+        now = row["close_time"] + pd.Timedelta(milliseconds=1) if closed else None
+        self._publish(key, seed=closed, now=now)
+        self.messages += 1
+
+    async def run(self) -> None:
+        """Consume the streams until cancelled, restarting them when they fail."""
+        while True:
+            try:
+                await self._consume()
+                return
+            except Exception:
+                self.failures += 1
+                logger.exception("kline streams failed; restarting in %.1fs", self.reconnect_delay)
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _consume(self) -> None:
+        async for symbol, tf, row, closed in stream_klines(
+            self.settings.watchlist,
+            self.settings.timeframes,
+            self.url,
+            on_connect=self.backfill,
+            reconnect_delay=self.reconnect_delay,
+        ):
+            try:
+                self.handle(symbol, tf, row, closed)
+            except Exception:  # keep the stream alive on a bad message
+                logger.exception("failed to apply %s %s kline", symbol, tf)
+
+    def start(self) -> asyncio.Task:
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,123 @@
+"""Fixtures shared by the test modules."""
+from __future__ import annotations
+
+import json
+from typing import Callable
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import http_client
+
+MINUTE = 60_000
+
+Handler = Callable[[dict], httpx.Response]
+
+
+def _random_walk(n: int = 1500) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    return pd.DataFrame(
+        {
+            "open_time": pd.date_range("2023-01-01", periods=n, freq="min"),
+            "open": close,
+            "high": close + rng.uniform(0, 1, n),
+            "low": close - rng.uniform(0, 1, n),
+            "close": close,
+            "volume": 100.0,
+        }
+    )
+
+
+def _synthetic_klines(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 0.5, n).cumsum()
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = rng.uniform(0, 0.5, n)
+    open_time = pd.date_range("2020-01-01", periods=n, freq="min")
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.uniform(1, 100, n),
+            "close_time": open_time + pd.Timedelta(minutes=1) - pd.Timedelta(milliseconds=1),
+        }
+    )
+
+
+def _kline_payload(df: pd.DataFrame) -> bytes:
+    open_ms = df["open_time"].to_numpy(dtype="datetime64[ms]").view("int64").tolist()
+    close_ms = df["close_time"].to_numpy(dtype="datetime64[ms]").view("int64").tolist()
+    prices = [df[c].map("{:.8f}".format).tolist() for c in ("open", "high", "low", "close", "volume")]
+    rows = [
+        [t, o, h, l, c, v, ct, "0", 0, "0", "0", "0"]
+        for t, o, h, l, c, v, ct in zip(open_ms, *prices, close_ms)
+    ]
+    return json.dumps(rows, separators=(",", ":")).encode()
+
+
+def kline_rows(start_ms: int, end_ms: int, limit: int, close: str = "1.5") -> list:
+    """Return at most ``limit`` raw 1m klines opened from ``start_ms`` to ``end_ms``."""
+    return [
+        [t, "1", "2", "0.5", close, "10", t + MINUTE - 1, "0", 1, "0", "0", "0"]
+        for t in range(start_ms, end_ms + 1, MINUTE)
+    ][:limit]
+
+
+def klines_between(params: dict) -> httpx.Response:
+    """Answer a klines request with the candles between ``startTime`` and ``endTime``."""
+    start, end, limit = int(params["startTime"]), int(params["endTime"]), int(params["limit"])
+    return httpx.Response(200, json=kline_rows(start, end, limit))
+
+
+class FakeBinance:
+    """A fake Binance REST API recording the query parameters of every request."""
+
+    rows = staticmethod(kline_rows)
+    klines = staticmethod(klines_between)
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.calls: list = []
+        self._monkeypatch = monkeypatch
+
+    def transport(self, handler: Handler = klines_between) -> httpx.MockTransport:
+        def respond(request: httpx.Request) -> httpx.Response:
+            params = dict(request.url.params)
+            self.calls.append(params)
+            return handler(params)
+
+        return httpx.MockTransport(respond)
+
+    def install(self, handler: Handler = klines_between) -> list:
+        """Send the requests of the shared HTTP client to ``handler``."""
+        client = httpx.AsyncClient(transport=self.transport(handler))
+        self._monkeypatch.setattr(http_client, "_client", client)
+        return self.calls
+
+
+@pytest.fixture
+def fake_binance(monkeypatch) -> FakeBinance:
+    return FakeBinance(monkeypatch)
+
+
+@pytest.fixture
+def random_walk() -> Callable[..., pd.DataFrame]:
+    """Return a factory of ``n`` random-walk 1m candles without close times."""
+    return _random_walk
+
+
+@pytest.fixture
+def synthetic_klines() -> Callable[..., pd.DataFrame]:
+    """Return a factory of ``n`` seeded 1m candles in the schema of ``binance.get_klines``."""
+    return _synthetic_klines
+
+
+@pytest.fixture
+def kline_payload() -> Callable[[pd.DataFrame], bytes]:
+    """Return a function rendering candles as the raw body of a klines response."""
+    return _kline_payload
@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+import pandas as pd
+
+from core.datasources import binance
+from core.datasources.candle_store import CandleStore
+from services import backfill as bf
+
+MINUTE = 60_000
+END = 1_700_000_000_000 - 1_700_000_000_000 % (24 * 60 * MINUTE)
+START = END - 2500 * MINUTE
+
+
+def _run(store, fake_binance, fail_after: int | None = None):
+    def handler(params: dict) -> httpx.Response:
+        if fail_after is not None and len(fake_binance.calls) > fail_after:
+            return httpx.Response(400, json={"code": -1})
+        return fake_binance.klines(params)
+
+    fake_binance.install(handler)
+    return asyncio.run(bf.backfill(store, ["BTCUSDT", "ETHUSDT"], ["1m"], START, END, concurrency=3))
+
+
+def test_backfill_resumes_and_skips_stored_candles(tmp_path, fake_binance):
+    store = CandleStore(tmp_path)
+    # Candles the scheduler already stored are not written twice.
+    recent = pd.DataFrame({"open_time": pd.to_datetime([END - MINUTE], unit="ms")})
+    for col in ("open", "high", "low", "close", "volume"):
+        recent[col] = 1.0
+    recent["close_time"] = recent["open_time"] + pd.Timedelta(milliseconds=MINUTE - 1)
+    store.append("BTCUSDT", "1m", recent)
+
+    calls = fake_binance.calls
+    first = _run(store, fake_binance, fail_after=4)
+    assert len(calls) == 6
+    assert sum(first.failed.values()) == 2
+
+    calls.clear()
+    second = _run(store, fake_binance)
+    assert len(calls) == 2
+    assert not any(second.failed.values())
+    assert first.written[("BTCUSDT", "1m")] + second.written[("BTCUSDT", "1m")] == 2499
+
+    for symbol in ("BTCUSDT", "ETHUSDT"):
+        df = CandleStore(tmp_path).read(symbol, "1m")
+        assert len(df) == 2500
+        assert df["open_time"].iloc[0] == pd.Timestamp(START, unit="ms")
+        assert df["open_time"].is_unique
+        assert store.covered(symbol, "1m") == [(START, END)]
+
+    calls.clear()
+    _run(store, fake_binance)
+    assert calls == []
+    # Backtests read the backfilled span without going to the exchange.
+    df = asyncio.run(binance.get_historical_klines("ETHUSDT", "1m", START, END, store=store))
+    assert len(df) == 2500 and calls == []
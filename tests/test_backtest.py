@@ -1,8 +1,16 @@
+import asyncio
+
+import numpy as np
 import pandas as pd
+import pytest
 
+from api import routes
 from config import Settings
+from core.backtest.cache import BacktestCache
 from core.indicators.ta import add_indicators
-from core.backtest.runner import run_backtest
+from core.backtest.engine import simulate_trades, summarize
+from core.backtest.runner import downsample_curve, run_backtest, save_backtest
+from services.store import DataStore
 
 
 def test_backtest_returns_summary():
@@ -19,3 +27,86 @@ def test_backtest_returns_summary():
     df = add_indicators(df, settings)
     summary = run_backtest(df, settings)
     assert {"trades", "total_trades", "win_rate", "pnl"}.issubset(summary.keys())
+
+
+def test_simulate_trades_exits_on_sl_and_tp():
+    side = np.array([1, 0, 1, 1, -1, 0, 0])
+    close = np.full(7, 10.0)
+    high = np.array([10.0, 10.0, 10.0, 11.5, 10.0, 10.0, 11.6])
+    low = np.array([10.0, 8.0, 10.0, 10.0, 10.0, 10.0, 9.0])
+    atr = np.ones(7)
+    trades = simulate_trades(side, high, low, close, atr)
+    # Bar 3 is an exit bar so its signal is ignored; bar 6 touches both
+    # levels of the short and the stop-loss wins.
+    assert trades.entry_idx.tolist() == [0, 2, 4]
+    assert trades.exit_idx.tolist() == [1, 3, 6]
+    assert trades.pnl.tolist() == pytest.approx([-1.5, 1.0, -1.5])
+
+
+def test_summarize_stats():
+    stats = summarize(np.array([2.0, -1.0, -1.0, 3.0]))
+    assert stats["total_trades"] == 4
+    assert stats["win_rate"] == 50
+    assert stats["avg_win"] == pytest.approx(2.5)
+    assert stats["avg_loss"] == pytest.approx(-1.0)
+    assert stats["expectancy"] == pytest.approx(0.75)
+    assert stats["max_drawdown"] == pytest.approx(2.0)
+    assert stats["pnl"] == pytest.approx(3.0)
+
+
+def test_backtest_equity_curve_and_export(tmp_path):
+    settings = Settings(rsi_oversold=50, rsi_overbought=50, ema_fast=3, ema_slow=5)
+    rng = np.random.default_rng(0)
+    close = 100 + rng.normal(0, 1, 2000).cumsum()
+    df = add_indicators(
+        pd.DataFrame(
+            {
+                "open_time": pd.date_range("2023-01-01", periods=2000, freq="min"),
+                "open": close,
+                "high": close + rng.uniform(0, 1, 2000),
+                "low": close - rng.uniform(0, 1, 2000),
+                "close": close,
+                "volume": 100.0,
+            }
+        ),
+        settings,
+    )
+    result = run_backtest(df, settings)
+    curve = result["equity_curve"]
+    assert curve["time"].dtype == np.int64
+    assert curve["time"][0] == pd.Timestamp("2023-01-01").value // 1_000_000
+    assert len(curve["equity"]) == len(df)
+    assert curve["equity"][-1] == pytest.approx(result["pnl"])
+    assert result["metrics"]["total_trades"] == result["total_trades"]
+
+    small = downsample_curve(curve, 101)
+    assert len(small["equity"]) <= 101
+    assert small["equity"].max() == curve["equity"].max()
+    assert small["equity"].min() == curve["equity"].min()
+    assert small["time"][-1] == curve["time"][-1]
+
+    path = save_backtest(result["trades"], "TEST", "1m", str(tmp_path), "parquet", curve)
+    assert len(pd.read_parquet(path)) == result["total_trades"]
+    equity = pd.read_parquet(tmp_path / "backtest_TEST_1m_equity.parquet")
+    assert equity["equity"].iloc[-1] == pytest.approx(result["pnl"])
+    path = save_backtest(result["trades"], "TEST", "1m", str(tmp_path), "arrow", curve)
+    assert len(pd.read_feather(path)) == result["total_trades"]
+
+
+def test_backtest_endpoint_sends_columnar_trades_and_metrics_once(tmp_path, monkeypatch, random_walk):
+    settings = Settings(data_dir=str(tmp_path), rsi_oversold=50, rsi_overbought=50, ema_fast=3, ema_slow=5)
+    df = add_indicators(random_walk(), settings)
+
+    async def candles(symbol, timeframe, days, store, settings, progress=None):
+        return df
+
+    monkeypatch.setattr(routes, "_backtest_klines", candles)
+    monkeypatch.setattr(routes, "_backtest_cache", BacktestCache(maxsize=4))
+    summary = asyncio.run(routes.backtest("BTCUSDT", "1m", 1, "csv", 100, DataStore(), settings))
+    expected = run_backtest(df, settings)
+    assert set(summary) == {"metrics", "trades", "equity_curve", "csv"}
+    assert summary["metrics"] == expected["metrics"]
+    trades = summary["trades"]
+    assert expected["trades"]
+    assert trades["pnl"] == [t["pnl"] for t in expected["trades"]]
+    assert trades["entry_time"][0] == expected["trades"][0]["entry_time"].value // 1_000_000
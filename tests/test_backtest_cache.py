@@ -0,0 +1,53 @@
+import asyncio
+
+from api import routes
+from config import Settings
+from core.backtest.cache import BacktestCache, backtest_key
+from services.store import DataStore
+
+
+def test_backtest_key_tracks_data_and_settings(random_walk):
+    settings = Settings()
+    df = random_walk(200)
+    key = backtest_key(df, settings)
+    assert backtest_key(df.copy(), settings) == key
+    assert backtest_key(df, settings.model_copy(update={"rsi_len": 7})) != key
+    assert backtest_key(df, settings.model_copy(update={"port": 9000})) == key
+    changed = df.copy()
+    changed.loc[100, "close"] += 1
+    assert backtest_key(changed, settings) != key
+    assert backtest_key(df.iloc[:-1], settings) != key
+
+
+def test_backtest_cache_evicts_and_persists(tmp_path):
+    cache = BacktestCache(maxsize=2, persist_dir=tmp_path)
+    for i in range(3):
+        cache.set(f"k{i}", {"pnl": i})
+    assert len(list(tmp_path.glob("*.pkl"))) == 2
+
+    restarted = BacktestCache(maxsize=2, persist_dir=tmp_path)
+    assert restarted.get("k2") == {"pnl": 2}
+    assert restarted.get("missing") is None
+
+    memory_only = BacktestCache(maxsize=1)
+    memory_only.set("a", 1)
+    memory_only.set("b", 2)
+    assert memory_only.get("a") is None
+    assert memory_only.get("b") == 2
+
+
+def test_backtest_span_ends_at_the_last_closed_candle(monkeypatch, random_walk):
+    spans = []
+
+    async def historical(symbol, interval, start_ms, end_ms, store=None):
+        spans.append((start_ms, end_ms))
+        return random_walk(300)
+
+    monkeypatch.setattr(routes.binance, "get_historical_klines", historical)
+    hour = 3_600_000
+    candle_open = 1_700_000_000_000 - 1_700_000_000_000 % hour
+    for now_ms in (candle_open + 1, candle_open + hour - 1_000):
+        monkeypatch.setattr(routes.time, "time", lambda now_ms=now_ms: now_ms / 1000)
+        asyncio.run(routes._backtest_klines("BTCUSDT", "1h", 1, DataStore(), Settings()))
+    assert spans[0] == spans[1]
+    assert spans[0][1] % hour == 0
@@ -0,0 +1,78 @@
+import asyncio
+
+import pandas as pd
+import pydantic
+import pytest
+
+from api import routes
+from api.models import SweepRequest
+from config import Settings
+from core.backtest.runner import run_backtest
+from core.backtest.sweep import expand_grid, run_sweep
+from core.indicators.ta import add_indicators
+from services.jobs import JobManager
+from services.store import DataStore
+
+
+def test_expand_grid_skips_inverted_emas():
+    combos = expand_grid(Settings(), {"ema_fast": [3, 9], "ema_slow": [5, 21]})
+    assert [(c["ema_fast"], c["ema_slow"]) for c in combos] == [(3, 5), (3, 21), (9, 21)]
+    assert all(c["rsi_len"] == Settings().rsi_len for c in combos)
+    with pytest.raises(ValueError):
+        expand_grid(Settings(), {"unknown": [1]})
+
+
+def test_sweep_matches_single_backtests(random_walk):
+    settings = Settings()
+    df = random_walk()
+    grid = {"ema_fast": [3, 5], "ema_slow": [8], "rsi_oversold": [45, 50], "rsi_overbought": [50, 55]}
+    table = run_sweep(df, settings, grid, processes=1)
+    assert len(table) == 8
+    assert table["pnl"].is_monotonic_decreasing
+    for row in table.to_dict(orient="records"):
+        combo = settings.model_copy(update={k: row[k] for k in grid})
+        expected = run_backtest(add_indicators(df, combo), combo)
+        assert row["total_trades"] == expected["total_trades"]
+        assert row["pnl"] == pytest.approx(expected["pnl"])
+
+
+def test_sweep_ranks_each_metric_best_first(random_walk):
+    df = random_walk()
+    grid = {"ema_fast": [3, 5], "ema_slow": [8, 13]}
+    table = run_sweep(df, Settings(), grid, processes=1, rank_by="max_drawdown")
+    assert table["max_drawdown"].is_monotonic_increasing
+    with pytest.raises(ValueError):
+        run_sweep(df, Settings(), grid, processes=1, rank_by="ema_fast")
+
+
+def test_sweep_process_pool_matches_inline(random_walk):
+    df = random_walk()
+    grid = {"ema_fast": [3, 5], "ema_slow": [8, 13], "atr_len": [7, 14]}
+    inline = run_sweep(df, Settings(), grid, processes=1)
+    pooled = run_sweep(df, Settings(), grid, processes=2)
+    pd.testing.assert_frame_equal(inline, pooled)
+
+
+def test_sweep_endpoint_runs_in_the_shared_job_pool(monkeypatch, random_walk):
+    df = random_walk()
+
+    async def candles(symbol, timeframe, days, store, settings, progress=None):
+        return df
+
+    manager = JobManager(max_workers=2)
+    monkeypatch.setattr(routes, "_backtest_klines", candles)
+    monkeypatch.setattr(routes, "job_manager", manager)
+    req = SweepRequest(symbol="BTCUSDT", timeframe="1m", ema_fast=[3, 5], ema_slow=[8, 13], atr_len=[7, 14], top=5)
+    try:
+        rows = asyncio.run(routes.backtest_sweep(req, DataStore(), Settings()))
+    finally:
+        manager.shutdown()
+    grid = {"ema_fast": [3, 5], "ema_slow": [8, 13], "atr_len": [7, 14]}
+    expected = run_sweep(df, Settings(), grid, processes=1).head(5)
+    assert rows == expected.to_dict(orient="records")
+
+
+@pytest.mark.parametrize("field", [{"top": 0}, {"days": -1}, {"ema_fast": [3, 0]}, {"atr_len": [-14]}])
+def test_sweep_request_rejects_non_positive_values(field):
+    with pytest.raises(pydantic.ValidationError):
+        SweepRequest(symbol="BTCUSDT", timeframe="1m", **field)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from config import Settings
+from core.indicators.batch import INDICATOR_COLUMNS, add_indicators_batch, ewm_matrix, stack
+from core.indicators.ta import add_indicators
+
+
+def test_batched_indicators_match_per_symbol(synthetic_klines):
+    settings = Settings()
+    # Different lengths exercise the NaN padding of shorter series.
+    frames = {(f"SYM{i}", "1m"): synthetic_klines(300 + 40 * i, seed=i) for i in range(5)}
+    out = add_indicators_batch(frames, settings)
+    for key, df in frames.items():
+        expected = add_indicators(df, settings)
+        for col in INDICATOR_COLUMNS:
+            assert np.array_equal(out[key][col].to_numpy(), expected[col].to_numpy(), equal_nan=True), (key, col)
+
+
+def test_ewm_matrix_per_row_com():
+    rng = np.random.default_rng(0)
+    rows = [rng.normal(size=50), rng.normal(size=30)]
+    smoothed, weighted, _ = ewm_matrix(stack(rows), np.array([4.0, 9.0]))
+    for row, (values, com) in enumerate(zip(rows, (4.0, 9.0))):
+        expected = pd.Series(values).ewm(com=com, adjust=False).mean().to_numpy()
+        assert np.array_equal(smoothed[row, -len(values):], expected)
+        assert weighted[row] == expected[-1]
@@ -0,0 +1,13 @@
+from benchmarks.run import compare, run_benchmarks
+
+
+def test_benchmarks_run_offline_on_small_data():
+    doc = run_benchmarks([200])
+    assert "run_backtest[200]" in doc["results"]
+    assert all(seconds > 0 for seconds in doc["results"].values())
+
+
+def test_compare_flags_slowdowns():
+    baseline = {"results": {"a[1]": 1.0, "b[1]": 1.0}}
+    current = {"results": {"a[1]": 1.1, "b[1]": 1.5, "c[1]": 9.0}}
+    assert compare(current, baseline, threshold=0.25) == ["b[1]"]
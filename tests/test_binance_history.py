@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import httpx
+import pandas as pd
+
+from core.datasources import binance
+from core.datasources.candle_store import CandleStore
+
+MINUTE = 60_000
+
+
+def test_historical_klines_pages_and_caches(tmp_path, fake_binance):
+    store = CandleStore(tmp_path)
+    calls = fake_binance.install()
+    end = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE
+    start = end - 2500 * MINUTE
+
+    df = asyncio.run(binance.get_historical_klines("BTCUSDT", "1m", start, end, store=store))
+    assert len(df) == 2500
+    assert len(calls) == 3
+    assert df["open_time"].is_monotonic_increasing
+    assert df["open_time"].iloc[0] == pd.Timestamp(start, unit="ms")
+
+    calls.clear()
+    again = asyncio.run(binance.get_historical_klines("BTCUSDT", "1m", start, end, store=store))
+    assert calls == []
+    pd.testing.assert_frame_equal(df, again)
+
+    # Extending the span only fetches the part that isn't cached yet.
+    longer = asyncio.run(
+        binance.get_historical_klines("BTCUSDT", "1m", start - 100 * MINUTE, end, store=store)
+    )
+    assert len(longer) == 2600
+    assert len(calls) == 1
+    assert int(calls[0]["endTime"]) == start - 1
+
+    # Candles appended by the scheduler are covered too.
+    calls.clear()
+    recent = binance._klines_frame(
+        [[t, "1", "2", "0.5", "1.5", "10", t + MINUTE - 1] for t in range(end, end + 50 * MINUTE, MINUTE)]
+    )
+    store.append("BTCUSDT", "1m", recent)
+    tail = asyncio.run(
+        binance.get_historical_klines("BTCUSDT", "1m", end - 10 * MINUTE, end + 50 * MINUTE, store=store)
+    )
+    assert calls == []
+    assert len(tail) == 60
+
+
+def test_delta_fetch_requests_only_new_candles(fake_binance):
+    now = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE
+
+    def handler(params: dict) -> httpx.Response:
+        limit = int(params["limit"])
+        start = int(params.get("startTime", now - (limit - 1) * MINUTE))
+        rows = [
+            [t, "1", "2", "0.5", str(t // MINUTE % 7), "10", t + MINUTE - 1, "0", 1, "0", "0", "0"]
+            for t in range(start, now + 1, MINUTE)
+        ][:limit]
+        return httpx.Response(200, json=rows)
+
+    calls = fake_binance.install(handler)
+    stored = asyncio.run(binance.get_klines_delta("BTCUSDT", "1m", None, max_len=500))
+    assert len(stored) == 500 and calls[-1]["limit"] == "500"
+
+    # The forming candle is replaced, new ones appended and the series trimmed.
+    stale = stored.iloc[:-2].copy()
+    stale.loc[stale.index[-1], "close"] = -1.0
+    updated = asyncio.run(binance.get_klines_delta("BTCUSDT", "1m", stale, max_len=500))
+    assert calls[-1]["startTime"] == str(int(stale["open_time"].iloc[-1].value // 1_000_000))
+    pd.testing.assert_frame_equal(updated, stored)
+
+    # Too far behind for one page: fall back to the latest candles.
+    old = stored.iloc[:1].copy()
+    old["open_time"] -= pd.Timedelta(days=2)
+    assert len(asyncio.run(binance.get_klines_delta("BTCUSDT", "1m", old, max_len=500))) == 500
+    assert "startTime" not in calls[-1]
+
+
+def test_klines_frame_parses_raw_payload_into_compact_typed_columns():
+    rows = [
+        [t, "1.5", "2.25", "0.5", "1.75", "10.125", t + MINUTE - 1, "15.2", 7, "3.1", "4.7", "0"]
+        for t in range(0, 5 * MINUTE, MINUTE)
+    ]
+    payload = json.dumps(rows).encode()
+    df = binance._klines_frame(payload)
+    assert list(df.columns) == binance.KLINE_COLUMNS
+    assert df["close"].dtype == "float64" and df["open_time"].dtype == "datetime64[ns]"
+    assert df["high"].tolist() == [2.25] * 5
+    assert df["close_time"].iloc[-1] == pd.Timestamp(5 * MINUTE - 1, unit="ms")
+    pd.testing.assert_frame_equal(df, binance._klines_frame(rows))
+    assert list(binance._klines_frame(b"[]").columns) == binance.KLINE_COLUMNS
@@ -0,0 +1,61 @@
+import pandas as pd
+
+from core.datasources.candle_store import CandleStore
+
+MINUTE = pd.Timedelta(minutes=1)
+
+
+def _candles(start: str, n: int) -> pd.DataFrame:
+    open_time = pd.date_range(start, periods=n, freq="min")
+    close = pd.Series(range(n), dtype=float) + 100
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": 1.0,
+            "close_time": open_time + MINUTE - pd.Timedelta(milliseconds=1),
+            "rsi": 50.0,
+        }
+    )
+
+
+def test_append_writes_only_new_closed_candles(tmp_path):
+    store = CandleStore(tmp_path, max_parts=100)
+    df = _candles("2024-01-01 23:50", 20)
+    # The last candle is still forming.
+    now = df["open_time"].iloc[-1] + pd.Timedelta(seconds=30)
+    assert store.append("BTCUSDT", "1m", df, now=now) == 19
+    days = sorted(p.name for p in (tmp_path / "BTCUSDT" / "1m").iterdir() if p.is_dir())
+    assert days == ["2024-01-01", "2024-01-02"]
+    # The span of the frame up to the last closed candle is covered.
+    first_ms = df["open_time"].iloc[0].value // 1_000_000
+    assert store.covered("BTCUSDT", "1m") == [(first_ms, first_ms + 19 * 60_000)]
+
+    more = _candles("2024-01-01 23:50", 22)
+    assert store.append("BTCUSDT", "1m", more, now=now + 2 * MINUTE) == 2
+    assert store.append("BTCUSDT", "1m", more, now=now + 2 * MINUTE) == 0
+    assert len(list((tmp_path / "BTCUSDT" / "1m" / "2024-01-02").iterdir())) == 2
+
+    stored = CandleStore(tmp_path).read("BTCUSDT", "1m")
+    expected = more.iloc[:21].drop(columns="rsi").reset_index(drop=True)
+    pd.testing.assert_frame_equal(stored, expected)
+    assert CandleStore(tmp_path).last_open_time("BTCUSDT", "1m") == more["open_time"].iloc[20]
+
+
+def test_range_reads_and_compaction(tmp_path):
+    store = CandleStore(tmp_path, max_parts=3)
+    df = _candles("2024-03-05 00:00", 10)
+    for i in range(1, 11):
+        store.append("ETHUSDT", "1m", df.iloc[:i], now=df["close_time"].iloc[-1] + MINUTE)
+    parts = list((tmp_path / "ETHUSDT" / "1m" / "2024-03-05").iterdir())
+    assert len(parts) < 3
+
+    store.compact("ETHUSDT", "1m")
+    assert len(list((tmp_path / "ETHUSDT" / "1m" / "2024-03-05").iterdir())) == 1
+    window = store.read("ETHUSDT", "1m", df["open_time"].iloc[2], df["open_time"].iloc[7])
+    assert window["open_time"].tolist() == df["open_time"].iloc[2:7].tolist()
+    assert store.read("ETHUSDT", "1m", pd.Timestamp("2024-03-06")).empty
+    assert store.read("XRPUSDT", "1m").empty
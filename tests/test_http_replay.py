@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import httpx
+
+from config import Settings
+from core.datasources import binance
+from core.indicators.incremental import IncrementalIndicators
+from main import use_stream
+from services import http_client, scheduler
+from services.http_replay import RecordingTransport, ReplayTransport
+from services.store import DataStore
+
+MINUTE = 60_000
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _klines_at(fake_binance, price: dict) -> httpx.MockTransport:
+    def handler(params: dict) -> httpx.Response:
+        limit = int(params["limit"])
+        rows = fake_binance.rows(0, (limit - 1) * MINUTE, limit, close=str(price["close"]))
+        return httpx.Response(200, json=rows, headers={"x-mbx-used-weight-1m": "2"})
+
+    return fake_binance.transport(handler)
+
+
+def _get_klines(transport: httpx.AsyncBaseTransport, **params) -> list:
+    async def run() -> list:
+        async with httpx.AsyncClient(transport=transport) as client:
+            resp = await client.get(f"{binance.BASE_URL}/klines", params={"symbol": "BTCUSDT", **params})
+            return resp.json()
+
+    return asyncio.run(run())
+
+
+def test_recorded_responses_replay_along_the_timeline(tmp_path, fake_binance):
+    cassette = tmp_path / "binance.jsonl"
+    price = {"close": 100}
+    clock = FakeClock()
+    recorder = RecordingTransport(cassette, _klines_at(fake_binance, price), clock=clock)
+    assert _get_klines(recorder, interval="1m", limit=3)[-1][4] == "100"
+    clock.now, price["close"] = 60.0, 101
+    _get_klines(recorder, interval="1m", limit=3)
+    entries = [json.loads(line) for line in cassette.read_text().splitlines()]
+    assert [e["elapsed"] for e in entries] == [0.0, 60.0]
+    assert entries[0]["headers"]["x-mbx-used-weight-1m"] == "2"
+
+    replay_clock = FakeClock()
+    replay = ReplayTransport(cassette, speed=2.0, clock=replay_clock)
+    assert _get_klines(replay, interval="1m", limit=3)[-1][4] == "100"
+    replay_clock.now = 30.0
+    assert _get_klines(replay, interval="1m", limit=3)[-1][4] == "101"
+    # Time window parameters don't have to match the recording.
+    assert _get_klines(replay, interval="1m", limit=3, startTime=0)[-1][4] == "101"
+
+    sequence = ReplayTransport(cassette, speed=None)
+    closes = [_get_klines(sequence, interval="1m", limit=3)[-1][4] for _ in range(3)]
+    assert closes == ["100", "101", "101"]
+    assert "not recorded" in _get_klines(sequence, interval="1h", limit=3)["error"]
+
+
+def test_scheduler_runs_offline_from_replayed_responses(tmp_path, monkeypatch, fake_binance):
+    cassette = tmp_path / "binance.jsonl"
+    recorder = RecordingTransport(cassette, _klines_at(fake_binance, {"close": 250}))
+    monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=recorder))
+    asyncio.run(binance.get_klines("BTCUSDT", "1m"))
+
+    replay = ReplayTransport(cassette, latency=0.001)
+    monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=replay))
+    monkeypatch.setattr(scheduler, "indicators", IncrementalIndicators())
+    settings = Settings(watchlist=["BTCUSDT"], timeframes=["1m"], data_dir=str(tmp_path), kline_delta_fetch=False)
+    store = DataStore()
+    asyncio.run(scheduler.update_once(settings, store))
+    assert replay.requests == 1
+    df = store.get_klines("BTCUSDT", "1m")
+    assert len(df) == 1000 and (df["close"] == 250).all()
+    assert store.get_signal("BTCUSDT", "1m") is not None
+
+
+def test_replay_polls_over_rest_instead_of_streaming(tmp_path):
+    assert use_stream(Settings(kline_source="stream"))
+    assert not use_stream(Settings(kline_source="stream", http_replay_path=str(tmp_path / "replay.jsonl")))
+    assert not use_stream(Settings(kline_source="rest"))
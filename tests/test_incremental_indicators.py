@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from config import Settings
+from core.indicators.incremental import INDICATOR_COLUMNS, IncrementalIndicators
+from core.indicators.ta import add_indicators
+
+MS = pd.Timedelta(milliseconds=1)
+
+
+def _assert_rows_equal(actual: pd.DataFrame, expected: pd.DataFrame) -> None:
+    for col in INDICATOR_COLUMNS:
+        assert np.array_equal(actual[col].to_numpy(), expected[col].to_numpy(), equal_nan=True), col
+
+
+def test_streamed_indicators_match_batch_exactly(synthetic_klines):
+    settings = Settings()
+    df = synthetic_klines(1500, seed=3)
+    batch = add_indicators(df, settings)
+    engine = IncrementalIndicators()
+
+    for i in range(500, len(df)):
+        # Each tick sees a 501-candle window whose last candle is still open;
+        # the first one starts at the same candle as the batch computation.
+        window = df.iloc[i - 500 : i + 1]
+        now = df["close_time"].iloc[i - 1] + MS
+        out = engine.apply("TEST", "1m", window, settings, now=now)
+        assert len(out) == len(window)
+        _assert_rows_equal(out.iloc[[-1]], batch.iloc[[i]])
+
+    # Closing the final candle commits it and leaves earlier rows untouched.
+    out = engine.apply("TEST", "1m", df.iloc[-500:], settings, now=df["close_time"].iloc[-1] + MS)
+    _assert_rows_equal(out, batch.iloc[-500:])
+
+
+def test_state_rebuilds_on_gap_or_settings_change(synthetic_klines):
+    settings = Settings()
+    df = synthetic_klines(600, seed=1)
+    engine = IncrementalIndicators()
+    end = df["close_time"].iloc[-1] + MS
+    engine.apply("TEST", "1m", df.iloc[:200], settings, now=end)
+
+    # A window that doesn't connect to the last seen candle starts over.
+    out = engine.apply("TEST", "1m", df.iloc[400:], settings, now=end)
+    _assert_rows_equal(out, add_indicators(df.iloc[400:], settings))
+
+    faster = settings.model_copy(update={"ema_fast": 5})
+    out = engine.apply("TEST", "1m", df.iloc[400:], faster, now=end)
+    _assert_rows_equal(out, add_indicators(df.iloc[400:], faster))
+
+
+def test_apply_many_bootstraps_all_symbols_in_one_batch(synthetic_klines):
+    settings = Settings()
+    full = {(f"SYM{i}", "1m"): synthetic_klines(401 + 50 * i, seed=i) for i in range(4)}
+    frames = {key: df.iloc[:-1] for key, df in full.items()}
+    engine = IncrementalIndicators()
+    now = max(df["close_time"].iloc[-2] for df in frames.values()) + MS
+
+    out = engine.apply_many(frames, settings, now=now)
+    for key, df in frames.items():
+        _assert_rows_equal(out[key], add_indicators(df, settings))
+
+    # The next tick continues from the batched state one candle at a time.
+    later = max(df["close_time"].iloc[-1] for df in full.values()) + MS
+    out = engine.apply_many({key: df.iloc[1:] for key, df in full.items()}, settings, now=later)
+    for key, df in full.items():
+        _assert_rows_equal(out[key], add_indicators(df, settings).iloc[1:])
@@ -0,0 +1,76 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from config import Settings
+from core.indicators.registry import IndicatorRegistry, data_version, indicator_columns
+from core.indicators.ta import add_indicators
+from services import metrics, scheduler
+from services.store import DataStore
+
+
+def test_columns_are_computed_once_per_data_version(synthetic_klines):
+    settings = Settings()
+    df = synthetic_klines(300)
+    registry = IndicatorRegistry()
+
+    out = registry.add_indicators("BTCUSDT", "1m", df, settings)
+    pd.testing.assert_frame_equal(out, add_indicators(df, settings))
+    assert (registry.hits, registry.misses) == (0, 4)
+
+    # A copy of the same candles fetched elsewhere hits the cache.
+    registry.add_indicators("BTCUSDT", "1m", df.copy(), settings)
+    rsi = registry.column("BTCUSDT", "1m", df, "rsi", length=settings.rsi_len)
+    assert (registry.hits, registry.misses) == (5, 4)
+    assert rsi.equals(out["rsi"].rename(None))
+
+    # An updated last candle is a new version.
+    moved = df.copy()
+    moved.loc[moved.index[-1], "close"] += 1
+    assert data_version(moved) != data_version(df)
+    registry.column("BTCUSDT", "1m", moved, "rsi", length=settings.rsi_len)
+    assert registry.misses == 5
+
+
+def test_seeded_columns_are_kept_apart_from_fresh_ones_and_lru_eviction(synthetic_klines):
+    settings = Settings()
+    df = add_indicators(synthetic_klines(100), settings)
+    # Seeded values computed elsewhere may differ from a fresh computation.
+    df["rsi"] += 1
+    registry = IndicatorRegistry(maxsize=8)
+    registry.seed("ETHUSDT", "5m", df, indicator_columns(settings))
+    seeded = registry.column("ETHUSDT", "5m", df, "rsi", prefer_seeded=True, length=settings.rsi_len)
+    assert (registry.hits, registry.misses) == (1, 0)
+    assert seeded.equals(df["rsi"].rename(None))
+
+    fresh = registry.add_indicators("ETHUSDT", "5m", df, settings)
+    assert registry.misses == 4
+    pd.testing.assert_series_equal(fresh["rsi"], add_indicators(df, settings)["rsi"])
+
+    registry.column("ETHUSDT", "5m", df, "sma", length=20)
+    assert len(registry._columns) == 8
+    with pytest.raises(KeyError):
+        registry.column("ETHUSDT", "5m", df, "macd")
+
+
+def test_metrics_reuse_columns_published_by_the_scheduler(monkeypatch, synthetic_klines):
+    settings = Settings()
+    registry = IndicatorRegistry()
+    monkeypatch.setattr(metrics, "indicator_registry", registry)
+    monkeypatch.setattr(scheduler, "indicator_registry", registry)
+
+    async def tickers(symbols):
+        return {sym: {"priceChangePercent": 0, "volume": 0} for sym in symbols}
+
+    monkeypatch.setattr(metrics.binance.ticker_snapshot, "get", tickers)
+    store = DataStore()
+    df = add_indicators(synthetic_klines(300), settings)
+    scheduler.publish("BTCUSDT", "15m", df, settings, store)
+
+    metric = asyncio.run(metrics._compute_metric("BTCUSDT", "15m", store))
+    assert registry.hits == 1  # rsi came from the scheduler
+    assert metric.rsi == pytest.approx(df["rsi"].iloc[-1])
+    misses = registry.misses
+    asyncio.run(metrics._compute_metric("BTCUSDT", "15m", store))
+    assert (registry.hits, registry.misses) == (4, misses)
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import routes
+from api.models import BacktestJobRequest
+from config import Settings
+from core.backtest.runner import EXPORT_FORMATS
+from core.indicators.registry import IndicatorRegistry
+from services.jobs import CANCELLED, DONE, FAILED, Job, JobManager
+from main import app
+from services.store import DataStore
+
+
+def test_job_runs_in_pool_and_reports_result():
+    async def scenario():
+        manager = JobManager(max_workers=1)
+
+        async def work(job):
+            job.progress = 0.5
+            return await manager.run(pow, 2, 10)
+
+        job = manager.submit(work)
+        await job.task
+        manager.shutdown()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == DONE
+    assert job.progress == 1.0
+    assert job.to_dict()["result"] == 1024
+
+
+def test_job_failure_cancellation_and_limit():
+    async def scenario():
+        manager = JobManager(max_workers=1, max_jobs=3)
+
+        async def boom(job):
+            raise ValueError("bad input")
+
+        async def slow(job):
+            await asyncio.sleep(10)
+
+        failed = manager.submit(boom)
+        running = manager.submit(slow)
+        queued = manager.submit(slow)
+        with pytest.raises(RuntimeError):
+            manager.submit(slow)
+        await asyncio.sleep(0)
+        manager.cancel(running.id)
+        manager.cancel(queued.id)
+        await asyncio.gather(failed.task, running.task, queued.task, return_exceptions=True)
+        # Finished jobs make room for new submissions.
+        manager.submit(boom)
+        manager.shutdown()
+        return failed, running, queued
+
+    failed, running, queued = asyncio.run(scenario())
+    assert failed.status == FAILED
+    assert failed.error == "bad input"
+    assert running.status == CANCELLED
+    assert queued.status == CANCELLED
+
+
+def test_backtest_candles_report_progress_per_indicator_off_the_loop(monkeypatch, random_walk):
+    async def historical(symbol, interval, start_ms, end_ms, store=None):
+        return random_walk(300)
+
+    monkeypatch.setattr(routes.binance, "get_historical_klines", historical)
+    monkeypatch.setattr(routes, "indicator_registry", IndicatorRegistry())
+    job = Job()
+    stage = job.stage(0.0, 0.5)
+    seen = []
+
+    def progress(fraction):
+        stage(fraction)
+        seen.append((job.progress, threading.current_thread() is threading.main_thread()))
+
+    df = asyncio.run(routes._backtest_klines("BTCUSDT", "1h", 1, DataStore(), Settings(), progress))
+    assert "rsi" in df
+    assert [p for p, _ in seen] == pytest.approx([0.2, 0.275, 0.35, 0.425, 0.5])
+    # Only the fetch is reported from the event loop.
+    assert [on_loop for _, on_loop in seen] == [True, False, False, False, False]
+
+
+def test_backtest_job_with_unsupported_export_is_refused_before_queuing():
+    assert BacktestJobRequest.model_fields["export"].annotation.__args__ == EXPORT_FORMATS
+    jobs = len(routes.job_manager.jobs)
+    resp = TestClient(app).post("/backtest/jobs", json={"symbol": "BTCUSDT", "timeframe": "1h", "export": "xlsx"})
+    assert resp.status_code == 422
+    assert len(routes.job_manager.jobs) == jobs
@@ -0,0 +1,161 @@
+import asyncio
+import json
+
+import httpx
+import pandas as pd
+import pytest
+
+websockets = pytest.importorskip("websockets")
+
+from config import Settings  # noqa: E402
+from core.datasources import binance  # noqa: E402
+from core.datasources.binance_ws import parse_kline, stream_names  # noqa: E402
+from core.indicators.incremental import IncrementalIndicators  # noqa: E402
+from services import scheduler  # noqa: E402
+from services.store import DataStore  # noqa: E402
+from services.stream import KlineStreamer  # noqa: E402
+
+MINUTE = 60_000
+
+
+def _message(open_ms: int, close: float, closed: bool) -> str:
+    kline = {
+        "t": open_ms, "T": open_ms + MINUTE - 1, "s": "BTCUSDT", "i": "1m",
+        "o": "100", "c": str(close), "h": str(close + 1), "l": "99", "v": "5",
+        "n": 3, "x": closed, "q": "500", "V": "2", "Q": "200", "B": "0",
+    }
+    return json.dumps({"stream": "btcusdt@kline_1m", "data": {"e": "kline", "s": "BTCUSDT", "k": kline}})
+
+
+def _rest_klines(end_ms: int, limit: int) -> pd.DataFrame:
+    opens = [end_ms - (limit - i) * MINUTE for i in range(limit)]
+    return binance._klines_frame(
+        [[t, "100", "101", "99", "100", "5", t + MINUTE - 1] for t in opens]
+    )
+
+
+def test_parse_kline_and_stream_names():
+    symbol, tf, row, closed = parse_kline(_message(0, 101.5, True))
+    assert (symbol, tf, closed) == ("BTCUSDT", "1m", True)
+    assert row["close"] == 101.5 and row["close_time"] == pd.Timestamp(MINUTE - 1, unit="ms")
+    assert parse_kline(json.dumps({"result": None, "id": 1})) is None
+    assert stream_names(["BTCUSDT"], ["1m", "15m"]) == ["btcusdt@kline_1m", "btcusdt@kline_15m"]
+
+
+def test_streamer_updates_store_and_backfills_after_reconnect(tmp_path, monkeypatch):
+    now_ms = pd.Timestamp.now(tz="UTC").tz_localize(None).value // 1_000_000
+    current = now_ms - now_ms % MINUTE
+    rest_calls: list = []
+
+    async def fake_get_klines(symbol, interval, limit=1000, fallback=True):
+        rest_calls.append(limit)
+        return _rest_klines(current, limit)
+
+    monkeypatch.setattr(binance, "get_klines", fake_get_klines)
+    monkeypatch.setattr(scheduler, "indicators", IncrementalIndicators())
+    seeded: list = []
+    monkeypatch.setattr(scheduler.indicator_registry, "seed", lambda symbol, tf, df, columns: seeded.append(len(df)))
+    paths: list = []
+
+    async def handler(ws):
+        paths.append(ws.request.path)
+        if len(paths) == 1:
+            # Drop the connection after two updates of the forming candle.
+            await ws.send(_message(current, 100.5, False))
+            await ws.send(_message(current, 101.0, False))
+            return
+        await ws.send(_message(current, 101.5, True))
+        await ws.send(_message(current + MINUTE, 102.0, False))
+        await ws.wait_closed()
+
+    settings = Settings(watchlist=["BTCUSDT"], timeframes=["1m"], data_dir=str(tmp_path))
+
+    async def scenario():
+        store = DataStore()
+        async with websockets.serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            streamer = KlineStreamer(settings, store, url=f"ws://127.0.0.1:{port}/stream", reconnect_delay=0.01)
+            streamer.start()
+            for _ in range(500):
+                if streamer.messages == 4:
+                    break
+                await asyncio.sleep(0.01)
+            await streamer.stop()
+        return store
+
+    store = asyncio.run(scenario())
+    assert paths[0] == "/stream?streams=btcusdt@kline_1m"
+    assert len(paths) == 2
+    # Full history on the first connect, only the recent gap after reconnecting.
+    assert rest_calls[0] == 1000 and rest_calls[1] <= 3
+    df = store.get_klines("BTCUSDT", "1m")
+    assert len(df) == 1000
+    assert df["open_time"].iloc[-1] == pd.Timestamp(current + MINUTE, unit="ms")
+    assert df["close"].iloc[-2:].tolist() == [101.5, 102.0]
+    assert df["open_time"].is_unique
+    assert not pd.isna(df["rsi"].iloc[-1])
+    assert store.get_signal("BTCUSDT", "1m")["symbol"] == "BTCUSDT"
+    # Shared indicator columns only after each backfill and the closed candle.
+    assert len(seeded) == 3
+    # Closed candles, including the streamed one, are written to disk.
+    stored = scheduler.candle_store(settings).read("BTCUSDT", "1m")
+    assert len(stored) == 1001
+    assert stored["open_time"].iloc[-1] == pd.Timestamp(current, unit="ms")
+
+
+def test_failed_backfill_keeps_the_stored_candles(tmp_path, monkeypatch):
+    async def offline(symbol, interval, limit=1000, fallback=True):
+        assert fallback is False
+        raise httpx.ConnectError("offline")
+
+    monkeypatch.setattr(binance, "get_klines", offline)
+    monkeypatch.setattr(scheduler, "indicators", IncrementalIndicators())
+    settings = Settings(watchlist=["BTCUSDT"], timeframes=["1m"], data_dir=str(tmp_path))
+    streamer = KlineStreamer(settings, DataStore())
+    stored = _rest_klines(1_700_000_000_000, 50)
+    streamer.frames[("BTCUSDT", "1m")] = stored
+    asyncio.run(streamer.backfill())
+    assert streamer.frames[("BTCUSDT", "1m")] is stored
+
+
+def test_backfill_error_skips_only_that_stream(tmp_path, monkeypatch):
+    async def fake_get_klines(symbol, interval, limit=1000, fallback=True):
+        if symbol == "ETHUSDT":
+            raise RuntimeError("bad payload")
+        return _rest_klines(1_700_000_000_000, 10)
+
+    monkeypatch.setattr(binance, "get_klines", fake_get_klines)
+    monkeypatch.setattr(scheduler, "indicators", IncrementalIndicators())
+    settings = Settings(watchlist=["ETHUSDT", "BTCUSDT"], timeframes=["1m"], data_dir=str(tmp_path))
+    streamer = KlineStreamer(settings, DataStore())
+    asyncio.run(streamer.backfill())
+    assert list(streamer.frames) == [("BTCUSDT", "1m")]
+
+
+def test_streamer_restarts_failed_streams(tmp_path, monkeypatch):
+    connects: list = []
+
+    async def fake_stream_klines(symbols, timeframes, url, on_connect=None, reconnect_delay=1.0):
+        connects.append(url)
+        if len(connects) == 1:
+            raise RuntimeError("stream broke")
+        yield "BTCUSDT", "1m", {}, False
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr("services.stream.stream_klines", fake_stream_klines)
+    settings = Settings(watchlist=["BTCUSDT"], timeframes=["1m"], data_dir=str(tmp_path))
+    streamer = KlineStreamer(settings, DataStore(), url="ws://test", reconnect_delay=0.01)
+    handled: list = []
+    monkeypatch.setattr(streamer, "handle", lambda *args: handled.append(args))
+
+    async def scenario():
+        streamer.start()
+        for _ in range(100):
+            if handled:
+                break
+            await asyncio.sleep(0.01)
+        await streamer.stop()
+
+    asyncio.run(scenario())
+    assert streamer.failures == 1 and len(connects) == 2
+    assert handled == [("BTCUSDT", "1m", {}, False)]
@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api import routes
+from config import Settings
+from core.backtest.portfolio import align_frames, run_portfolio_backtest
+from core.backtest.runner import run_backtest
+from core.indicators.ta import add_indicators
+from services.store import DataStore
+
+
+def _frame(seed: int, n: int, start: str, settings: Settings) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    df = pd.DataFrame(
+        {
+            "open_time": pd.date_range(start, periods=n, freq="min"),
+            "open": close,
+            "high": close + rng.uniform(0, 1, n),
+            "low": close - rng.uniform(0, 1, n),
+            "close": close,
+            "volume": 100.0,
+        }
+    )
+    return add_indicators(df, settings)
+
+
+def test_align_frames_fills_missing_bars_with_nan():
+    settings = Settings()
+    frames = {"A": _frame(0, 5, "2023-01-01 00:00", settings), "B": _frame(1, 5, "2023-01-01 00:02", settings)}
+    index, m = align_frames(frames, ("close",))
+    assert len(index) == 7
+    assert m["close"].shape == (7, 2)
+    assert np.isnan(m["close"][:2, 1]).all()
+    assert np.isnan(m["close"][5:, 0]).all()
+
+
+def test_portfolio_matches_single_symbol_backtests():
+    settings = Settings(rsi_oversold=50, rsi_overbought=50, ema_fast=3, ema_slow=5)
+    frames = {
+        "A": _frame(0, 2000, "2023-01-01 00:00", settings),
+        "B": _frame(1, 1500, "2023-01-01 03:00", settings),
+    }
+    result = run_portfolio_backtest(frames, settings)
+    total = 0
+    for sym, df in frames.items():
+        single = run_backtest(df, settings)
+        assert result["symbols"][sym]["total_trades"] == single["total_trades"]
+        assert result["symbols"][sym]["pnl"] == pytest.approx(single["pnl"])
+        total += single["pnl"]
+    assert result["pnl"] == pytest.approx(total)
+    assert result["equity_curve"]["equity"][-1] == pytest.approx(total)
+    assert result["total_trades"] == len(result["trades"])
+    exit_times = [t["exit_time"] for t in result["trades"]]
+    assert exit_times == sorted(exit_times)
+
+
+def test_portfolio_endpoint_fetches_symbols_concurrently(monkeypatch):
+    settings = Settings(watchlist=["A", "B", "C"], rsi_oversold=50, rsi_overbought=50, ema_fast=3, ema_slow=5)
+    in_flight: list = []
+    peak: list = []
+
+    async def candles(symbol, timeframe, days, store, settings):
+        in_flight.append(symbol)
+        await asyncio.sleep(0.01)
+        peak.append(len(in_flight))
+        in_flight.remove(symbol)
+        return _frame(ord(symbol), 500, "2023-01-01 00:00", settings)
+
+    monkeypatch.setattr(routes, "_backtest_klines", candles)
+    result = asyncio.run(routes.backtest_portfolio("1m", 30, 100, DataStore(), settings))
+    assert max(peak) == 3
+    assert list(result["symbols"]) == ["A", "B", "C"]
@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.datasources import binance
+from core.datasources.ratelimit import BACKFILL, LIVE, WeightLimiter, request_weight
+from services import http_client
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_request_weights():
+    base = binance.BASE_URL
+    assert request_weight(f"{base}/klines", {"symbol": "BTCUSDT"}) == 2
+    assert request_weight(f"{base}/ticker/24hr", {"symbol": "BTCUSDT"}) == 2
+    assert request_weight(f"{base}/ticker/24hr", {"symbols": ",".join(["X"] * 50)}) == 40
+    assert request_weight(f"{base}/ticker/24hr") == 80
+
+
+def test_limiter_waits_for_next_window_and_serves_live_first():
+    clock = FakeClock(59.9)
+    limiter = WeightLimiter(limit=10, backfill_share=0.5, clock=clock)
+    order: list = []
+
+    async def request(name: str, weight: int, priority: int) -> None:
+        await limiter.acquire(weight, priority)
+        order.append(name)
+
+    async def scenario():
+        await request("live-1", 4, LIVE)
+        # Backfill may only use half of the budget.
+        backfill = asyncio.ensure_future(request("backfill", 2, BACKFILL))
+        await asyncio.sleep(0.02)
+        assert order == ["live-1"]
+        await request("live-2", 6, LIVE)
+        live = asyncio.ensure_future(request("live-3", 1, LIVE))
+        await asyncio.sleep(0.02)
+        assert limiter.usage()["waiting"] == 2
+        clock.now = 60.0
+        await asyncio.gather(backfill, live)
+
+    asyncio.run(scenario())
+    assert order == ["live-1", "live-2", "live-3", "backfill"]
+    usage = limiter.usage()
+    assert usage["used_weight"] == 3 and usage["throttled"] == 2
+
+
+def test_binance_client_honours_429_and_418(monkeypatch):
+    statuses = [429, 200, 418]
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses[len(calls)]
+        calls.append(status)
+        headers = {"x-mbx-used-weight-1m": "42", "retry-after": "0"}
+        return httpx.Response(status, json={"price": "1.5"}, headers=headers)
+
+    limiter = WeightLimiter()
+    monkeypatch.setattr(binance, "limiter", limiter)
+    monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    assert asyncio.run(binance.get_price("BTCUSDT")) == 1.5
+    assert calls == [429, 200]
+    assert limiter.usage()["used_weight"] >= 42
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(binance.get_price("BTCUSDT"))
+    assert calls == [429, 200, 418]
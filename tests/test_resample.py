@@ -0,0 +1,130 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from config import Settings
+from core.datasources.resample import KlineResampler, resample_klines
+from core.indicators.incremental import IncrementalIndicators
+from services import scheduler
+from services.store import DataStore
+
+
+def _expected(minutes: pd.DataFrame, rule: str) -> pd.DataFrame:
+    grouped = minutes.set_index("open_time").resample(rule)
+    return pd.DataFrame(
+        {
+            "open": grouped["open"].first(),
+            "high": grouped["high"].max(),
+            "low": grouped["low"].min(),
+            "close": grouped["close"].last(),
+            "volume": grouped["volume"].sum(),
+        }
+    ).reset_index()
+
+
+def test_resample_matches_pandas_and_drops_partial_bucket(synthetic_klines):
+    minutes = synthetic_klines(1000).iloc[7:].reset_index(drop=True)
+    out = resample_klines(minutes, "15m")
+    expected = _expected(minutes, "15min").iloc[1:].reset_index(drop=True)
+    pd.testing.assert_frame_equal(out[expected.columns], expected, check_freq=False)
+    assert (out["close_time"] == out["open_time"] + pd.Timedelta(minutes=15) - pd.Timedelta(milliseconds=1)).all()
+
+
+def test_resampler_extends_seeded_series_from_minute_windows(synthetic_klines):
+    minutes = synthetic_klines(3000, seed=2)
+    full = resample_klines(minutes, "1h")
+    resampler = KlineResampler(max_len=20)
+    resampler.seed("BTCUSDT", "1h", resample_klines(minutes.iloc[:1000], "1h"))
+
+    for end in range(1001, 3000, 37):
+        frames = resampler.update("BTCUSDT", minutes.iloc[end - 500 : end])
+        expected = resample_klines(minutes.iloc[:end], "1h").iloc[-20:].reset_index(drop=True)
+        pd.testing.assert_frame_equal(frames["1h"], expected)
+    assert frames["1h"]["open_time"].iloc[-1] == full["open_time"].iloc[-1]
+
+    # A window that no longer reaches back to the last candle needs a reseed.
+    assert resampler.update("BTCUSDT", minutes.iloc[-10:]) == {}
+    assert resampler.get("BTCUSDT", "1h") is None
+
+
+def test_scheduler_fetches_only_minutes_after_seeding(tmp_path, monkeypatch, synthetic_klines):
+    minutes = synthetic_klines(5000, seed=5)
+    calls: list = []
+    tick = {"end": 2000}
+
+    async def fake_get_klines(symbol: str, interval: str, limit: int = 1000) -> pd.DataFrame:
+        calls.append((symbol, interval))
+        window = minutes.iloc[: tick["end"]]
+        if interval != "1m":
+            window = resample_klines(window, interval)
+        return window.iloc[-limit:].reset_index(drop=True)
+
+    monkeypatch.setattr(scheduler.binance, "get_klines", fake_get_klines)
+    monkeypatch.setattr(scheduler, "resampler", KlineResampler())
+    monkeypatch.setattr(scheduler, "indicators", IncrementalIndicators())
+    settings = Settings(
+        watchlist=["BTCUSDT", "ETHUSDT"],
+        timeframes=["1m", "5m", "15m"],
+        data_dir=str(tmp_path),
+        kline_delta_fetch=False,
+    )
+    store = DataStore()
+
+    asyncio.run(scheduler.update_once(settings, store))
+    assert len(calls) == 6
+    for _ in range(3):
+        calls.clear()
+        tick["end"] += 7
+        asyncio.run(scheduler.update_once(settings, store))
+        assert calls == [("BTCUSDT", "1m"), ("ETHUSDT", "1m")]
+
+    expected = resample_klines(minutes.iloc[: tick["end"]], "15m")
+    stored = store.get_klines("ETHUSDT", "15m")
+    assert np.array_equal(stored["close"].to_numpy(), expected["close"].to_numpy()[-len(stored):])
+    assert stored["open_time"].iloc[-1] == expected["open_time"].iloc[-1]
+
+
+def test_scheduler_delta_fetches_minutes_and_derives_timeframes_by_default(
+    tmp_path, monkeypatch, fake_binance, synthetic_klines, kline_payload
+):
+    minutes = synthetic_klines(5000, seed=7)
+    tick = {"end": 2000}
+
+    def handler(params: dict) -> httpx.Response:
+        window = minutes.iloc[: tick["end"]]
+        if params["interval"] != "1m":
+            window = resample_klines(window, params["interval"])
+        limit = int(params["limit"])
+        if "startTime" in params:
+            window = window[window["open_time"] >= pd.Timestamp(int(params["startTime"]), unit="ms")]
+            window = window.iloc[:limit]
+        else:
+            window = window.iloc[-limit:]
+        return httpx.Response(200, content=kline_payload(window))
+
+    calls = fake_binance.install(handler)
+    monkeypatch.setattr(scheduler, "resampler", KlineResampler())
+    monkeypatch.setattr(scheduler, "indicators", IncrementalIndicators())
+    monkeypatch.setattr(scheduler, "raw_klines", {})
+    settings = Settings(watchlist=["BTCUSDT"], timeframes=["1m", "5m", "15m"], data_dir=str(tmp_path))
+    assert settings.kline_delta_fetch and settings.derive_timeframes
+    store = DataStore()
+
+    asyncio.run(scheduler.update_once(settings, store))
+    assert [c["interval"] for c in calls] == ["1m", "5m", "15m"]
+    for _ in range(3):
+        calls.clear()
+        tick["end"] += 7
+        asyncio.run(scheduler.update_once(settings, store))
+        # Only the minutes since the last stored one are requested.
+        assert [(c["interval"], "startTime" in c) for c in calls] == [("1m", True)]
+
+    for tf in ("1m", "15m"):
+        expected = minutes.iloc[: tick["end"]]
+        if tf != "1m":
+            expected = resample_klines(expected, tf)
+        stored = store.get_klines("BTCUSDT", tf)
+        assert stored["open_time"].iloc[-1] == expected["open_time"].iloc[-1]
+        assert np.allclose(stored["close"].to_numpy(), expected["close"].to_numpy()[-len(stored):])
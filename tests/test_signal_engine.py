@@ -1,9 +1,10 @@
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from config import Settings
-from core.signals.engine import generate_signal
+from core.signals.engine import generate_signal, generate_signals
 
 
 def _df_from_row(row: dict) -> pd.DataFrame:
@@ -52,3 +53,33 @@ def test_short_signal():
     df = _df_from_row(row)
     sig = generate_signal(df, settings)
     assert sig["signal"] == "SHORT"
+
+
+def test_generate_signals_matches_per_row():
+    settings = Settings()
+    rng = np.random.default_rng(0)
+    n = 500
+    close = 100 + rng.normal(0, 1, n)
+    df = pd.DataFrame(
+        {
+            "close": close,
+            "ema_fast": close + rng.normal(0, 0.5, n),
+            "ema_slow": close + rng.normal(0, 0.5, n),
+            "rsi": rng.uniform(0, 100, n),
+            "atr": rng.choice([0.0, 0.5, 1.0], n),
+            "ema_fast_slope": rng.normal(0, 0.1, n),
+            "symbol": "TEST",
+            "interval": "1m",
+        }
+    )
+    sigs = generate_signals(df, settings)
+    assert set(sigs["signal"]) == {"LONG", "SHORT", "NONE"}
+    for i in range(n):
+        expected = generate_signal(df.iloc[: i + 1], settings)
+        row = sigs.iloc[i]
+        assert row["signal"] == expected["signal"]
+        assert row["confidence"] == expected["confidence"]
+        if expected["signal"] != "NONE":
+            assert row["sl"] == expected["risk"]["sl"]
+            assert row["tp1"] == expected["risk"]["tp1"]
+            assert row["tp2"] == expected["risk"]["tp2"]
@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.datasources import binance
+from core.datasources.singleflight import SingleFlight
+from services import http_client
+
+
+def test_concurrent_identical_requests_share_one_call(monkeypatch):
+    calls: list = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(dict(request.url.params))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"symbol": request.url.params["symbol"], "volume": "1"})
+
+    async def scenario():
+        http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        burst = [binance.get_24h_ticker("BTCUSDT") for _ in range(10)]
+        burst.append(binance.get_24h_ticker("ETHUSDT"))
+        results = await asyncio.gather(*burst)
+        await binance.get_24h_ticker("BTCUSDT")
+        return results
+
+    monkeypatch.setattr(http_client, "_client", None)
+    results = asyncio.run(scenario())
+    assert [r["symbol"] for r in results] == ["BTCUSDT"] * 10 + ["ETHUSDT"]
+    # Callers share the response but not the dict they get back.
+    results[0]["volume"] = "changed"
+    assert results[1]["volume"] == "1"
+    # One request per symbol for the burst, then a new one once it finished.
+    assert [c["symbol"] for c in calls] == ["BTCUSDT", "ETHUSDT", "BTCUSDT"]
+    assert len(binance._inflight) == 0
+
+
+def test_errors_are_shared_and_cancelling_one_caller_keeps_the_request():
+    flight = SingleFlight()
+    started: list = []
+
+    async def failing():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def slow():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("a", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+
+        leader = asyncio.ensure_future(flight.do("b", slow))
+        follower = asyncio.ensure_future(flight.do("b", slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == 42
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    asyncio.run(scenario())
+    assert len(started) == 2
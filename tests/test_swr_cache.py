@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.datasources.swr import CircuitOpenError, SWRCache
+from services import market_stats
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_stale_values_are_served_while_refreshing_in_the_background():
+    clock = FakeClock()
+    cache = SWRCache("test", ttl=60, clock=clock)
+    calls = []
+
+    async def fetch():
+        calls.append(clock.now)
+        await asyncio.sleep(0)
+        return len(calls)
+
+    async def scenario():
+        first = await cache.get("k", fetch)
+        assert first.value == 1 and first.info["stale"] is False
+        clock.now = 30
+        assert (await cache.get("k", fetch)).value == 1
+        assert calls == [0]
+
+        clock.now = 90
+        stale = await cache.get("k", fetch)
+        assert stale.value == 1
+        assert stale.info["stale"] is True and stale.info["age_seconds"] == 90
+        await cache.get("k", fetch)  # one refresh at a time
+        await asyncio.sleep(0.01)
+        assert calls == [0, 90]
+        fresh = await cache.get("k", fetch)
+        assert fresh.value == 2 and fresh.info["age_seconds"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_circuit_opens_after_repeated_failures_and_recovers():
+    clock = FakeClock()
+    cache = SWRCache("test", ttl=10, failure_threshold=2, cooldown=100, clock=clock)
+    calls = []
+    ok = {"value": True}
+
+    async def fetch():
+        calls.append(clock.now)
+        if not ok["value"]:
+            raise httpx.ConnectError("down")
+        return "good"
+
+    async def scenario():
+        await cache.get("k", fetch)
+        ok["value"] = False
+        for now in (20, 40):
+            clock.now = now
+            assert (await cache.get("k", fetch)).value == "good"
+            await asyncio.sleep(0.01)
+        info = cache.info("k")
+        assert info["circuit"] == "open" and "down" in info["last_error"]
+
+        clock.now = 100
+        assert (await cache.get("k", fetch)).value == "good"
+        with pytest.raises(CircuitOpenError):
+            await cache.get("other", fetch)
+        assert calls == [0, 20, 40]
+
+        ok["value"] = True
+        clock.now = 150
+        assert cache.state() == "half_open"
+        await cache.get("k", fetch)
+        await asyncio.sleep(0.01)
+        assert cache.state() == "closed" and cache.info("k")["age_seconds"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_market_stats_report_unavailable_sources(monkeypatch):
+    async def down(*args, **kwargs):
+        raise httpx.ConnectError("offline")
+
+    monkeypatch.setattr(market_stats.fng, "get_index", down)
+    monkeypatch.setattr(market_stats, "index_cache", SWRCache("fear_greed", ttl=60))
+    result = asyncio.run(market_stats.fear_greed_index())
+    assert result.value is None
+    assert result.info["source"] == "fear_greed" and "offline" in result.info["last_error"]
+
+
+def test_market_stats_fetch_once_and_survive_malformed_responses(monkeypatch):
+    calls = []
+
+    async def malformed(ids, vs_currencies, **kwargs):
+        calls.append(kwargs)
+        raise json.JSONDecodeError("Expecting value", "<html>", 0)
+
+    monkeypatch.setattr(market_stats.coingecko, "simple_price", malformed)
+    monkeypatch.setattr(market_stats, "price_cache", SWRCache("coingecko", ttl=60))
+    result = asyncio.run(market_stats.simple_price(["bitcoin"], ["usd"]))
+    assert result.value is None and "JSONDecodeError" in result.info["last_error"]
+    assert calls == [{"retries": 1}]
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pandas_ta as ta
+
+
+@pytest.fixture
+def klines(synthetic_klines):
+    df = synthetic_klines(3000, seed=4)
+    # A flat stretch exercises zero gains/losses in RSI.
+    df.loc[100:140, ["open", "high", "low", "close"]] = 101.0
+    return df
+
+
+def _assert_close(actual: pd.Series, expected: pd.Series, rtol: float = 1e-10) -> None:
+    assert actual.index.equals(expected.index)
+    assert actual.name == expected.name
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=rtol, equal_nan=True)
+
+
+@pytest.mark.parametrize("length", [1, 5, 10, 200])
+def test_numpy_ema_and_sma_match_pandas(klines, length):
+    close = klines["close"]
+    _assert_close(ta.ema(close, length=length, backend="numpy"), ta.ema(close, length=length))
+    _assert_close(ta.sma(close, length=length, backend="numpy"), close.rolling(length).mean())
+
+
+@pytest.mark.parametrize("length", [2, 14])
+def test_numpy_rsi_and_atr_match_pandas(klines, length):
+    high, low, close = klines["high"], klines["low"], klines["close"]
+    _assert_close(ta.rsi(close, length=length, backend="numpy"), ta.rsi(close, length=length))
+    _assert_close(ta.atr(high, low, close, length=length, backend="numpy"), ta.atr(high, low, close, length=length))
+
+
+def test_numpy_backend_handles_nan_and_float32():
+    close = pd.Series([1.0, np.nan, 3.0, 4.0, np.nan, np.nan, 7.0, 8.0, 9.0], name="close")
+    _assert_close(ta.ema(close, length=3, backend="numpy"), ta.ema(close, length=3))
+    _assert_close(ta.sma(close, length=2, backend="numpy"), close.rolling(2).mean())
+    _assert_close(ta.sma(close, length=20, backend="numpy"), close.rolling(20).mean())
+
+    out = ta.rsi(close.fillna(5.0), length=3, backend="numpy", float32=True)
+    assert out.dtype == np.float32
+    _assert_close(out, ta.rsi(close.fillna(5.0), length=3).astype(np.float32), rtol=1e-5)
+
+
+def test_set_backend_switches_default(synthetic_klines):
+    close = synthetic_klines(50)["close"]
+    try:
+        ta.set_backend("numpy")
+        _assert_close(ta.ema(close, length=5), ta.ema(close, length=5, backend="pandas"))
+    finally:
+        ta.set_backend("pandas")
+    with pytest.raises(ValueError):
+        ta.set_backend("talib")
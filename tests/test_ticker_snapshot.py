@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import httpx
+
+from core.datasources import binance
+
+
+def _tickers(known: set):
+    def handler(params: dict) -> httpx.Response:
+        if "symbol" in params:
+            if params["symbol"] not in known:
+                return httpx.Response(400, json={"code": -1121, "msg": "Invalid symbol."})
+            return httpx.Response(200, json={"symbol": params["symbol"], "volume": "1"})
+        symbols = json.loads(params["symbols"]) if "symbols" in params else sorted(known)
+        if not set(symbols) <= known:
+            return httpx.Response(400, json={"code": -1121, "msg": "Invalid symbol."})
+        return httpx.Response(200, json=[{"symbol": s, "volume": "2"} for s in symbols])
+
+    return handler
+
+
+def test_snapshot_serves_many_symbols_from_one_request(fake_binance):
+    symbols = [f"SYM{i}USDT" for i in range(300)]
+    calls = fake_binance.install(_tickers(set(symbols)))
+    snapshot = binance.TickerSnapshot(ttl=60)
+
+    async def scenario():
+        await snapshot.get(symbols)
+        return await asyncio.gather(*(snapshot.get([sym]) for sym in symbols))
+
+    results = asyncio.run(scenario())
+    assert [r[s]["volume"] for r, s in zip(results, symbols)] == ["2"] * 300
+    # More than 100 symbols: the full list, without a symbols filter.
+    assert calls == [{}]
+
+    snapshot.ttl = 0
+    asyncio.run(snapshot.get(symbols[:3]))
+    assert len(calls) == 2
+
+
+def test_snapshot_falls_back_to_single_tickers(fake_binance):
+    calls = fake_binance.install(_tickers({"BTCUSDT"}))
+    snapshot = binance.TickerSnapshot()
+
+    tickers = asyncio.run(snapshot.get(["BTCUSDT"]))
+    assert tickers["BTCUSDT"]["volume"] == "2"
+    assert json.loads(calls[0]["symbols"]) == ["BTCUSDT"]
+
+    # An unknown symbol fails the bulk request; each ticker is fetched alone
+    # and the rejected symbol is left out of the next bulk requests.
+    calls.clear()
+    tickers = asyncio.run(snapshot.get(["BTCUSDT", "NOPEUSDT"]))
+    assert tickers["NOPEUSDT"] == {"priceChangePercent": 0, "volume": 0}
+    assert sorted(c.get("symbol", "bulk") for c in calls) == ["BTCUSDT", "NOPEUSDT", "bulk"]
+
+    calls.clear()
+    snapshot.ttl = 0
+    tickers = asyncio.run(snapshot.get(["NOPEUSDT", "BTCUSDT"]))
+    assert [json.loads(c["symbols"]) for c in calls] == [["BTCUSDT"]]
+    assert tickers["NOPEUSDT"]["volume"] == 0
+
+
+async def _no_sleep(delay):
+    return None
+
+
+def test_snapshot_skips_requests_without_symbols_and_keeps_tickers_when_offline(monkeypatch, fake_binance):
+    calls = fake_binance.install(_tickers({"BTCUSDT"}))
+    snapshot = binance.TickerSnapshot(ttl=0)
+    # Once its only symbol is rejected, nothing is left to request.
+    asyncio.run(snapshot.get(["NOPEUSDT"]))
+    calls.clear()
+    assert asyncio.run(snapshot.get(["NOPEUSDT"]))["NOPEUSDT"]["volume"] == 0
+    assert calls == []
+
+    asyncio.run(snapshot.get(["BTCUSDT"]))
+    calls.clear()
+
+    def offline(params: dict) -> httpx.Response:
+        raise httpx.ConnectError("offline")
+
+    fake_binance.install(offline)
+    monkeypatch.setattr(binance.asyncio, "sleep", _no_sleep)
+    tickers = asyncio.run(snapshot.get(["BTCUSDT", "ETHUSDT"]))
+    assert tickers["BTCUSDT"]["volume"] == "2"
+    # One bulk request with its retries, no request per symbol.
+    assert all("symbols" in c for c in calls) and len(calls) == 3
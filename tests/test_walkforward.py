@@ -0,0 +1,37 @@
+import pytest
+
+from config import Settings
+from core.backtest.sweep import run_sweep
+from core.backtest.walkforward import run_walk_forward, window_bounds
+
+
+def test_window_bounds_roll_by_test_size():
+    assert window_bounds(10, 4, 2) == [(0, 4, 6), (2, 6, 8), (4, 8, 10)]
+    assert window_bounds(10, 4, 2, step=3) == [(0, 4, 6), (3, 7, 9)]
+    assert window_bounds(5, 4, 2) == []
+    with pytest.raises(ValueError):
+        window_bounds(10, 0, 2)
+
+
+def test_walk_forward_combines_out_of_sample_windows(random_walk):
+    df = random_walk(3000)
+    grid = {"ema_fast": [3, 5], "ema_slow": [8, 13], "rsi_oversold": [45, 50], "rsi_overbought": [50, 55]}
+    result = run_walk_forward(df, Settings(), grid, train_bars=1000, test_bars=500, processes=1)
+    windows = result["windows"]
+    assert [(w["start"], w["split"], w["stop"]) for w in windows] == window_bounds(3000, 1000, 500)
+    assert result["total_trades"] == sum(w["total_trades"] for w in windows)
+    assert result["pnl"] == pytest.approx(sum(w["pnl"] for w in windows))
+    assert windows[0]["split_time"] == df["open_time"].iloc[1000]
+
+    pooled = run_walk_forward(df, Settings(), grid, train_bars=1000, test_bars=500, processes=2)
+    assert pooled["windows"] == windows
+
+
+def test_walk_forward_picks_the_lowest_drawdown_in_sample(random_walk):
+    df = random_walk(3000)
+    grid = {"ema_fast": [3, 5], "ema_slow": [8, 13]}
+    result = run_walk_forward(df, Settings(), grid, 1000, 500, processes=1, rank_by="max_drawdown")
+    first = run_sweep(df.iloc[:1000], Settings(), grid, processes=1, rank_by="max_drawdown").iloc[0]
+    assert result["windows"][0]["in_sample_max_drawdown"] == pytest.approx(first["max_drawdown"])
+    with pytest.raises(ValueError):
+        run_walk_forward(df, Settings(), grid, 1000, 500, processes=1, rank_by="ema_fast")